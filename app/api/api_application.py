@@ -1,22 +1,67 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import APIRouter, FastAPI
 
+from app.common.log import configure_logging
 from app.settings import ApiSettings
 
 from .common.error_handlers import add_error_handlers
+from .common.routers.admin_routers import add_admin_router
 from .common.routers.health_check_routers import add_health_check_router
+from .common.routers.metrics_routers import add_metrics_router
 from .middlewares.configure_middlewares import configure_middlewares
+from .v2.warmup import run_warm_up
+
+logger = logging.getLogger(__name__)
 
 
 def create_app(settings: ApiSettings, router: APIRouter) -> FastAPI:
+    # Logs saem por uma fila atendida em outra thread: o event loop não espera pela escrita
+    configure_logging(settings.log_level, json_format=settings.log_json)
+
     @asynccontextmanager
     async def _lifespan(_app: FastAPI):
         # Qualquer ação necessária na inicialização
-        ...
+        container = getattr(_app, "container", None)
+        router = container.partition_router() if container is not None else None
+        tasks: list[asyncio.Task] = []
+        if router is not None and settings.mongo_pool_prewarm:
+            await router.prewarm(timeout_ms=settings.mongo_pool_prewarm_timeout_ms)
+        if router is not None and router.is_partitioned:
+            await router.load_overrides()
+            tasks.append(asyncio.create_task(router.refresh_overrides(settings.mongo_partition_refresh_seconds)))
+        if container is not None:
+            # Em segundo plano: a aplicação já responde à liveness enquanto o readiness espera o aquecimento
+            tasks.append(asyncio.create_task(run_warm_up(container, settings)))
+            tasks.append(asyncio.create_task(container.event_loop_monitor().run()))
+            tasks.append(asyncio.create_task(container.health_check_service().refresh_periodically()))
+            tasks.append(
+                asyncio.create_task(
+                    container.hot_key_store().save_periodically(
+                        container.frete_hot_keys(),
+                        limit=settings.frete_warmup_keys,
+                        interval_seconds=settings.frete_hot_keys_snapshot_seconds,
+                    )
+                )
+            )
         yield
         # Limpando a bagunça antes de terminar
-        ...
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if container is not None:
+            # Os lotes de escrita abertos são enviados e confirmados antes de o cliente do banco fechar
+            await container.frete_write_batcher().close()
+        if container is not None and settings.frete_warmup_keys:
+            try:
+                await container.hot_key_store().save(container.frete_hot_keys(), limit=settings.frete_warmup_keys)
+            except Exception as exc:
+                logger.warning(f"Não foi possível gravar as chaves quentes no desligamento: {exc!r}")
+        if router is not None:
+            await router.close()
 
     app = FastAPI(
         lifespan=_lifespan,
@@ -31,10 +76,20 @@ def create_app(settings: ApiSettings, router: APIRouter) -> FastAPI:
     # Configurações Gerais
     configure_middlewares(app, settings)
 
-    add_error_handlers(app)
+    add_error_handlers(app, settings)
 
     # Rotas
     app.include_router(router)
     add_health_check_router(app, prefix=settings.health_check_base_path)
+    if settings.metrics_enabled:
+        add_metrics_router(app, path=settings.metrics_path)
+    if settings.admin_enabled and settings.admin_token:
+        add_admin_router(
+            app,
+            token=settings.admin_token,
+            prefix=settings.admin_base_path,
+            profiling_enabled=settings.profiling_enabled,
+            max_session_seconds=settings.profiling_max_session_seconds,
+        )
 
     return app
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable
+
+from fastapi import Response, status
+from starlette.requests import Request
+
+from app.common.datetime import as_utc
+from app.common.hash_utils import generate_hash
+from app.models.frete_model import INITIAL_VERSION
+
+# Os fretes variam pelo seller do cabeçalho, não só pela URL
+VARY_HEADERS = "x-seller-id"
+
+
+@dataclass(frozen=True)
+class EntityVersion:
+    """
+    Identidade, versão e instante da última escrita de um documento, o suficiente para validar o cache.
+    """
+
+    id: Any
+    version: int
+    modified_at: datetime | None
+
+    @classmethod
+    def from_document(cls, document: dict) -> "EntityVersion":
+        return cls(
+            document["_id"],
+            document.get("version", INITIAL_VERSION),
+            document.get("updated_at") or document.get("created_at"),
+        )
+
+    @classmethod
+    def from_entity(cls, entity: Any) -> "EntityVersion":
+        return cls(entity.id, entity.version, entity.updated_at or entity.created_at)
+
+    @property
+    def token(self) -> str:
+        return f"{self.id}.{self.version}"
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: datetime | None
+
+    @classmethod
+    def build(cls, scope: str, versions: Iterable[EntityVersion]) -> "Validators":
+        """
+        ETag forte sobre o escopo (seller, rota) e a versão de cada documento; Last-Modified pela escrita mais recente.
+        """
+        versions = list(versions)
+        etag = generate_hash("|".join([scope, *(version.token for version in versions)]))[:32]
+        modified = [as_utc(version.modified_at) for version in versions if version.modified_at]
+        last_modified = max(modified).replace(microsecond=0) if modified else None
+        return cls(etag=f'"{etag}"', last_modified=last_modified)
+
+    @classmethod
+    def for_entity(cls, version: EntityVersion) -> "Validators":
+        """
+        Validadores de um único frete: o ETag é `"<id>.<version>"`, o que permite usá-lo de volta no If-Match.
+        """
+        last_modified = as_utc(version.modified_at).replace(microsecond=0) if version.modified_at else None
+        return cls(etag=f'"{version.token}"', last_modified=last_modified)
+
+    @classmethod
+    def from_headers(cls, headers: dict[str, str]) -> "Validators":
+        """
+        Validadores de uma resposta já montada (ex.: guardada em cache).
+        """
+        last_modified = headers.get("Last-Modified")
+        return cls(etag=headers["ETag"], last_modified=parsedate_to_datetime(last_modified) if last_modified else None)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Vary": VARY_HEADERS}
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
+
+    def is_not_modified(self, request: Request, use_last_modified: bool = True) -> bool:
+        """
+        Avalia If-None-Match e, na ausência dele, If-Modified-Since (RFC 9110, seção 13.2.2).
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, self.etag)
+        if_modified_since = request.headers.get("if-modified-since")
+        if not use_last_modified or if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return self.last_modified <= as_utc(since)
+
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match usa comparação fraca: W/"x" casa com "x"
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag in candidates
+
+
+def parse_if_match(header: str | None) -> list[tuple[str, int]] | None:
+    """
+    Versões aceitas pelo If-Match como pares (id, version).
+
+    `None` quando o cabeçalho está ausente ou é `*` (qualquer versão). ETags fracos ou em outro formato nunca
+    casam (If-Match usa comparação forte) e resultam numa lista sem o frete, ou seja, em 412.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    expected = []
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if not (candidate.startswith('"') and candidate.endswith('"')):
+            continue
+        entity_id, _, version = candidate.strip('"').rpartition(".")
+        if entity_id and version.isdigit():
+            expected.append((entity_id, int(version)))
+    return expected
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
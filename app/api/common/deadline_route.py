@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.common.context import Deadline, reset_deadline, set_deadline
+from app.common.exceptions import DeadlineExceededException
+from app.common.metrics import REQUESTS_ABANDONED
+from app.settings import api_settings
+
+# Status (convenção do nginx) registrado quando o cliente desconecta antes da resposta; ninguém chega a recebê-lo
+CLIENT_CLOSED_REQUEST = 499
+
+# Folga do cancelamento sobre o prazo: o `maxTimeMS` do MongoDB vence antes e a conexão volta ao pool, em vez de ser
+# descartada por um comando cancelado no meio
+DEADLINE_GRACE_SECONDS = 0.1
+
+
+def parse_timeout_ms(value: str | None, default_ms: int | None, max_ms: int) -> float | None:
+    """
+    Prazo, em ms, do cabeçalho (limitado a `max_ms`) ou o padrão quando o cabeçalho falta ou é inválido.
+    """
+    if value:
+        try:
+            timeout_ms = float(value)
+        except ValueError:
+            return default_ms
+        if timeout_ms > 0:
+            return min(timeout_ms, max_ms)
+    return default_ms
+
+
+async def _cancel_on_disconnect(request: Request, task: asyncio.Task) -> bool:
+    """
+    Cancela `task` quando o cliente desconectar.
+    """
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            task.cancel()
+            return True
+
+
+def _client_disconnected(watcher: asyncio.Task | None) -> bool:
+    """
+    Se o vigia viu a desconexão e cancelou a tarefa da requisição.
+    """
+    return watcher is not None and watcher.done() and not watcher.cancelled() and watcher.exception() is None
+
+
+class DeadlineRoute(APIRoute):
+    """
+    Rota que interrompe o trabalho de quem não espera mais pela resposta.
+
+    O prazo vem do cabeçalho `deadline_header` (ms que quem chama ainda espera) ou do padrão da rota nas
+    configurações e fica no contexto da requisição, de onde os repositórios o repassam ao MongoDB como `maxTimeMS`.
+    Vencido o prazo, o endpoint é cancelado e a resposta é `504`; se o cliente desconectar antes, o endpoint é
+    cancelado do mesmo jeito e a requisição termina com `499`.
+
+    Combina com as outras rotas por herança: `class FreteRoute(DeadlineRoute, TimedRoute)`.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        header = api_settings.deadline_header
+        default_ms = api_settings.deadline_routes.get(self.path, api_settings.deadline_default_ms)
+        max_ms = api_settings.deadline_max_ms
+
+        async def deadline_handler(request: Request) -> Response:
+            timeout_ms = parse_timeout_ms(request.headers.get(header), default_ms, max_ms)
+            deadline = Deadline.after(timeout_ms / 1000) if timeout_ms else None
+            task = asyncio.current_task()
+            if task is None:
+                raise RuntimeError("A rota com prazo precisa rodar numa task do asyncio")
+            watcher: asyncio.Task | None = None
+            response: Response | None = None
+            token = set_deadline(deadline)
+            try:
+                async with asyncio.timeout(None if deadline is None else deadline.remaining() + DEADLINE_GRACE_SECONDS):
+                    # O corpo, dentro do prazo, é lido antes de vigiar a conexão: depois dele, o próximo `receive` só
+                    # volta na desconexão
+                    await request.body()
+                    watcher = asyncio.create_task(_cancel_on_disconnect(request, task))
+                    response = await handler(request)
+                return response
+            except TimeoutError:
+                if deadline is None or not deadline.expired():
+                    raise
+                REQUESTS_ABANDONED.labels("deadline").inc()
+                raise DeadlineExceededException() from None
+            except DeadlineExceededException:
+                REQUESTS_ABANDONED.labels("deadline").inc()
+                raise
+            except asyncio.CancelledError:
+                if not _client_disconnected(watcher):
+                    raise
+                task.uncancel()
+                REQUESTS_ABANDONED.labels("disconnect").inc()
+                return Response(status_code=CLIENT_CLOSED_REQUEST)
+            finally:
+                # Desconexão depois da resposta pronta: o cancelamento pedido pelo vigia não pode sobrar para os
+                # middlewares de fora
+                if response is not None and _client_disconnected(watcher):
+                    task.uncancel()
+                if watcher is not None:
+                    watcher.cancel()
+                reset_deadline(token)
+
+        return deadline_handler
@@ -1,43 +1,22 @@
+import logging
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
 from app.common.error_codes import ErrorCodes
 from app.common.exceptions import ApplicationException
+from app.common.log import ErrorLogSampler
+from app.settings import ApiSettings
 
+from .request_log import RequestLogDetails
 from .schemas.response import ErrorDetail, get_error_response
 
-import logging
-import traceback
-import json
-
 VALID_LOCATIONS = {"query", "path", "body", "header"}
 
 logger = logging.getLogger(__name__)
 
 
-async def _get_request_details(request: Request) -> dict:
-    """
-    Helper para extrair informações úteis da requisição para os logs.
-    """
-    body = None
-    try:
-        body_bytes = await request.body()
-        if body_bytes:
-            body = json.loads(body_bytes)
-    except json.JSONDecodeError:
-        body = {"error": "Corpo da requisição não é um JSON válido."}
-    except Exception:
-        body = {"error": "Não foi possível ler o corpo da requisição."}
-
-    return {
-        "method": request.method,
-        "url": str(request.url),
-        "headers": dict(request.headers),
-        "body": body
-    }
-
-
 def extract_error_detail(error):
     ctx = error.get("ctx", {}) or {}  # Handle None ctx
     if isinstance(ctx.get("error", {}), ValueError):
@@ -66,20 +45,34 @@ def extract_error_detail_body(error):
     )
 
 
-def add_error_handlers(app: FastAPI):
+def add_error_handlers(app: FastAPI, settings: ApiSettings):
+    request_details = RequestLogDetails(settings)
+    sampler = ErrorLogSampler(
+        first=settings.error_log_sample_first,
+        every=settings.error_log_sample_every,
+        window_seconds=settings.error_log_sample_window_seconds,
+    )
+
     @app.exception_handler(ApplicationException)
     async def http_exception_handler(request: Request, exc: ApplicationException):
         """
         Captura nossas exceções de negócio (NotFound, Forbidden, etc.)
         e as formata usando a propriedade 'error_response' da exceção.
+
+        Erros repetidos são amostrados por slug: um pico de 404 não vira um log por requisição.
         """
-        logger.warning(
-            f"Falha de negócio controlada: {exc.slug}",
-            extra={
-                "error_message": exc.message,
-                "request_info": await _get_request_details(request)
-            }
-        )
+        should_log, suppressed = sampler.should_log(exc.slug)
+        if should_log:
+            logger.warning(
+                f"Falha de negócio controlada: {exc.slug}",
+                extra={
+                    "slug": exc.slug,
+                    "status_code": exc.status_code,
+                    "error_message": exc.message,
+                    "suppressed": suppressed or None,
+                    "request_info": await request_details(request),
+                },
+            )
         return JSONResponse(
             status_code=exc.status_code,
             content=exc.error_response.model_dump(exclude_none=True),
@@ -95,7 +88,7 @@ def add_error_handlers(app: FastAPI):
         logger.error(
             "Erro inesperado não tratado na aplicação!",
             exc_info=True,
-            extra={"request_info": await _get_request_details(request)}
+            extra={"request_info": await request_details(request)},
         )
 
         error_response = get_error_response(ErrorCodes.SERVER_ERROR.value)
@@ -110,8 +103,8 @@ def add_error_handlers(app: FastAPI):
             "Falha na validação dos dados de entrada (Pydantic).",
             extra={
                 "errors": exc.errors(),
-                "request_info": await _get_request_details(request)
-            }
+                "request_info": await request_details(request),
+            },
         )
 
         errors = exc.errors()
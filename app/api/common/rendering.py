@@ -0,0 +1,68 @@
+from dataclasses import replace
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+from app.common.compression import Codec, CompressionPolicy
+from app.common.context import timed
+from app.common.metrics import HTTP_COMPRESSION_BYTES
+from app.integrations.cache import CachedResponse
+
+
+class JsonRenderer:
+    """
+    Serializa o conteúdo no mesmo formato que o FastAPI gera a partir do `response_model`.
+
+    Usado quando a rota precisa dos bytes da resposta (para guardar em cache) em vez de devolver o modelo.
+    """
+
+    def __init__(self, response_model: Any):
+        self._adapter: TypeAdapter = TypeAdapter(response_model)
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return self._adapter.dump_json(self._adapter.validate_python(content, from_attributes=True), by_alias=True)
+
+
+def precompress(
+    cached: CachedResponse, policy: CompressionPolicy | None, codec: Codec | None, route: str | None
+) -> CachedResponse:
+    """
+    Acrescenta à resposta que vai para o cache o corpo comprimido com o algoritmo negociado com o cliente.
+
+    Comprimida uma vez e reenviada a cada acerto, usa o perfil `small`. Os outros algoritmos não são gerados de
+    antemão: clientes que pedirem outro recebem a compressão feita na hora pelo `CompressionMiddleware`.
+    """
+    if policy is None or codec is None or codec.name in cached.encodings or not policy.compressible(cached.media_type):
+        return cached
+    profile = policy.profile(route, len(cached.body), reused=True)
+    if profile == "off":
+        return cached
+    with timed("compress"):
+        encoded = codec.compress(cached.body, codec.level(profile))
+    if len(encoded) >= len(cached.body):
+        return cached
+    return replace(cached, encodings={**cached.encodings, codec.name: encoded})
+
+
+def cached_response(
+    cached: CachedResponse, status_code: int = status.HTTP_200_OK, codec: Codec | None = None
+) -> Response:
+    """
+    :param codec: Algoritmo negociado com o cliente; se a resposta tiver o corpo já comprimido com ele, é o que vai.
+    """
+    if status_code == status.HTTP_304_NOT_MODIFIED:
+        # 304 leva só os validadores, sem corpo
+        return Response(status_code=status_code, headers=cached.headers)
+    encoded = cached.encodings.get(codec.name) if codec is not None else None
+    if codec is None or encoded is None:
+        return Response(
+            content=cached.body, status_code=status_code, headers=cached.headers, media_type=cached.media_type
+        )
+    response = Response(content=encoded, status_code=status_code, headers=cached.headers, media_type=cached.media_type)
+    response.headers["content-encoding"] = codec.name
+    response.headers.add_vary_header("Accept-Encoding")
+    HTTP_COMPRESSION_BYTES.labels(codec.name, "raw").inc(len(cached.body))
+    HTTP_COMPRESSION_BYTES.labels(codec.name, "compressed").inc(len(encoded))
+    return response
@@ -0,0 +1,50 @@
+from typing import Any
+
+from fastapi import Request
+
+from app.common.log import OBFUSCATED
+from app.settings import ApiSettings
+
+
+class RequestLogDetails:
+    """
+    Monta o resumo da requisição que acompanha os logs.
+
+    Só entram os cabeçalhos listados em `access_log_headers_to_log`, com os de `access_log_headers_to_obfuscate`
+    mascarados, e o corpo apenas se `log_request_body` estiver ligado, truncado e sem ser interpretado.
+    """
+
+    def __init__(self, settings: ApiSettings):
+        self.headers_to_log = {name.lower() for name in settings.access_log_headers_to_log or ()}
+        self.headers_to_obfuscate = {name.lower() for name in settings.access_log_headers_to_obfuscate or ()}
+        self.log_body = settings.log_request_body
+        self.body_max_bytes = settings.log_request_body_max_bytes
+
+    def headers(self, request: Request) -> dict[str, str]:
+        if not self.headers_to_log:
+            return {}
+        return {
+            name: OBFUSCATED if name in self.headers_to_obfuscate else value
+            for name, value in request.headers.items()
+            if name in self.headers_to_log
+        }
+
+    async def body(self, request: Request) -> str | None:
+        try:
+            body = await request.body()
+        except Exception:
+            return None
+        if not body:
+            return None
+        text = body[: self.body_max_bytes].decode("utf-8", errors="replace")
+        return text + "..." if len(body) > self.body_max_bytes else text
+
+    async def __call__(self, request: Request) -> dict:
+        details: dict[str, Any] = {"method": request.method, "path": request.url.path}
+        if request.url.query:
+            details["query"] = request.url.query
+        if headers := self.headers(request):
+            details["headers"] = headers
+        if self.log_body and (body := await self.body(request)) is not None:
+            details["body"] = body
+        return details
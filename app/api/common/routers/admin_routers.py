@@ -0,0 +1,171 @@
+import secrets
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, FastAPI, Header, Path, Query
+from fastapi.responses import JSONResponse
+from starlette import status
+
+from app.api.common.schemas.admin import (
+    AllocationResponse,
+    HotKeyResponse,
+    HotKeysResponse,
+    ProfileSessionResponse,
+    ProfileSummaryResponse,
+)
+from app.common.exceptions import NotFoundException, UnauthorizedException
+from app.common.profiling import Profile, Profiler
+from app.container import Container
+from app.integrations.cache import HotKeyTracker
+
+
+def _require_token(token: str):
+    async def _check(x_admin_token: str | None = Header(default=None, alias="x-admin-token")) -> None:
+        if x_admin_token is None or not secrets.compare_digest(x_admin_token, token):
+            raise UnauthorizedException()
+
+    return _check
+
+
+def _get_profile(profiler: Profiler, profile_id: str) -> Profile:
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise NotFoundException()
+    return profile
+
+
+def add_admin_router(
+    app: FastAPI,
+    token: str,
+    prefix: str = "/admin",
+    profiling_enabled: bool = False,
+    max_session_seconds: float = 60,
+) -> None:
+    """
+    :param token: Valor exigido no cabeçalho `x-admin-token` por todos os recursos.
+    """
+    if not token:
+        raise ValueError("Os recursos administrativos exigem um token")
+    admin_router = APIRouter(prefix=prefix, tags=["Administração"], dependencies=[Depends(_require_token(token))])
+
+    @admin_router.get(
+        "/hot-keys",
+        operation_id="get_hot_keys",
+        name="Chaves quentes do frete por sku",
+        description="Lista os pares (seller_id, sku) mais consultados nesta instância, da mais para a menos acessada",
+        response_model=HotKeysResponse,
+        status_code=status.HTTP_200_OK,
+        include_in_schema=False,
+    )
+    @inject
+    async def hot_keys(
+        limit: int = Query(default=50, ge=1, le=1000),
+        tracker: HotKeyTracker = Depends(Provide[Container.frete_hot_keys]),
+    ):
+        return HotKeysResponse(
+            capacity=tracker.capacity,
+            share=tracker.share(),
+            keys=[
+                HotKeyResponse(seller_id=hot_key.key[0], sku=hot_key.key[1], count=hot_key.count, error=hot_key.error)
+                for hot_key in tracker.top(limit)
+            ],
+        )
+
+    if profiling_enabled:
+        _add_profiling_routes(admin_router, max_session_seconds)
+
+    app.include_router(admin_router)
+
+
+def _add_profiling_routes(admin_router: APIRouter, max_session_seconds: float) -> None:
+    @admin_router.post(
+        "/profiling/session",
+        operation_id="start_profiling_session",
+        name="Inicia sessão de profiling",
+        description="Amostra as pilhas de todas as threads do processo por até `seconds` segundos",
+        response_model=ProfileSessionResponse,
+        status_code=status.HTTP_202_ACCEPTED,
+        include_in_schema=False,
+    )
+    @inject
+    async def start_profiling_session(
+        seconds: float = Query(default=10, gt=0, le=max_session_seconds),
+        interval_ms: float = Query(default=10, ge=1, le=1000),
+        profiler: Profiler = Depends(Provide[Container.profiler]),
+    ):
+        profile_id = profiler.start_session(duration_seconds=seconds, interval_ms=interval_ms)
+        return ProfileSessionResponse(id=profile_id, seconds=seconds, interval_ms=interval_ms)
+
+    @admin_router.delete(
+        "/profiling/session",
+        operation_id="stop_profiling_session",
+        name="Encerra sessão de profiling",
+        description="Encerra antes do prazo a sessão em andamento e guarda o perfil",
+        response_model=ProfileSessionResponse,
+        status_code=status.HTTP_200_OK,
+        include_in_schema=False,
+    )
+    @inject
+    async def stop_profiling_session(profiler: Profiler = Depends(Provide[Container.profiler])):
+        profile_id = profiler.stop_session()
+        if profile_id is None:
+            raise NotFoundException()
+        return ProfileSessionResponse(id=profile_id)
+
+    @admin_router.get(
+        "/profiles",
+        operation_id="list_profiles",
+        name="Perfis disponíveis",
+        description="Perfis de requisições e sessões guardados nesta instância, do mais para o menos recente",
+        response_model=list[ProfileSummaryResponse],
+        status_code=status.HTTP_200_OK,
+        include_in_schema=False,
+    )
+    @inject
+    async def list_profiles(profiler: Profiler = Depends(Provide[Container.profiler])):
+        return [
+            ProfileSummaryResponse(
+                id=profile.id,
+                kind=profile.kind,
+                created_at=profile.created_at,
+                duration_ms=profile.duration_ms,
+                samples=profile.samples,
+                cpu=profile.cpu is not None,
+                memory=profile.memory is not None,
+            )
+            for profile in profiler.profiles()
+        ]
+
+    @admin_router.get(
+        "/profiles/{profile_id}/cpu",
+        operation_id="get_profile_cpu",
+        name="Perfil de CPU",
+        description="Perfil de CPU no formato do speedscope (https://www.speedscope.app)",
+        status_code=status.HTTP_200_OK,
+        include_in_schema=False,
+    )
+    @inject
+    async def get_profile_cpu(profile_id: str = Path(...), profiler: Profiler = Depends(Provide[Container.profiler])):
+        profile = _get_profile(profiler, profile_id)
+        if profile.cpu is None:
+            raise NotFoundException()
+        return JSONResponse(
+            profile.cpu, headers={"content-disposition": f'attachment; filename="{profile_id}.speedscope.json"'}
+        )
+
+    @admin_router.get(
+        "/profiles/{profile_id}/memory",
+        operation_id="get_profile_memory",
+        name="Alocações do perfil",
+        description="Linhas com maior crescimento de memória alocada durante a medição (tracemalloc)",
+        response_model=list[AllocationResponse],
+        status_code=status.HTTP_200_OK,
+        include_in_schema=False,
+    )
+    @inject
+    async def get_profile_memory(
+        profile_id: str = Path(...), profiler: Profiler = Depends(Provide[Container.profiler])
+    ):
+        profile = _get_profile(profiler, profile_id)
+        if profile.memory is None:
+            raise NotFoundException()
+        return profile.memory
@@ -1,13 +1,17 @@
+from dataclasses import asdict
 from typing import TYPE_CHECKING
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from starlette import status
 
 from app.container import Container
 from app.settings import settings
 
 if TYPE_CHECKING:
+    from app.services import HealthCheckService, Readiness
     from app.settings import AppSettings
 
 
@@ -29,9 +33,37 @@ def add_health_check_router(app: FastAPI, prefix: str = "/api") -> None:
         status_code=status.HTTP_204_NO_CONTENT,
     )
     async def ping():
-        # XXX Verificar info da ....
+        # Liveness: só indica que o processo atende; dependências fora do ar não devem reiniciar a instância
         return
 
+    @health_router.get(
+        "/ready",
+        operation_id="get_ready",
+        name="Verificar prontidão do serviço de fretes",
+        description=(
+            "Responde 200 quando a instância terminou o aquecimento e os checkers críticos estão saudáveis, "
+            "503 caso contrário"
+        ),
+        status_code=status.HTTP_200_OK,
+    )
+    @inject
+    async def ready(
+        readiness: "Readiness" = Depends(Provide[Container.readiness]),
+        health_check_service: "HealthCheckService" = Depends(Provide[Container.health_check_service]),
+    ):
+        report = await health_check_service.report() if readiness.is_ready else None
+        is_ready = report is not None and report.is_healthy
+        return JSONResponse(
+            status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": readiness.status if report is None else report.status,
+                "warmed_keys": readiness.warmed_keys,
+                "timed_out": readiness.timed_out,
+                "duration_seconds": readiness.duration_seconds,
+                "failing": [check.alias for check in report.checks if check.status != "ok"] if report else [],
+            },
+        )
+
     @health_router.get(
         path="/health",
         summary="Health Check do serviço de fretes",
@@ -44,12 +76,21 @@ def add_health_check_router(app: FastAPI, prefix: str = "/api") -> None:
     @inject
     async def health_check(
         settings: "AppSettings" = Depends(Provide[Container.settings]),
+        health_check_service: "HealthCheckService" = Depends(Provide[Container.health_check_service]),
     ):
-        # XXX Fixado.
-        return {
-            "version": settings.version,
-            "name": settings.app_name,
-            "service": "Gerenciamento de Fretes do Marketplace",
-        }
+        report = await health_check_service.report()
+        return JSONResponse(
+            status_code=status.HTTP_200_OK if report.is_healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=jsonable_encoder(
+                {
+                    "version": settings.version,
+                    "name": settings.app_name,
+                    "service": "Gerenciamento de Fretes do Marketplace",
+                    "status": report.status,
+                    "checked_at": report.checked_at,
+                    "checks": {check.alias: asdict(check) for check in report.checks},
+                }
+            ),
+        )
 
     app.include_router(health_router)
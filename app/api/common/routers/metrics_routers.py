@@ -0,0 +1,20 @@
+from fastapi import APIRouter, FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.common.metrics import REGISTRY
+
+
+def add_metrics_router(app: FastAPI, path: str = "/metrics") -> None:
+    metrics_router = APIRouter(tags=["Saúde do Serviço de Fretes"])
+
+    @metrics_router.get(
+        path,
+        operation_id="get_metrics",
+        name="Métricas do serviço de fretes",
+        description="Exporta as métricas da aplicação no formato texto do Prometheus",
+        include_in_schema=False,
+    )
+    async def metrics():
+        return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+    app.include_router(metrics_router)
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class HotKeyResponse(BaseModel):
+    seller_id: str = Field(..., description="Seller da chave")
+    sku: str = Field(..., description="SKU da chave")
+    count: int = Field(..., description="Consultas estimadas na janela atual")
+    error: int = Field(..., description="Quanto a contagem pode estar superestimada")
+
+
+class HotKeysResponse(BaseModel):
+    capacity: int = Field(..., description="Quantas chaves o rastreador acompanha")
+    share: float = Field(..., description="Fração das consultas recentes concentrada nas chaves acompanhadas")
+    keys: list[HotKeyResponse] = Field(default_factory=list, description="Chaves da mais para a menos consultada")
+
+
+class ProfileSessionResponse(BaseModel):
+    id: str = Field(..., description="Id do perfil gerado pela sessão")
+    seconds: float | None = Field(default=None, description="Duração máxima da sessão")
+    interval_ms: float | None = Field(default=None, description="Intervalo de amostragem")
+
+
+class ProfileSummaryResponse(BaseModel):
+    id: str = Field(..., description="Request id da requisição ou id da sessão")
+    kind: str = Field(..., description="request ou session")
+    created_at: datetime = Field(..., description="Fim da medição")
+    duration_ms: float = Field(..., description="Duração da medição")
+    samples: int = Field(..., description="Amostras de CPU coletadas")
+    cpu: bool = Field(..., description="Tem perfil de CPU (speedscope)")
+    memory: bool = Field(..., description="Tem diferença de alocações (tracemalloc)")
+
+
+class AllocationResponse(BaseModel):
+    file: str = Field(..., description="Arquivo da alocação")
+    line: int = Field(..., description="Linha da alocação")
+    size_diff: int = Field(..., description="Bytes alocados a mais ao fim da medição")
+    count_diff: int = Field(..., description="Blocos alocados a mais ao fim da medição")
+    size: int = Field(..., description="Bytes alocados pela linha ao fim da medição")
@@ -0,0 +1,49 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.common.context import get_timings
+
+
+class TimedRoute(APIRoute):
+    """
+    Rota que separa, nas etapas da requisição, o tempo do endpoint do tempo do FastAPI ao redor dele.
+
+    O FastAPI resolve dependências e valida a requisição numa única passada antes do endpoint, então as duas coisas
+    aparecem juntas na etapa `deps`: o tempo da rota menos o do endpoint.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        endpoint = self.dependant.call
+        if asyncio.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def timed_endpoint(**values: Any) -> Any:
+                timings = get_timings()
+                if timings is None:
+                    return await endpoint(**values)
+                started = time.perf_counter()
+                try:
+                    return await endpoint(**values)
+                finally:
+                    timings.add("endpoint", time.perf_counter() - started)
+
+            self.dependant.call = timed_endpoint
+
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = get_timings()
+            if timings is None:
+                return await handler(request)
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                timings.add("route", time.perf_counter() - started)
+
+        return timed_handler
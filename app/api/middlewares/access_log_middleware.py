@@ -0,0 +1,79 @@
+import logging
+import time
+
+from asgi_correlation_id import correlation_id
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.log import ACCESS_LOGGER, AccessLogEntry, AccessLogWriter
+
+from .metrics_middleware import get_route_template
+
+
+class AccessLogMiddleware:
+    """
+    Middleware ASGI puro que registra uma linha de log por requisição.
+
+    No event loop só são capturados os valores crus (método, rota, status, bytes, duração, request id e os
+    cabeçalhos permitidos); a formatação e a escrita ficam com o `AccessLogWriter`. Respeita o nível do logger
+    `app.access`, então `LOG_LEVEL=WARNING` também desliga o log de acesso.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        writer: AccessLogWriter,
+        ignored_urls: set[str] | None = None,
+        headers_to_log: set[str] | None = None,
+    ) -> None:
+        """
+        :param writer: Destino das entradas.
+        :param ignored_urls: Caminhos sem log de acesso (ex.: probes do orquestrador).
+        :param headers_to_log: Cabeçalhos da requisição incluídos na entrada.
+        """
+        self.app = app
+        self.writer = writer
+        self.ignored_urls = ignored_urls or set()
+        self.headers_to_log = {name.lower().encode("latin-1") for name in headers_to_log or ()}
+        self.logger = logging.getLogger(ACCESS_LOGGER)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.ignored_urls or not self.logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        timestamp = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            headers = (
+                [(name, value) for name, value in scope["headers"] if name in self.headers_to_log]
+                if self.headers_to_log
+                else []
+            )
+            self.writer.write(
+                AccessLogEntry(
+                    timestamp,
+                    scope["method"],
+                    scope["path"],
+                    scope["query_string"],
+                    get_route_template(scope),
+                    status_code,
+                    response_size,
+                    duration_ms,
+                    correlation_id.get(),
+                    headers,
+                )
+            )
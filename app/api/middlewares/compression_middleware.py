@@ -0,0 +1,114 @@
+from typing import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.compression import Codec, CompressionPolicy, StreamCompressor
+from app.common.context import timed
+from app.common.metrics import HTTP_COMPRESSION_BYTES
+
+from .metrics_middleware import get_route_template
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI puro que comprime as respostas com o algoritmo negociado (zstd, br ou gzip).
+
+    A decisão espera o primeiro pedaço do corpo: com o corpo inteiro, o nível sai do tamanho e da rota; em
+    partes (exportações), comprime cada pedaço com um compressor incremental, sem segurar a resposta em memória.
+    Respostas que já chegam comprimidas (variantes do cache) passam direto.
+    """
+
+    def __init__(self, app: ASGIApp, policy: Callable[[Scope], CompressionPolicy | None]) -> None:
+        """
+        :param policy: Devolve a política de compressão; `None` desliga a compressão.
+        """
+        self.app = app
+        self.policy = policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":  # pragma: no cover
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.policy(scope)
+        codec = policy.negotiate(Headers(scope=scope).get("accept-encoding", "")) if policy is not None else None
+        if policy is None or codec is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(scope, send, policy, codec))
+
+
+class _CompressingSend:
+    def __init__(self, scope: Scope, send: Send, policy: CompressionPolicy, codec: Codec):
+        self.scope = scope
+        self.send = send
+        self.policy = policy
+        self.codec = codec
+        self.start: Message | None = None
+        self.compressor: StreamCompressor | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self._send_first(start, message)
+            return
+        if self.compressor is None:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        with timed("compress"):
+            compressed = self.compressor.compress(body) if body else b""
+            if not more_body:
+                compressed += self.compressor.flush()
+        self._record(len(body), len(compressed))
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    async def _send_first(self, start: Message, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=start["headers"])
+        if "content-encoding" in headers or not self.policy.compressible(headers.get("content-type")):
+            await self.send(start)
+            await self.send(message)
+            return
+
+        profile = self.policy.profile(get_route_template(self.scope), None if more_body else len(body))
+        if profile == "off":
+            await self.send(start)
+            await self.send(message)
+            return
+
+        # Compressível: a representação depende do Accept-Encoding mesmo quando esta resposta sai sem compressão
+        headers.add_vary_header("Accept-Encoding")
+        level = self.codec.level(profile)
+        if more_body:
+            self.compressor = self.codec.compressor(level)
+            with timed("compress"):
+                compressed = self.compressor.compress(body)
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            with timed("compress"):
+                compressed = self.codec.compress(body, level)
+            if len(compressed) >= len(body):
+                await self.send(start)
+                await self.send(message)
+                return
+            headers["content-length"] = str(len(compressed))
+        headers["content-encoding"] = self.codec.name
+        self._record(len(body), len(compressed))
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _record(self, raw: int, compressed: int) -> None:
+        HTTP_COMPRESSION_BYTES.labels(self.codec.name, "raw").inc(raw)
+        HTTP_COMPRESSION_BYTES.labels(self.codec.name, "compressed").inc(compressed)
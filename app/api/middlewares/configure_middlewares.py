@@ -1,16 +1,58 @@
 from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 
 from app.api.common.trace import get_trace_id
+from app.api.v2 import SELLER_V2_PREFIX
+from app.api.v2.routers import FRETE_ITEM_ROUTE
 
+from ...common.log import AccessLogWriter
 from ...settings import ApiSettings
+from .access_log_middleware import AccessLogMiddleware
+from .compression_middleware import CompressionMiddleware
+from .load_shedding_middleware import LoadSheddingMiddleware
+from .metrics_middleware import MetricsMiddleware
+from .profiling_middleware import ProfilingMiddleware
+from .response_cache_middleware import ResponseCacheMiddleware, from_container
+from .server_timing_middleware import ServerTimingMiddleware
 
 HEADER_X_REQUEST_ID = "X-Request-ID"
 
 
+def _access_log_ignored_urls(settings: ApiSettings) -> set[str]:
+    if settings.access_log_ignored_urls is not None:
+        return settings.access_log_ignored_urls
+    # Probes do orquestrador e coleta de métricas: volume alto e nenhuma informação
+    base_path = settings.health_check_base_path
+    return {f"{base_path}/ping", f"{base_path}/health", f"{base_path}/ready", settings.metrics_path}
+
+
 def configure_middlewares(app: FastAPI, settings: ApiSettings) -> None:
+    # Mais interno de todos: só o que chega ao roteamento (não os acertos do cache) ocupa vaga no limite; o prefixo
+    # cobre os fretes e o feed de mudanças
+    app.add_middleware(
+        LoadSheddingMiddleware,  # type: ignore[arg-type]
+        shedder=from_container("load_shedder"),
+        path_prefix=SELLER_V2_PREFIX,
+        namespace_header="x-seller-id",
+    )
+    # Os acertos ainda passam por métricas, correlation id, CORS e compressão
+    app.add_middleware(
+        ResponseCacheMiddleware,  # type: ignore[arg-type]
+        route_name=FRETE_ITEM_ROUTE,
+        cache=from_container("frete_item_cache"),
+        namespace_header="x-seller-id",
+        path_param="sku",
+        hot_keys=from_container("frete_hot_keys"),
+        compression=from_container("compression_policy"),
+    )
+    if settings.profiling_enabled and settings.admin_token:
+        # Dentro do correlation id, que dá o id do perfil
+        app.add_middleware(
+            ProfilingMiddleware,  # type: ignore[arg-type]
+            profiler=from_container("profiler"),
+            token=settings.admin_token,
+        )
     app.add_middleware(
         CORSMiddleware,  # type: ignore[attr-defined]
         allow_origins=settings.cors_origins,
@@ -26,4 +68,27 @@ def configure_middlewares(app: FastAPI, settings: ApiSettings) -> None:
         generator=lambda: get_trace_id(),
     )
 
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.add_middleware(CompressionMiddleware, policy=from_container("compression_policy"))  # type: ignore[arg-type]
+
+    if settings.server_timing_enabled:
+        # Fora da compressão, para incluir o tempo dela no cabeçalho
+        app.add_middleware(
+            ServerTimingMiddleware,
+            sample_rate=settings.server_timing_sample_rate,
+            token=settings.admin_token,
+        )
+
+    if settings.access_log_enabled:
+        # Fora da compressão para registrar os bytes que saem de fato
+        app.add_middleware(
+            AccessLogMiddleware,  # type: ignore[arg-type]
+            writer=AccessLogWriter(
+                json_format=settings.log_json, headers_to_obfuscate=settings.access_log_headers_to_obfuscate
+            ),
+            ignored_urls=_access_log_ignored_urls(settings),
+            headers_to_log=settings.access_log_headers_to_log,
+        )
+
+    if settings.metrics_enabled:
+        # Por último para ficar mais externo: mede a requisição inteira e os bytes que saem de fato
+        app.add_middleware(MetricsMiddleware, excluded_paths={settings.metrics_path})
@@ -0,0 +1,63 @@
+import time
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.api.common.schemas.response import get_error_response
+from app.common.load_shedding import LoadShedder, Rejection
+
+
+def rejection_response(rejection: Rejection) -> JSONResponse:
+    return JSONResponse(
+        status_code=rejection.error.http_code,
+        content=get_error_response(rejection.error).model_dump(exclude_none=True),
+        headers={"Retry-After": str(rejection.retry_after)},
+    )
+
+
+class LoadSheddingMiddleware:
+    """
+    Middleware ASGI puro que aplica o controle de admissão (`LoadShedder`) às requisições de um prefixo.
+
+    A recusa sai na hora, sem roteamento nem consulta ao banco. Fica por dentro do cache de respostas: os acertos
+    não ocupam vaga nem entram na latência que ajusta o limite.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        shedder: Callable[[Scope], LoadShedder | None],
+        path_prefix: str,
+        namespace_header: str,
+    ) -> None:
+        """
+        :param shedder: Devolve o controle de admissão; `None` desliga.
+        :param path_prefix: Prefixo das rotas controladas (ex.: `/seller/v2/fretes`).
+        :param namespace_header: Cabeçalho que identifica o seller no fair share (ex.: `x-seller-id`).
+        """
+        self.app = app
+        self.shedder = shedder
+        self.path_prefix = path_prefix
+        self.namespace_header = namespace_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        shedder = self.shedder(scope)
+        if shedder is None or not shedder.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        rejection = shedder.acquire(Headers(scope=scope).get(self.namespace_header))
+        if rejection is not None:
+            await rejection_response(rejection)(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            shedder.release(time.perf_counter() - started)
@@ -0,0 +1,58 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS, HTTP_RESPONSE_SIZE
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def get_route_template(scope: Scope) -> str:
+    """
+    Caminho com template da rota atendida (ex.: `/seller/v2/fretes/{sku}`).
+
+    O roteador do FastAPI grava a rota no escopo ao casar a requisição; sem rota, um rótulo fixo
+    evita que URLs arbitrárias (404, scans) explodam a cardinalidade das métricas.
+    """
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro que registra latência, status, tamanho de resposta e requisições em andamento.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: set[str] | None = None) -> None:
+        self.app = app
+        self.excluded_paths = excluded_paths or set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            route = get_route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method, route).observe(duration)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(response_size)
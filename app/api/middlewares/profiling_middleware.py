@@ -0,0 +1,62 @@
+import secrets
+from typing import Callable
+
+from asgi_correlation_id import correlation_id
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.profiling import Profiler
+
+PROFILE_HEADER = b"x-profile"
+TOKEN_HEADER = b"x-admin-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI puro que gera o perfil de uma requisição marcada com o cabeçalho `x-profile`.
+
+    `x-profile: cpu`, `memory` ou `cpu,memory` escolhe o perfil, e a requisição também precisa do `x-admin-token`
+    com o `token`. Sem isso a requisição segue normalmente, sem perfil. O perfil fica no `Profiler` com o
+    X-Request-ID como id, devolvido no cabeçalho `x-profile-id`.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: Callable[[Scope], Profiler | None], token: str) -> None:
+        """
+        :param profiler: Devolve o profiler onde os perfis são guardados.
+        :param token: Token exigido no cabeçalho `x-admin-token`.
+        """
+        if not token:
+            raise ValueError("O profiling de requisições exige um token")
+        self.app = app
+        self.profiler = profiler
+        self.token = token.encode()
+
+    def _requested(self, scope: Scope) -> set[str]:
+        headers = dict(scope["headers"])
+        requested = headers.get(PROFILE_HEADER)
+        if not requested:
+            return set()
+        if not secrets.compare_digest(headers.get(TOKEN_HEADER, b""), self.token):
+            return set()
+        return {kind.strip() for kind in requested.decode("latin-1").lower().split(",")}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        requested = self._requested(scope) if scope["type"] == "http" else set()
+        profiler = self.profiler(scope) if requested else None
+        if profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = correlation_id.get() or f"request-{id(scope)}"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).append((PROFILE_ID_HEADER, profile_id.encode("latin-1")))
+            await send(message)
+
+        profiling = profiler.profile_request(profile_id, cpu="cpu" in requested, memory="memory" in requested)
+        profiling.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiling.stop()
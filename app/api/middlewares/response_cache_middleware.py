@@ -0,0 +1,110 @@
+from typing import Any, Callable
+
+from fastapi import status
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.api.common.conditional import Validators
+from app.api.common.rendering import cached_response
+from app.common.compression import CompressionPolicy
+from app.integrations.cache import HotKeyTracker, LruCache
+
+
+def from_container(provider_name: str) -> Callable[[Scope], Any]:
+    """
+    Busca a dependência no container da aplicação, que só é anexado depois de os middlewares serem registrados.
+    """
+
+    def _provide(scope: Scope) -> Any:
+        container = getattr(scope.get("app"), "container", None)
+        return getattr(container, provider_name)() if container is not None else None
+
+    return _provide
+
+
+class ResponseCacheMiddleware:
+    """
+    Middleware ASGI puro que atende GETs de uma rota direto com a resposta serializada em cache.
+
+    No acerto os bytes vão para o `send` sem passar pelo roteamento, pela resolução de dependências nem pela
+    validação e serialização do modelo. A chave é `(cabeçalho, parâmetro do caminho)`, a mesma usada pela rota
+    para preencher o cache e pelo serviço para invalidá-lo. Toda consulta à rota, acerto ou não, é contada no
+    rastreador de chaves quentes.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        route_name: str,
+        cache: Callable[[Scope], LruCache | None],
+        namespace_header: str,
+        path_param: str,
+        hot_keys: Callable[[Scope], HotKeyTracker | None] | None = None,
+        compression: Callable[[Scope], CompressionPolicy | None] | None = None,
+    ) -> None:
+        """
+        :param route_name: Nome da rota atendida (por padrão, o nome da função do endpoint).
+        :param cache: Devolve o cache a consultar; `None` desliga o cache.
+        :param namespace_header: Cabeçalho que compõe a chave (ex.: `x-seller-id`).
+        :param path_param: Parâmetro do caminho que compõe a chave (ex.: `sku`).
+        :param hot_keys: Devolve o rastreador de chaves quentes, se houver.
+        :param compression: Devolve a política de compressão, para enviar o corpo já comprimido guardado no cache.
+        """
+        self.app = app
+        self.route_name = route_name
+        self.cache = cache
+        self.hot_keys = hot_keys
+        self.compression = compression
+        self.namespace_header = namespace_header
+        self.path_param = path_param
+        self._route: Any = None
+        self._shadowed_paths: frozenset[str] = frozenset()
+
+    def _find_route(self, scope: Scope) -> Any:
+        if self._route is None:
+            routes = getattr(scope.get("app"), "routes", [])
+            index = next((i for i, route in enumerate(routes) if getattr(route, "name", None) == self.route_name), None)
+            if index is None:
+                return None
+            self._route = routes[index]
+            # Caminhos fixos declarados antes da rota são de outras rotas, não um sku
+            self._shadowed_paths = frozenset(
+                route.path for route in routes[:index] if "{" not in getattr(route, "path", "{")
+            )
+        return self._route
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        namespace = Headers(scope=scope).get(self.namespace_header)
+        route = self._find_route(scope)
+        match, child_scope = route.matches(scope) if namespace and route is not None else (Match.NONE, {})
+        if namespace is None or match != Match.FULL or scope["path"] in self._shadowed_paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = (namespace, child_scope["path_params"][self.path_param])
+        hot_keys = self.hot_keys(scope) if self.hot_keys is not None else None
+        if hot_keys is not None:
+            hot_keys.add(key)
+
+        cache = self.cache(scope)
+        cached = cache.get(key) if cache is not None and cache.enabled else None
+        if cached is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Rota e parâmetros no escopo como o roteador deixaria, para as métricas rotularem pelo template
+        scope.update(child_scope)
+        request = Request(scope)
+        not_modified = Validators.from_headers(cached.headers).is_not_modified(request)
+        policy = self.compression(scope) if self.compression is not None and cached.encodings else None
+        codec = policy.negotiate(request.headers.get("accept-encoding", "")) if policy is not None else None
+        response = cached_response(
+            cached, status_code=status.HTTP_304_NOT_MODIFIED if not_modified else status.HTTP_200_OK, codec=codec
+        )
+        await response(scope, receive, send)
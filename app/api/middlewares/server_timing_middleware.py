@@ -0,0 +1,83 @@
+import random
+import secrets
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.context import RequestTimings, reset_timings, set_timings
+
+FORCE_HEADER = b"x-server-timing"
+TOKEN_HEADER = b"x-admin-token"
+SERVER_TIMING_HEADER = b"server-timing"
+
+# Etapas na ordem do cabeçalho: dependências e validação, cache, comandos no MongoDB, serialização e compressão
+STAGES = ("deps", "cache", "mongo", "serialize", "compress")
+
+
+def server_timing(timings: RequestTimings, total: float) -> str:
+    """
+    Cabeçalho Server-Timing com as etapas medidas, em ms; etapas repetidas levam a contagem em `desc`.
+
+    Ex.: `deps;dur=0.41, cache;dur=0.02, mongo;dur=3.10;desc="2x", serialize;dur=0.30, total;dur=4.20`.
+    """
+    durations = dict(timings.durations)
+    if "route" in durations:
+        durations["deps"] = max(0.0, durations.pop("route") - durations.pop("endpoint", 0.0))
+    metrics = []
+    for name in STAGES:
+        if name in durations:
+            count = timings.counts.get(name, 1)
+            metric = f"{name};dur={durations[name] * 1000:.2f}"
+            metrics.append(f'{metric};desc="{count}x"' if count > 1 else metric)
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware ASGI puro que mede as etapas de uma amostra das requisições e as devolve no cabeçalho Server-Timing.
+
+    Uma fração `sample_rate` das requisições é medida, além das que trazem o cabeçalho `x-server-timing` junto com
+    o `x-admin-token` com o `token`; sem token configurado, o cabeçalho não força a medição. As etapas são
+    acumuladas por um contextvar (`app.common.context.timing`); fora da amostra a coleta se resume a ler um
+    contextvar vazio em cada ponto medido.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float, token: str | None = None) -> None:
+        """
+        :param sample_rate: Fração das requisições medidas, de 0 a 1.
+        :param token: Token exigido no cabeçalho `x-admin-token` para forçar a medição com `x-server-timing`.
+        """
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token.encode() if token else None
+
+    def _sampled(self, scope: Scope) -> bool:
+        # Sorteio da amostragem, não um segredo: o gerador padrão basta e custa bem menos que o `secrets`
+        if self.sample_rate and random.random() < self.sample_rate:  # nosec B311
+            return True
+        if self.token is None:
+            return False
+        headers = dict(scope["headers"])
+        return FORCE_HEADER in headers and secrets.compare_digest(headers.get(TOKEN_HEADER, b""), self.token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._sampled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Tudo o que acontece até aqui, inclusive a compressão de respostas não transmitidas em partes
+                header = server_timing(timings, time.perf_counter() - started)
+                message.setdefault("headers", []).append((SERVER_TIMING_HEADER, header.encode("latin-1")))
+            await send(message)
+
+        token = set_timings(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            reset_timings(token)
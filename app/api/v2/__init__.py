@@ -9,9 +9,11 @@ router_seller = APIRouter(prefix=SELLER_V2_PREFIX)
 
 def load_routes(router_seller: APIRouter):
     if api_settings.enable_seller_resources:
+        from app.api.v2.routers.frete_router import changes_router as frete_changes_router
         from app.api.v2.routers.frete_router import router as frete_router
 
         router_seller.include_router(frete_router)
+        router_seller.include_router(frete_changes_router)
 
 
 load_routes(router_seller)
@@ -1 +1,5 @@
 FRETE_PREFIX = "/fretes"
+# Feed de mudanças fica fora de "/fretes" para que nenhum caminho fixo concorra com "/fretes/{sku}"
+FRETE_CHANGES_PREFIX = "/frete-changes"
+# Nome da rota do frete por sku, usado pelo ResponseCacheMiddleware
+FRETE_ITEM_ROUTE = "get_by_seller_id_and_sku"
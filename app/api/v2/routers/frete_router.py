@@ -1,19 +1,46 @@
 from typing import TYPE_CHECKING
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, status, Header, HTTPException
+from fastapi import APIRouter, Depends, status, Header, HTTPException, Query, Request, Response
 
+from app.api.common.conditional import EntityVersion, Validators, has_conditional_headers, parse_if_match
+from app.api.common.deadline_route import DeadlineRoute
+from app.api.common.rendering import JsonRenderer, cached_response, precompress
 from app.api.common.schemas import ListResponse, Paginator, get_request_pagination
+from app.api.common.timed_route import TimedRoute
+from app.common.compression import CompressionPolicy
 from app.container import Container
+from app.integrations.cache import CachedResponse, GenerationalCache, LruCache
+from app.settings import api_settings
 
 from ..schemas.frete_schema import FreteSchema, FreteResponse, FreteCreate, FreteCreateResponse, FreteUpdate, FreteUpdateResponse, FreteReplace, FreteReplaceResponse
-from . import FRETE_PREFIX
+from ..schemas.frete_schema import FreteChangeSchema, FreteChangesResponse
+from . import FRETE_CHANGES_PREFIX, FRETE_ITEM_ROUTE, FRETE_PREFIX
 
 if TYPE_CHECKING:
     from app.services import FreteService
 
 
-router = APIRouter(prefix=FRETE_PREFIX, tags=["Fretes V2"])
+class FreteRoute(DeadlineRoute, TimedRoute):
+    """
+    Rotas de fretes: prazo da requisição, cancelamento na desconexão e tempo do endpoint nas etapas.
+    """
+
+
+router = APIRouter(prefix=FRETE_PREFIX, tags=["Fretes V2"], route_class=FreteRoute)
+changes_router = APIRouter(prefix=FRETE_CHANGES_PREFIX, tags=["Fretes V2"], route_class=FreteRoute)
+
+list_renderer = JsonRenderer(ListResponse[FreteResponse])
+item_renderer = JsonRenderer(FreteResponse)
+
+
+def render_frete(frete) -> CachedResponse:
+    """
+    Resposta do frete por sku pronta para o cache: corpo serializado, ETag e Last-Modified.
+    """
+    validators = Validators.for_entity(EntityVersion.from_entity(frete))
+    return CachedResponse(body=item_renderer.render(frete), headers=validators.headers)
+
 
 async def get_seller_id(x_seller_id: str = Header(..., alias="x-seller-id")) -> str:
     if not x_seller_id:
@@ -31,11 +58,14 @@ async def get_seller_id(x_seller_id: str = Header(..., alias="x-seller-id")) ->
 )
 @inject
 async def get(
+    request: Request,
     paginator: Paginator = Depends(get_request_pagination),
     seller_id: str = Depends(get_seller_id),
     preco_less_than: int = None,
     preco_greater_than: int = None,
     frete_service: "FreteService" = Depends(Provide[Container.frete_service]),
+    list_cache: GenerationalCache = Depends(Provide[Container.frete_list_cache]),
+    compression: CompressionPolicy = Depends(Provide[Container.compression_policy]),
 ):
     filters = {"seller_id": seller_id}
     
@@ -44,9 +74,65 @@ async def get(
     if preco_greater_than is not None:
         filters["preco_greater_than"] = preco_greater_than
 
+    # Tudo que muda o corpo da página: filtros, ordenação, paginação e o caminho usado nos links
+    cache_key = (paginator.request_path, paginator.limit, paginator.offset, paginator.sort, *sorted(filters.items()))
+    codec = compression.negotiate(request.headers.get("accept-encoding", ""))
+    cached = list_cache.get_in(seller_id, cache_key)
+    if cached is not None:
+        if Validators.from_headers(cached.headers).is_not_modified(request, use_last_modified=False):
+            return cached_response(cached, status_code=status.HTTP_304_NOT_MODIFIED)
+        return cached_response(cached, codec=codec)
+
+    # Lida antes da consulta: se houver escrita no meio do caminho a página não é guardada
+    generation = list_cache.generation(seller_id)
+
+    if has_conditional_headers(request):
+        # Só a projeção das versões: página inalterada responde 304 sem buscar nem serializar os fretes.
+        # Em listas vale apenas o ETag, já que uma remoção não altera o Last-Modified da página.
+        versions = await frete_service.find_all_versions(paginator=paginator, filters=filters)
+        validators = Validators.build(f"{seller_id}|list", map(EntityVersion.from_document, versions))
+        if validators.is_not_modified(request, use_last_modified=False):
+            return validators.not_modified()
+
     results = await frete_service.find_all(paginator=paginator, filters=filters)
-    
-    return paginator.paginate(results=results)
+    validators = Validators.build(f"{seller_id}|list", map(EntityVersion.from_entity, results))
+    page = CachedResponse(body=list_renderer.render(paginator.paginate(results=results)), headers=validators.headers)
+    # Comprimida já no preenchimento: os acertos seguintes do mesmo tipo de cliente só reenviam os bytes
+    page = precompress(page, compression, codec, request.scope["route"].path_format)
+    list_cache.set_in(seller_id, cache_key, page, generation=generation)
+
+    return cached_response(page, codec=codec)
+
+# Feed de mudanças dos fretes do seller
+@changes_router.get(
+    "",
+    response_model=FreteChangesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Recuperar as mudanças nos fretes desde o último token",
+)
+@inject
+async def get_changes(
+    since: str | None = Query(None, description="Token next da chamada anterior; sem ele, desde o início"),
+    limit: int = Query(100, ge=1, le=api_settings.frete_changes_max_limit, description="Máximo de mudanças"),
+    seller_id: str = Depends(get_seller_id),
+    frete_service: "FreteService" = Depends(Provide[Container.frete_service]),
+):
+    page = await frete_service.find_changes(seller_id, since=since, limit=limit)
+    return FreteChangesResponse(
+        results=[
+            FreteChangeSchema(
+                type=change.type,
+                id=change.entity_id,
+                seller_id=change.seller_id,
+                sku=change.sku,
+                changed_at=change.position.timestamp,
+                frete=FreteResponse.model_validate(change.frete) if change.frete is not None else None,
+            )
+            for change in page.changes
+        ],
+        next=page.next.encode(),
+        has_more=page.has_more,
+    )
 
 # Busca fretes por "seller_id" e "sku"
 @router.get(
@@ -54,14 +140,32 @@ async def get(
     response_model=FreteResponse,
     status_code=status.HTTP_200_OK,
     summary="Recuperar frete por seller_id e sku",
+    name=FRETE_ITEM_ROUTE,
 )
 @inject
 async def get_by_seller_id_and_sku(
     sku: str,
+    request: Request,
     seller_id: str = Depends(get_seller_id),
     frete_service: "FreteService" = Depends(Provide[Container.frete_service]),
+    item_cache: LruCache = Depends(Provide[Container.frete_item_cache]),
+    compression: CompressionPolicy = Depends(Provide[Container.compression_policy]),
 ):
-    return await frete_service.find_by_seller_id_and_sku(seller_id=seller_id, sku=sku)
+    # Os acertos são atendidos pelo ResponseCacheMiddleware antes de chegar aqui; a rota só preenche o cache
+    since = item_cache.invalidations
+
+    if has_conditional_headers(request):
+        version = await frete_service.find_version_by_seller_id_and_sku(seller_id=seller_id, sku=sku)
+        if version is not None:
+            validators = Validators.for_entity(EntityVersion.from_document(version))
+            if validators.is_not_modified(request):
+                return validators.not_modified()
+
+    frete = await frete_service.find_by_seller_id_and_sku(seller_id=seller_id, sku=sku)
+    codec = compression.negotiate(request.headers.get("accept-encoding", ""))
+    cached = precompress(render_frete(frete), compression, codec, request.scope["route"].path_format)
+    item_cache.set((seller_id, sku), cached, since=since)
+    return cached_response(cached, codec=codec)
 
 # Cria um frete para um produto
 @router.post(
@@ -90,10 +194,14 @@ async def create(
 async def update_frete_value(
     sku: str,
     frete_data: FreteUpdate,
+    response: Response,
     seller_id: str = Depends(get_seller_id),
+    if_match: str | None = Header(None, alias="if-match"),
     frete_service: "FreteService" = Depends(Provide[Container.frete_service]),
 ):
-    return await frete_service.update_frete_value(seller_id, sku, frete_data)
+    frete = await frete_service.update_frete_value(seller_id, sku, frete_data, if_match=parse_if_match(if_match))
+    Validators.for_entity(EntityVersion.from_entity(frete)).apply(response)
+    return frete
 
 # Substitui completamente os dados do frete
 @router.put(
@@ -106,10 +214,14 @@ async def update_frete_value(
 async def replace_frete(
     sku: str,
     frete_data: FreteReplace,
+    response: Response,
     seller_id: str = Depends(get_seller_id),
+    if_match: str | None = Header(None, alias="if-match"),
     frete_service: "FreteService" = Depends(Provide[Container.frete_service]),
 ):
-    return await frete_service.replace_frete(seller_id, sku, frete_data)
+    frete = await frete_service.replace_frete(seller_id, sku, frete_data, if_match=parse_if_match(if_match))
+    Validators.for_entity(EntityVersion.from_entity(frete)).apply(response)
+    return frete
 
 # Deleta o frete de um produto
 @router.delete(
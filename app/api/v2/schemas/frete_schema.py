@@ -1,38 +1,76 @@
-from app.api.common.schemas import ResponseEntity, SchemaType
+from datetime import datetime
+from typing import Literal
+
+from app.api.common.schemas import ResponseEntity, SchemaType, UuidType
 from pydantic import Field
 
+
 class FreteBase(SchemaType):
     seller_id: str = Field(..., min_length=1)
     sku: str = Field(..., min_length=1)
 
+
 class FreteSchema(FreteBase):
     valor: int
 
-class FreteResponse(FreteSchema, ResponseEntity):
+
+class FreteVersioned(SchemaType):
+    version: int | None = Field(default=None, description="Versão do frete, usada no If-Match")
+
+
+class FreteResponse(FreteSchema, FreteVersioned, ResponseEntity):
     """Resposta adicionando"""
 
+
 class FreteCreate(SchemaType):
     """Schema para criação de Fretes"""
+
     sku: str = Field(..., min_length=1)
     valor: int
 
-class FreteCreateResponse(FreteBase):
+
+class FreteCreateResponse(FreteBase, FreteVersioned):
     """Resposta para a criação de Fretes"""
 
+
 class FreteUpdate(SchemaType):
     """Schema para atualização de Fretes"""
+
     seller_id: str | None = Field(default=None, min_length=1)
     sku: str | None = Field(default=None, min_length=1)
     valor: int | None = Field(default=None)
 
-class FreteUpdateResponse(FreteBase):
+
+class FreteUpdateResponse(FreteBase, FreteVersioned):
     """Resposta para a atualização de Fretes"""
 
-class FreteReplace(SchemaType):   
+
+class FreteReplace(SchemaType):
     """Schema para substituição de Fretes"""
+
     seller_id: str = Field(..., min_length=1)
     sku: str = Field(..., min_length=1)
     valor: int
 
-class FreteReplaceResponse(FreteBase):
-    """Resposta para a substituição de Fretes"""
\ No newline at end of file
+
+class FreteReplaceResponse(FreteBase, FreteVersioned):
+    """Resposta para a substituição de Fretes"""
+
+
+class FreteChangeSchema(SchemaType):
+    """Mudança no feed de fretes"""
+
+    type: Literal["upsert", "delete"] = Field(..., description="upsert: criado ou alterado; delete: removido ou movido")
+    id: UuidType = Field(..., description="Id do frete")
+    seller_id: str
+    sku: str
+    changed_at: datetime = Field(..., description="Data e hora da mudança")
+    frete: FreteResponse | None = Field(default=None, description="Frete atual; ausente nas remoções")
+
+
+class FreteChangesResponse(SchemaType):
+    """Página do feed de mudanças de fretes"""
+
+    results: list[FreteChangeSchema]
+    next: str = Field(..., description="Token para a próxima chamada (parâmetro since)")
+    has_more: bool = Field(..., description="Há mais mudanças disponíveis agora; chame de novo com o token next")
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from typing import Any
+
+from app.services.frete.frete_exceptions import FreteNotFoundException
+
+from .routers.frete_router import render_frete
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_frete_cache(container: Any, limit: int, concurrency: int) -> int:
+    """
+    Pré-carrega no cache de respostas os fretes do último retrato de chaves quentes.
+
+    :param container: Container da aplicação.
+    :param limit: Quantas chaves do retrato carregar.
+    :param concurrency: Consultas simultâneas ao banco.
+    :return: Quantos fretes ficaram em cache.
+    """
+    tracker = container.frete_hot_keys()
+    keys = await container.hot_key_store().load(tracker.name, limit)
+    frete_service = container.frete_service()
+    item_cache = container.frete_item_cache()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _load(seller_id: str, sku: str) -> bool:
+        async with semaphore:
+            since = item_cache.invalidations
+            try:
+                frete = await frete_service.find_by_seller_id_and_sku(seller_id=seller_id, sku=sku)
+            except FreteNotFoundException:
+                return False
+            item_cache.set((seller_id, sku), render_frete(frete), since=since)
+            return True
+
+    loaded = await asyncio.gather(*(_load(seller_id, sku) for seller_id, sku in keys))
+    return sum(loaded)
+
+
+async def run_warm_up(container: Any, settings: Any) -> None:
+    """
+    Fase de aquecimento da inicialização: marca a instância como pronta ao terminar, ao estourar o prazo ou
+    se o aquecimento falhar, para nunca prendê-la fora do balanceador.
+    """
+    readiness = container.readiness()
+    warmed, timed_out = 0, False
+    try:
+        if settings.frete_warmup_keys and container.frete_item_cache().enabled:
+            warmed = await asyncio.wait_for(
+                warm_up_frete_cache(container, settings.frete_warmup_keys, settings.frete_warmup_concurrency),
+                timeout=settings.frete_warmup_timeout_seconds,
+            )
+    except TimeoutError:
+        timed_out = True
+        warmed = len(container.frete_item_cache())
+        logger.warning(f"Aquecimento do cache interrompido após {settings.frete_warmup_timeout_seconds}s")
+    except Exception as exc:
+        logger.warning(f"Falha no aquecimento do cache: {exc!r}")
+    readiness.mark_ready(warmed_keys=warmed, timed_out=timed_out)
+    logger.info(f"Instância pronta: {warmed} fretes pré-carregados em {readiness.duration_seconds}s")
@@ -0,0 +1,14 @@
+from .codecs import BrotliCodec, Codec, CompressionProfile, GzipCodec, StreamCompressor, ZstdCodec, available_codecs
+from .policy import CompressionPolicy, parse_accept_encoding
+
+__all__ = [
+    "BrotliCodec",
+    "Codec",
+    "CompressionPolicy",
+    "CompressionProfile",
+    "GzipCodec",
+    "StreamCompressor",
+    "ZstdCodec",
+    "available_codecs",
+    "parse_accept_encoding",
+]
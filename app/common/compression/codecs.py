@@ -0,0 +1,126 @@
+import gzip
+import zlib
+from abc import ABC, abstractmethod
+from typing import Literal, Protocol
+
+try:
+    import brotli
+
+    HAS_BROTLI = True
+except ImportError:  # pragma: no cover
+    HAS_BROTLI = False
+
+try:
+    import zstandard
+
+    HAS_ZSTANDARD = True
+except ImportError:  # pragma: no cover
+    HAS_ZSTANDARD = False
+
+# Perfis de nível: `fast` para corpos grandes e streaming, `balanced` no caso geral e `small` para respostas
+# comprimidas uma vez e reenviadas muitas (cache), onde vale gastar mais CPU por menos bytes
+CompressionProfile = Literal["off", "fast", "balanced", "small"]
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...  # pragma: no cover
+
+    def flush(self) -> bytes: ...  # pragma: no cover
+
+
+class Codec(ABC):
+    """
+    Algoritmo de compressão negociável por Accept-Encoding, com o nível de cada perfil.
+
+    Os níveis vêm do `python -m scripts.benchmark.compression`: acima deles o brotli e o zstd custam muito mais
+    CPU por poucos bytes a menos.
+    """
+
+    name: str
+    levels: dict[str, int]
+
+    @abstractmethod
+    def compress(self, data: bytes, level: int) -> bytes:
+        """
+        Comprime o corpo inteiro de uma vez.
+        """
+
+    @abstractmethod
+    def compressor(self, level: int) -> StreamCompressor:
+        """
+        Compressor incremental, para respostas enviadas em partes.
+        """
+
+    def level(self, profile: CompressionProfile) -> int:
+        return self.levels[profile]
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+    levels = {"fast": 1, "balanced": 6, "small": 9}
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def compressor(self, level: int) -> StreamCompressor:
+        # wbits 31: formato gzip (cabeçalho e CRC), não o zlib puro
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+class BrotliCodec(Codec):
+    name = "br"
+    levels = {"fast": 1, "balanced": 4, "small": 5}
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        return brotli.compress(data, quality=level)
+
+    def compressor(self, level: int) -> StreamCompressor:
+        return _BrotliStream(brotli.Compressor(quality=level))
+
+
+class _BrotliStream:
+    def __init__(self, compressor: "brotli.Compressor"):
+        self._compressor = compressor
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+    # Nos corpos JSON da API, até o nível 12 nenhum comprime mais que o 1, e os que comprimem custam dezenas de
+    # vezes mais CPU: o zstd usa o nível 1 em todos os perfis
+    levels = {"fast": 1, "balanced": 1, "small": 1}
+
+    def __init__(self) -> None:
+        self._compressors: dict[int, "zstandard.ZstdCompressor"] = {}
+
+    def _compressor(self, level: int) -> "zstandard.ZstdCompressor":
+        # O ZstdCompressor guarda contexto e tabelas; reaproveitado entre respostas do mesmo nível, já que cada
+        # compressão de uma vez termina antes da próxima começar
+        compressor = self._compressors.get(level)
+        if compressor is None:
+            compressor = self._compressors[level] = zstandard.ZstdCompressor(level=level)
+        return compressor
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        return self._compressor(level).compress(data)
+
+    def compressor(self, level: int) -> StreamCompressor:
+        # Respostas em partes se intercalam no event loop: cada uma precisa do próprio contexto
+        return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+def available_codecs() -> dict[str, Codec]:
+    """
+    Algoritmos com a biblioteca instalada; o gzip, da biblioteca padrão, sempre está.
+    """
+    codecs: dict[str, Codec] = {"gzip": GzipCodec()}
+    if HAS_BROTLI:
+        codecs["br"] = BrotliCodec()
+    if HAS_ZSTANDARD:
+        codecs["zstd"] = ZstdCodec()
+    return codecs
@@ -0,0 +1,129 @@
+import logging
+
+from .codecs import Codec, CompressionProfile, available_codecs
+
+logger = logging.getLogger(__name__)
+
+# Tipos que comprimem bem; imagens, arquivos já comprimidos e eventos em tempo real (SSE) passam direto
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/ndjson",
+    "text/",
+    "application/javascript",
+    "application/xml",
+)
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+EVENT_STREAM = "text/event-stream"
+
+# Valores distintos de Accept-Encoding são poucos (um por tipo de cliente); a negociação de cada um é guardada
+_NEGOTIATION_CACHE_SIZE = 256
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """
+    Algoritmos aceitos com o peso (q) de cada um: `gzip, br;q=0.5` → `{"gzip": 1.0, "br": 0.5}`.
+    """
+    accepted: dict[str, float] = {}
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        accepted[name] = weight
+    return accepted
+
+
+class CompressionPolicy:
+    """
+    Decide se e como comprimir cada resposta.
+
+    O algoritmo sai do Accept-Encoding: vence o de maior peso para o cliente, com empate resolvido pela ordem de
+    preferência do servidor. Abaixo de `min_size` não compensa comprimir; acima, o nível sai do perfil da rota, se
+    configurado, ou do tamanho do corpo: a partir de `large_size` (ou em partes, tamanho desconhecido) usa o perfil
+    `fast`, que corta a maior parte dos bytes com uma fração da CPU.
+    """
+
+    def __init__(
+        self,
+        codecs: list[str],
+        min_size: int,
+        large_size: int,
+        routes: dict[str, CompressionProfile] | None = None,
+        enabled: bool = True,
+    ):
+        """
+        :param codecs: Algoritmos em ordem de preferência do servidor (`zstd`, `br`, `gzip`); os que não tiverem a
+            biblioteca instalada são ignorados.
+        :param min_size: Tamanho mínimo do corpo, em bytes, para comprimir.
+        :param large_size: A partir deste tamanho usa o perfil `fast`.
+        :param routes: Perfil fixo por template de rota (ex.: `{"/seller/v2/fretes": "fast"}`); `off` desliga.
+        :param enabled: Desligada, nenhuma resposta é comprimida.
+        """
+        installed = available_codecs()
+        missing = [name for name in codecs if name not in installed]
+        if missing:
+            logger.warning(f"Compressão sem biblioteca instalada, ignorada: {missing}")
+        self.codecs = [installed[name] for name in codecs if name in installed]
+        self.min_size = min_size
+        self.large_size = large_size
+        self.routes = routes or {}
+        self.enabled = enabled and bool(self.codecs)
+        self._negotiated: dict[str, Codec | None] = {}
+
+    def negotiate(self, accept_encoding: str) -> Codec | None:
+        """
+        Algoritmo a usar com o cliente, ou `None` se ele não aceitar nenhum dos disponíveis.
+        """
+        if not self.enabled or not accept_encoding:
+            return None
+        try:
+            return self._negotiated[accept_encoding]
+        except KeyError:
+            pass
+        codec = self._negotiate(parse_accept_encoding(accept_encoding))
+        if len(self._negotiated) >= _NEGOTIATION_CACHE_SIZE:
+            self._negotiated.clear()
+        self._negotiated[accept_encoding] = codec
+        return codec
+
+    def _negotiate(self, accepted: dict[str, float]) -> Codec | None:
+        default = accepted.get("*", 0.0)
+        best, best_weight = None, 0.0
+        for codec in self.codecs:
+            weight = accepted.get(codec.name, default)
+            if weight > best_weight:
+                best, best_weight = codec, weight
+        return best
+
+    def profile(self, route: str | None, size: int | None, reused: bool = False) -> CompressionProfile:
+        """
+        :param route: Template da rota atendida.
+        :param size: Tamanho do corpo; `None` quando a resposta vai em partes.
+        :param reused: A versão comprimida será reenviada várias vezes (cache): troca `balanced` por `small`.
+        """
+        if size is not None and size < self.min_size:
+            return "off"
+        profile = self.routes.get(route) if route is not None else None
+        if profile is not None:
+            return profile
+        if size is None or size >= self.large_size:
+            return "fast"
+        return "small" if reused else "balanced"
+
+    @staticmethod
+    def compressible(content_type: str | None) -> bool:
+        if not content_type:
+            return False
+        media_type = content_type.partition(";")[0].strip().lower()
+        if media_type == EVENT_STREAM:
+            return False
+        return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIXES)
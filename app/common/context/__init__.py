@@ -1,4 +1,20 @@
+from .deadline import Deadline, get_deadline, reset_deadline, set_deadline
 from .factory import get_context, set_context
 from .model import AppContext, AppContextScope
+from .timing import RequestTimings, get_timings, reset_timings, set_timings, timed
 
-__all__ = ["AppContext", "AppContextScope", "get_context", "set_context"]
+__all__ = [
+    "AppContext",
+    "AppContextScope",
+    "Deadline",
+    "RequestTimings",
+    "get_context",
+    "get_deadline",
+    "get_timings",
+    "reset_deadline",
+    "reset_timings",
+    "set_context",
+    "set_deadline",
+    "set_timings",
+    "timed",
+]
@@ -0,0 +1,44 @@
+import time
+from contextvars import ContextVar, Token
+
+
+class Deadline:
+    """
+    Instante, no relógio monotônico, a partir do qual quem fez a requisição já desistiu da resposta.
+    """
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """
+        Segundos até o prazo; zero ou negativo quando já passou.
+        """
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_request_deadline: ContextVar[Deadline | None] = ContextVar("_request_deadline", default=None)
+
+
+def set_deadline(deadline: Deadline | None) -> Token:
+    """
+    Define o prazo da requisição atual; devolve o token para `reset_deadline`.
+    """
+    return _request_deadline.set(deadline)
+
+
+def reset_deadline(token: Token) -> None:
+    _request_deadline.reset(token)
+
+
+def get_deadline() -> Deadline | None:
+    return _request_deadline.get()
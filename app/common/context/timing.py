@@ -0,0 +1,71 @@
+import time
+from contextvars import ContextVar, Token
+
+
+class RequestTimings:
+    """
+    Tempo acumulado e quantidade de ocorrências por etapa de uma requisição (cache, mongo, serialização...).
+    """
+
+    __slots__ = ("durations", "counts")
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar("_request_timings", default=None)
+
+
+def set_timings(timings: RequestTimings) -> Token:
+    """
+    Passa a acumular em `timings` as etapas da requisição atual; devolve o token para `reset_timings`.
+    """
+    return _request_timings.set(timings)
+
+
+def reset_timings(token: Token) -> None:
+    _request_timings.reset(token)
+
+
+def get_timings() -> RequestTimings | None:
+    return _request_timings.get()
+
+
+class _Timer:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.timings.add(self.name, time.perf_counter() - self.started)
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+def timed(name: str) -> _Timer | _NoTimer:
+    """
+    Mede o bloco `with` na etapa `name` se a requisição atual estiver sendo medida; senão não faz nada.
+    """
+    timings = _request_timings.get()
+    return _NO_TIMER if timings is None else _Timer(timings, name)
@@ -6,3 +6,8 @@ def utcnow() -> datetime:
     # Trunca os microssegundos mantendo somente milissegundos
     # O mongodb não armazena microssegundos
     return now.replace(microsecond=(now.microsecond // 1000) * 1000)
+
+
+def as_utc(value: datetime) -> datetime:
+    # Sem tz_aware (ex.: mongomock) as datas voltam ingênuas, mas são gravadas em UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
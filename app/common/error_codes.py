@@ -21,8 +21,13 @@ class ErrorCodes(Enum):
     FORBIDDEN = ErrorInfo("FORBIDDEN", "Forbidden", HTTPStatus.FORBIDDEN)
     NOT_FOUND = ErrorInfo("NOT_FOUND", "Not found", HTTPStatus.NOT_FOUND)
     CONFLICT = ErrorInfo("CONFLICT", "Conflict", HTTPStatus.CONFLICT)
+    GONE = ErrorInfo("GONE", "Gone", HTTPStatus.GONE)
+    PRECONDITION_FAILED = ErrorInfo("PRECONDITION_FAILED", "Precondition Failed", HTTPStatus.PRECONDITION_FAILED)
     UNPROCESSABLE_ENTITY = ErrorInfo("UNPROCESSABLE_ENTITY", "Unprocessable Entity", HTTPStatus.UNPROCESSABLE_ENTITY)
+    TOO_MANY_REQUESTS = ErrorInfo("TOO_MANY_REQUESTS", "Too Many Requests", HTTPStatus.TOO_MANY_REQUESTS)
     SERVER_ERROR = ErrorInfo("INTERNAL_SERVER_ERROR", "Internal Server Error", HTTPStatus.INTERNAL_SERVER_ERROR)
+    SERVICE_UNAVAILABLE = ErrorInfo("SERVICE_UNAVAILABLE", "Service Unavailable", HTTPStatus.SERVICE_UNAVAILABLE)
+    GATEWAY_TIMEOUT = ErrorInfo("GATEWAY_TIMEOUT", "Gateway Timeout", HTTPStatus.GATEWAY_TIMEOUT)
 
     # ============================================================
     # Erros Aplicação
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from asgi_correlation_id import correlation_id
+
+from app.common.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+# Quadros da pilha registrados quando o loop trava
+STACK_LIMIT = 30
+
+
+class EventLoopMonitor:
+    """
+    Mede continuamente o atraso do event loop e registra quem o está bloqueando.
+
+    Uma corrotina dorme `interval_ms` e mede quanto acordou atrasada (métrica `event_loop_lag_seconds`). Uma thread
+    vigia o último batimento dessa corrotina: se o loop passar de `blocked_threshold_ms` sem voltar, registra a pilha
+    da thread do loop, a tarefa em execução e o request id dela, uma vez por travamento.
+    """
+
+    def __init__(self, interval_ms: float, blocked_threshold_ms: float, debug: bool = False):
+        """
+        :param interval_ms: Intervalo entre as medições; 0 desliga o monitor.
+        :param blocked_threshold_ms: Tempo sem o loop voltar a partir do qual a pilha é registrada.
+        :param debug: Liga o modo debug do asyncio, que avisa das callbacks mais lentas que o limite (caro).
+        """
+        self.interval = interval_ms / 1000
+        self.blocked_threshold = blocked_threshold_ms / 1000
+        self.debug = debug
+        self._heartbeat = 0.0
+        self._max_lag = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._stopping = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def take_max_lag_ms(self) -> float:
+        """
+        Maior atraso desde a leitura anterior, em ms.
+        """
+        max_lag, self._max_lag = self._max_lag, 0.0
+        return round(max_lag * 1000, 2)
+
+    async def run(self) -> None:
+        """
+        Laço de medição; roda enquanto a aplicação estiver no ar.
+        """
+        if not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        if self.debug:
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.blocked_threshold
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        watchdog.start()
+        try:
+            while True:
+                expected = self._heartbeat + self.interval
+                await asyncio.sleep(self.interval)
+                self._heartbeat = time.monotonic()
+                lag = max(0.0, self._heartbeat - expected)
+                self._max_lag = max(self._max_lag, lag)
+                EVENT_LOOP_LAG.observe(lag)
+        finally:
+            self._stopping.set()
+            self._loop = None
+
+    def _watch(self) -> None:
+        reported = 0.0
+        while not self._stopping.wait(self.interval):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            # Um registro por travamento: o batimento só muda quando o loop volta
+            if stalled >= self.blocked_threshold and heartbeat != reported:
+                reported = heartbeat
+                self._report_blocked(stalled)
+
+    def _report_blocked(self, stalled: float) -> None:
+        thread_id = self._loop_thread_id
+        frame = sys._current_frames().get(thread_id) if thread_id is not None else None
+        stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT)) if frame is not None else None
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        request_id = task.get_context().get(correlation_id) if task is not None else None
+        EVENT_LOOP_BLOCKED.inc()
+        logger.warning(
+            f"Event loop bloqueado há {round(stalled * 1000)}ms",
+            extra={
+                "request_id": request_id,
+                "task": task.get_name() if task is not None else None,
+                "coroutine": getattr(task.get_coro(), "__qualname__", None) if task is not None else None,
+                "stack": stack,
+            },
+        )
@@ -1,8 +1,11 @@
 from .application_exception import ApplicationException
 from .bad_request_exception import BadRequestException
 from .conflict_exception import ConflictException
+from .deadline_exceeded_exception import DeadlineExceededException
 from .forbidden_exception import ForbiddenException
+from .gone_exception import GoneException
 from .not_found_exception import NotFoundException
+from .precondition_failed_exception import PreconditionFailedException
 from .unauthorized_exception import UnauthorizedException
 
 __all__ = [
@@ -12,4 +15,7 @@ __all__ = [
     "UnauthorizedException",
     "NotFoundException",
     "ConflictException",
+    "GoneException",
+    "PreconditionFailedException",
+    "DeadlineExceededException",
 ]
@@ -0,0 +1,240 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.common.error_codes import ErrorCodes, ErrorInfo
+from app.common.metrics import LOAD_SHEDDING_IN_FLIGHT, LOAD_SHEDDING_LIMIT, LOAD_SHEDDING_REJECTED
+
+OVERLOAD = "overload"
+SELLER_QUOTA = "seller_quota"
+
+# Uso do limite a partir do qual cada seller fica restrito à sua parte da vazão; a folga até o limite é de quem
+# ainda tem fichas
+FAIR_SHARE_UTILIZATION = 0.8
+
+
+class GradientLimiter:
+    """
+    Limite de requisições simultâneas ajustado pela latência observada (algoritmo gradient, como o Gradient2 do
+    concurrency-limits da Netflix).
+
+    A cada janela, compara a latência média da janela com a de referência (média móvel das janelas): enquanto a
+    recente não passa da referência com a tolerância, o limite cresce na raiz do limite; quando passa, encolhe
+    na proporção do aumento. Acima do limite a requisição é recusada na hora, em vez de esperar na fila do pool do
+    MongoDB até estourar o prazo.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        window_seconds: float = 0.25,
+        min_window_samples: int = 10,
+        long_window: int = 600,
+    ):
+        """
+        :param initial_limit: Limite ao subir a aplicação.
+        :param min_limit: Piso do limite, para nunca recusar tudo.
+        :param max_limit: Teto do limite.
+        :param tolerance: Quanto a latência recente pode passar da de referência antes de o limite encolher.
+        :param smoothing: Peso de cada ajuste no limite (0 a 1).
+        :param window_seconds: Duração mínima de cada janela de amostras.
+        :param min_window_samples: Amostras mínimas para fechar uma janela.
+        :param long_window: Janelas na média móvel da latência de referência.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.window_seconds = window_seconds
+        self.min_window_samples = min_window_samples
+        self._long_alpha = 2 / (long_window + 1)
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.short_rtt = 0.0
+        self.long_rtt = 0.0
+        self._window_started = time.monotonic()
+        self._window_rtt = 0.0
+        self._window_samples = 0
+        self._window_max_in_flight = 0
+        LOAD_SHEDDING_LIMIT.set(int(self.limit))
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        LOAD_SHEDDING_IN_FLIGHT.set(self.in_flight)
+        return True
+
+    def release(self, rtt: float) -> None:
+        """
+        :param rtt: Duração da requisição, em segundos.
+        """
+        self._window_max_in_flight = max(self._window_max_in_flight, self.in_flight)
+        self.in_flight -= 1
+        LOAD_SHEDDING_IN_FLIGHT.set(self.in_flight)
+        self._window_rtt += rtt
+        self._window_samples += 1
+        now = time.monotonic()
+        if self._window_samples >= self.min_window_samples and now - self._window_started >= self.window_seconds:
+            self._update(self._window_rtt / self._window_samples, self._window_max_in_flight)
+            self._window_started = now
+            self._window_rtt = 0.0
+            self._window_samples = self._window_max_in_flight = 0
+
+    def _update(self, rtt: float, max_in_flight: int) -> None:
+        self.short_rtt = rtt
+        if self.long_rtt == 0.0:
+            self.long_rtt = rtt
+            return
+        self.long_rtt += self._long_alpha * (rtt - self.long_rtt)
+        # Depois de uma degradação longa a referência fica alta demais; volta aos poucos quando a latência melhora
+        if self.long_rtt > 2 * rtt:
+            self.long_rtt *= 0.95
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / rtt))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        # Com menos da metade do limite em uso a latência não diz nada sobre o limite: só encolhe, nunca cresce
+        if new_limit > self.limit and max_in_flight < self.limit / 2:
+            return
+        new_limit = self.limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self.limit = min(max(new_limit, self.min_limit), self.max_limit)
+        LOAD_SHEDDING_LIMIT.set(int(self.limit))
+
+    @property
+    def utilization(self) -> float:
+        return self.in_flight / self.limit
+
+    @property
+    def capacity_rps(self) -> float:
+        """
+        Vazão que o limite atual sustenta com a latência de referência (lei de Little); só depois da primeira
+        amostra de latência.
+        """
+        return self.limit / self.long_rtt
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class FairShareBuckets:
+    """
+    Token bucket por seller, com a taxa de reposição dividida igualmente entre os sellers ativos.
+
+    A taxa de cada seller é a vazão atual do limitador dividida pelos sellers com requisições na janela; um
+    seller sozinho pode usar a capacidade inteira. Os buckets sem uso na janela saem da memória: voltariam cheios.
+    """
+
+    def __init__(self, burst_seconds: float, window_seconds: float, max_sellers: int):
+        """
+        :param burst_seconds: Capacidade do bucket, em segundos da taxa do seller.
+        :param window_seconds: Sem requisições por esse tempo, o seller deixa de contar como ativo.
+        :param max_sellers: Máximo de buckets em memória; os menos recentes saem primeiro.
+        """
+        self.burst_seconds = burst_seconds
+        self.window_seconds = window_seconds
+        self.max_sellers = max_sellers
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, seller_id: str, capacity_rps: float, now: float) -> float:
+        """
+        Consome uma ficha do seller.
+
+        :param capacity_rps: Vazão total a dividir entre os sellers ativos.
+        :return: 0 se havia ficha; senão, segundos até a próxima.
+        """
+        self._expire(now)
+        bucket = self._buckets.get(seller_id)
+        rate = capacity_rps / (len(self._buckets) + (bucket is None))
+        burst = max(1.0, rate * self.burst_seconds)
+        if bucket is None:
+            bucket = self._buckets[seller_id] = _Bucket(burst, now)
+            if len(self._buckets) > self.max_sellers:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(seller_id)
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated_at) * rate)
+            bucket.updated_at = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0.0
+        return (1 - bucket.tokens) / rate if rate else self.window_seconds
+
+    def _expire(self, now: float) -> None:
+        while self._buckets:
+            bucket = next(iter(self._buckets.values()))
+            if now - bucket.updated_at < self.window_seconds:
+                return
+            self._buckets.popitem(last=False)
+
+
+@dataclass(frozen=True)
+class Rejection:
+    error: ErrorInfo
+    reason: str
+    retry_after: int
+
+
+class LoadShedder:
+    """
+    Controle de admissão das rotas de fretes: limite adaptativo de concorrência e fair share por seller.
+
+    Com folga no limite todas as requisições entram, e cada uma só consome a ficha do seller. Perto do limite,
+    quem estiver sem ficha (acima da sua parte da vazão) recebe `429`, e a folga restante fica para os sellers
+    dentro da sua parte; sem vaga nenhuma, `503`. Assim um seller com pico é contido antes de derrubar a latência
+    dos outros.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float,
+        seller_burst_seconds: float,
+        seller_window_seconds: float,
+        max_sellers: int,
+        retry_after_seconds: int,
+        enabled: bool = True,
+    ):
+        """
+        :param retry_after_seconds: Valor do Retry-After das recusas por sobrecarga.
+        :param enabled: Desligado, todas as requisições entram.
+        """
+        self.enabled = enabled
+        self.retry_after_seconds = retry_after_seconds
+        self.limiter = GradientLimiter(initial_limit, min_limit, max_limit, tolerance=tolerance)
+        self.buckets = FairShareBuckets(seller_burst_seconds, seller_window_seconds, max_sellers)
+
+    def acquire(self, seller_id: str | None) -> Rejection | None:
+        """
+        Admite a requisição (`None`) ou devolve a recusa. Toda requisição admitida precisa de um `release`.
+        """
+        # Sem nenhuma latência medida ainda não há vazão para dividir entre os sellers
+        if seller_id and self.limiter.long_rtt:
+            wait = self.buckets.take(seller_id, self.limiter.capacity_rps, time.monotonic())
+            if wait and self.limiter.utilization >= FAIR_SHARE_UTILIZATION:
+                LOAD_SHEDDING_REJECTED.labels(SELLER_QUOTA).inc()
+                return Rejection(ErrorCodes.TOO_MANY_REQUESTS.value, SELLER_QUOTA, max(1, math.ceil(wait)))
+        if not self.limiter.try_acquire():
+            LOAD_SHEDDING_REJECTED.labels(OVERLOAD).inc()
+            return Rejection(ErrorCodes.SERVICE_UNAVAILABLE.value, OVERLOAD, self.retry_after_seconds)
+        return None
+
+    def release(self, duration: float) -> None:
+        """
+        :param duration: Duração da requisição admitida, em segundos.
+        """
+        self.limiter.release(duration)
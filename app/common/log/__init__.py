@@ -0,0 +1,16 @@
+from .access_log import ACCESS_LOGGER, OBFUSCATED, AccessLogEntry, AccessLogWriter
+from .json_formatter import JsonFormatter
+from .sampling import ErrorLogSampler
+from .setup import configure_logging, stop_logging, write_log_lines
+
+__all__ = [
+    "ACCESS_LOGGER",
+    "AccessLogEntry",
+    "AccessLogWriter",
+    "ErrorLogSampler",
+    "JsonFormatter",
+    "OBFUSCATED",
+    "configure_logging",
+    "stop_logging",
+    "write_log_lines",
+]
@@ -0,0 +1,137 @@
+import atexit
+import contextlib
+import json
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from app.common.metrics import ACCESS_LOG_DROPPED
+
+from .setup import write_log_lines
+
+ACCESS_LOGGER = "app.access"
+OBFUSCATED = "***"
+
+
+class AccessLogEntry(NamedTuple):
+    """
+    Dados crus de uma requisição, capturados no event loop; a formatação fica para a thread de escrita.
+    """
+
+    timestamp: float
+    method: str
+    path: str
+    query: bytes
+    route: str
+    status: int
+    bytes: int
+    duration_ms: float
+    request_id: str | None
+    headers: list[tuple[bytes, bytes]]
+
+
+class AccessLogWriter:
+    """
+    Escreve o log de acesso em lotes numa thread própria, no mesmo destino dos demais logs.
+
+    O event loop só enfileira a entrada. A thread acorda a cada `flush_seconds`, esvazia a fila, formata as linhas
+    e faz uma única escrita por lote; acordar a cada entrada custaria uma troca de GIL por requisição.
+    """
+
+    def __init__(
+        self, json_format: bool = True, headers_to_obfuscate: set[str] | None = None, flush_seconds: float = 0.2
+    ):
+        """
+        :param json_format: Uma linha JSON por requisição; senão, texto.
+        :param headers_to_obfuscate: Cabeçalhos registrados como `***`.
+        :param flush_seconds: Intervalo entre as escritas.
+        """
+        self.json_format = json_format
+        self.headers_to_obfuscate = {name.lower() for name in headers_to_obfuscate or ()}
+        self.flush_seconds = flush_seconds
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def write(self, entry: AccessLogEntry) -> None:
+        if self._thread is None:
+            self._start()
+        self._queue.put(entry)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="access-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """
+        Escreve o que estiver na fila e encerra a thread.
+        """
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.flush_seconds):
+            self.flush()
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Formata e escreve, de uma vez, tudo o que está na fila.
+        """
+        lines = []
+        while True:
+            try:
+                lines.append(self.format(self._queue.get_nowait()))
+            except queue.Empty:
+                break
+        if not lines:
+            return
+        try:
+            write_log_lines("".join(lines))
+        except (OSError, ValueError) as exc:
+            # Destino fechado ou com erro: o lote se perde, mas fica contado e avisado, e a thread segue viva
+            ACCESS_LOG_DROPPED.inc(len(lines))
+            with contextlib.suppress(OSError, ValueError):
+                sys.stderr.write(f"Log de acesso: {len(lines)} linhas descartadas, falha na escrita: {exc!r}\n")
+
+    def _headers(self, headers: list[tuple[bytes, bytes]]) -> dict[str, str]:
+        result = {}
+        for raw_name, raw_value in headers:
+            name = raw_name.decode("latin-1")
+            result[name] = OBFUSCATED if name in self.headers_to_obfuscate else raw_value.decode("latin-1")
+        return result
+
+    def format(self, entry: AccessLogEntry) -> str:
+        timestamp = datetime.fromtimestamp(entry.timestamp, timezone.utc).isoformat(timespec="milliseconds")
+        path = entry.path + "?" + entry.query.decode("latin-1") if entry.query else entry.path
+        if not self.json_format:
+            return (
+                f"{timestamp} INFO {ACCESS_LOGGER} [{entry.request_id}] {entry.method} {path} {entry.status} "
+                f"{entry.bytes}B {entry.duration_ms}ms\n"
+            )
+        document = {
+            "timestamp": timestamp,
+            "level": "INFO",
+            "logger": ACCESS_LOGGER,
+            "message": f"{entry.method} {path} {entry.status}",
+            "method": entry.method,
+            "path": path,
+            "route": entry.route,
+            "status_code": entry.status,
+            "bytes": entry.bytes,
+            "duration_ms": entry.duration_ms,
+            "request_id": entry.request_id,
+        }
+        if entry.headers:
+            document["headers"] = self._headers(entry.headers)
+        return json.dumps(document, ensure_ascii=False) + "\n"
@@ -0,0 +1,40 @@
+import time
+
+
+class ErrorLogSampler:
+    """
+    Amostragem de logs repetidos por chave (ex.: slug do erro de negócio).
+
+    Em cada janela registra as `first` primeiras ocorrências da chave e, depois, uma a cada `every`. O registro
+    que passa informa quantas foram suprimidas desde o anterior, para o volume real continuar visível.
+    """
+
+    def __init__(self, first: int, every: int, window_seconds: float):
+        """
+        :param first: Ocorrências registradas por janela antes de amostrar; 0 desliga a amostragem.
+        :param every: Depois delas, registra uma a cada `every`.
+        :param window_seconds: Duração da janela de contagem.
+        """
+        self.first = first
+        self.every = every
+        self.window_seconds = window_seconds
+        self._windows: dict[str, list] = {}  # chave -> [início da janela, ocorrências, suprimidas]
+
+    def should_log(self, key: str) -> tuple[bool, int]:
+        """
+        :return: Se a ocorrência deve ser registrada e quantas foram suprimidas desde o último registro da chave.
+        """
+        if not self.first:
+            return True, 0
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.window_seconds:
+            suppressed = window[2] if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            return True, suppressed
+        window[1] += 1
+        if window[1] <= self.first or (window[1] - self.first) % self.every == 0:
+            suppressed, window[2] = window[2], 0
+            return True, suppressed
+        window[2] += 1
+        return False, 0
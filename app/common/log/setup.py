@@ -0,0 +1,90 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO
+
+from asgi_correlation_id import correlation_id
+
+from .json_formatter import JsonFormatter
+
+PLAIN_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+_output: logging.StreamHandler | None = None
+
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    Só enfileira: formatação e escrita ficam na thread do listener, fora do event loop.
+
+    O request_id é capturado aqui porque o contexto da requisição não existe na thread do listener, e a mensagem
+    e o traceback são resolvidos para texto sem achatar o registro (o `prepare` padrão junta tudo na mensagem).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = correlation_id.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level: str = "INFO", json_format: bool = True, stream: IO[str] | None = None) -> None:
+    """
+    Liga a raiz dos logs a uma fila atendida por uma thread própria.
+
+    Chamadas seguintes só ajustam o nível, a menos que `stream` seja informado, caso em que o destino é trocado
+    (ex.: o benchmark manda os logs para um arquivo).
+    """
+    global _listener, _queue_handler, _output
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    if _listener is not None and stream is None:
+        return
+    stop_logging()
+
+    _output = logging.StreamHandler(stream or sys.stdout)
+    _output.setFormatter(JsonFormatter() if json_format else logging.Formatter(PLAIN_FORMAT))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _ContextQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, _output, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_queue_handler)
+
+
+def stop_logging() -> None:
+    """
+    Esvazia a fila e encerra a thread de escrita.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def write_log_lines(text: str) -> None:
+    """
+    Escreve linhas já formatadas no mesmo destino dos logs, sem intercalar com os registros da fila.
+    """
+    if _output is None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+    _output.acquire()
+    try:
+        _output.stream.write(text)
+        _output.flush()
+    finally:
+        _output.release()
+
+
+atexit.register(stop_logging)
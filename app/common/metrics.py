@@ -0,0 +1,180 @@
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, disable_created_metrics
+
+# As séries `_created` dobram o volume exportado sem uso nos painéis
+disable_created_metrics()
+
+# Registro próprio da aplicação: evita expor as métricas de processo padrão duas vezes
+# e permite recriar a aplicação (testes, benchmark) sem colisão de nomes.
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# HTTP
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota (caminho com template)",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+HTTP_REQUESTS = Counter(
+    "http_requests",
+    "Requisições HTTP atendidas por rota e status",
+    ["method", "route", "status"],
+    registry=REGISTRY,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    ["method"],
+    registry=REGISTRY,
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Tamanho do corpo das respostas HTTP por rota",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+    registry=REGISTRY,
+)
+HTTP_COMPRESSION_BYTES = Counter(
+    "http_compression_bytes",
+    "Bytes das respostas comprimidas antes (raw) e depois (compressed) da compressão, por algoritmo",
+    ["encoding", "stage"],
+    registry=REGISTRY,
+)
+ACCESS_LOG_DROPPED = Counter(
+    "access_log_dropped_lines",
+    "Linhas do log de acesso descartadas porque a escrita no destino dos logs falhou",
+    registry=REGISTRY,
+)
+
+# Banco de dados
+DB_OPERATIONS = Counter(
+    "db_operations",
+    "Operações enviadas ao banco pelos repositórios",
+    ["collection", "operation"],
+    registry=REGISTRY,
+)
+DB_WRITE_BATCH_SIZE = Histogram(
+    "db_write_batch_size",
+    "Atualizações enviadas em cada lote (bulk_write) do agrupamento de escritas, antes da fusão por chave",
+    ["collection"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+    registry=REGISTRY,
+)
+
+# Cache
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "Consultas aos caches da aplicação por resultado (hit/miss)",
+    ["cache", "result"],
+    registry=REGISTRY,
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entradas armazenadas em cada cache",
+    ["cache"],
+    registry=REGISTRY,
+)
+CACHE_BYTES = Gauge(
+    "cache_size_bytes",
+    "Bytes ocupados pelos valores de cada cache",
+    ["cache"],
+    registry=REGISTRY,
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions",
+    "Entradas removidas pelo limite de entradas ou de bytes",
+    ["cache"],
+    registry=REGISTRY,
+)
+HOT_KEYS_TRACKED = Gauge(
+    "hot_keys_tracked",
+    "Chaves acompanhadas no top-K de cada rastreador de chaves quentes",
+    ["tracker"],
+    registry=REGISTRY,
+)
+HOT_KEYS_TOP_SHARE = Gauge(
+    "hot_keys_top_share",
+    "Fração dos acessos recentes concentrada nas chaves do top-K",
+    ["tracker"],
+    registry=REGISTRY,
+)
+
+# MongoDB (eventos do driver)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds",
+    "Latência dos comandos no MongoDB por coleção, comando e formato da consulta",
+    ["collection", "command", "shape"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongo_command_failures",
+    "Comandos no MongoDB que terminaram em erro",
+    ["collection", "command"],
+    registry=REGISTRY,
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongo_pool_checkout_wait_seconds",
+    "Espera para obter uma conexão do pool do MongoDB",
+    ["address"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures",
+    "Falhas ao obter conexão do pool do MongoDB por motivo",
+    ["address", "reason"],
+    registry=REGISTRY,
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections",
+    "Conexões abertas no pool do MongoDB",
+    ["address"],
+    registry=REGISTRY,
+)
+MONGO_POOL_CONNECTIONS_IN_USE = Gauge(
+    "mongo_pool_connections_in_use",
+    "Conexões do pool do MongoDB emprestadas a operações",
+    ["address"],
+    registry=REGISTRY,
+)
+
+# Event loop
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Atraso do event loop para acordar um timer, medido continuamente",
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked",
+    "Vezes em que o event loop ficou bloqueado além do limite e teve a pilha registrada",
+    registry=REGISTRY,
+)
+
+# Controle de admissão
+LOAD_SHEDDING_LIMIT = Gauge(
+    "load_shedding_limit",
+    "Limite adaptativo atual de requisições simultâneas nas rotas de fretes",
+    registry=REGISTRY,
+)
+LOAD_SHEDDING_IN_FLIGHT = Gauge(
+    "load_shedding_in_flight",
+    "Requisições admitidas em andamento nas rotas de fretes",
+    registry=REGISTRY,
+)
+LOAD_SHEDDING_REJECTED = Counter(
+    "load_shedding_rejected",
+    "Requisições recusadas pelo controle de admissão: overload (503) ou seller_quota (429)",
+    ["reason"],
+    registry=REGISTRY,
+)
+REQUESTS_ABANDONED = Counter(
+    "http_requests_abandoned",
+    "Requisições interrompidas antes do fim: deadline (prazo estourado, 504) ou disconnect (cliente desconectou)",
+    ["reason"],
+    registry=REGISTRY,
+)
@@ -0,0 +1,12 @@
+from .memory import AllocationTracker
+from .profiler import Profile, Profiler, ProfileSessionRunningException, RequestProfiling
+from .sampler import StackSampler
+
+__all__ = [
+    "AllocationTracker",
+    "Profile",
+    "ProfileSessionRunningException",
+    "Profiler",
+    "RequestProfiling",
+    "StackSampler",
+]
@@ -0,0 +1,66 @@
+import os
+import threading
+import tracemalloc
+from typing import Any
+
+# Quadros guardados por alocação enquanto o tracemalloc estiver ligado
+TRACEMALLOC_FRAMES = 25
+
+_EXCLUDED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    # Alocações do próprio profiler
+    tracemalloc.Filter(False, os.path.join(os.path.dirname(__file__), "*")),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+class AllocationTracker:
+    """
+    Diferença de memória alocada, por linha, entre o início e o fim de um trecho.
+
+    O tracemalloc é global e caro: fica ligado só enquanto houver algum trecho sendo medido. As alocações de
+    requisições concorrentes entram na mesma diferença.
+    """
+
+    _lock = threading.Lock()
+    _active = 0
+
+    def __init__(self, top: int = 30):
+        """
+        :param top: Linhas com maior crescimento mantidas no resultado.
+        """
+        self.top = top
+        self._before: tracemalloc.Snapshot | None = None
+        self.allocations: list[dict[str, Any]] = []
+
+    def start(self) -> "AllocationTracker":
+        with AllocationTracker._lock:
+            if AllocationTracker._active == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            AllocationTracker._active += 1
+        self._before = tracemalloc.take_snapshot().filter_traces(_EXCLUDED)
+        return self
+
+    def stop(self) -> "AllocationTracker":
+        if self._before is None:
+            raise RuntimeError("AllocationTracker.stop chamado antes do start")
+        after = tracemalloc.take_snapshot().filter_traces(_EXCLUDED)
+        with AllocationTracker._lock:
+            AllocationTracker._active -= 1
+            if AllocationTracker._active == 0:
+                tracemalloc.stop()
+        statistics = after.compare_to(self._before, "lineno")
+        self.allocations = [
+            {
+                "file": stat.traceback[0].filename,
+                "line": stat.traceback[0].lineno,
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+            }
+            for stat in statistics[: self.top]
+            if stat.size_diff
+        ]
+        return self
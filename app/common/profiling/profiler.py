@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from app.common.exceptions import ConflictException
+
+from .memory import AllocationTracker
+from .sampler import StackSampler
+
+REQUEST = "request"
+SESSION = "session"
+
+
+@dataclass
+class Profile:
+    id: str
+    kind: str
+    duration_ms: float
+    samples: int
+    cpu: dict[str, Any] | None = None
+    memory: list[dict[str, Any]] | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ProfileSessionRunningException(ConflictException):
+    """
+    Já existe uma sessão de profiling em andamento nesta instância.
+    """
+
+
+class Profiler:
+    """
+    Perfis sob demanda: de uma requisição (CPU e/ou alocações) ou do processo inteiro por tempo limitado.
+
+    Os perfis ficam em memória, os `max_profiles` mais recentes, identificados pelo request id (ou pelo id da
+    sessão), até serem baixados pelos recursos administrativos.
+    """
+
+    def __init__(self, interval_ms: float, max_profiles: int):
+        """
+        :param interval_ms: Intervalo de amostragem do perfil de CPU das requisições.
+        :param max_profiles: Quantos perfis manter.
+        """
+        self.interval_ms = interval_ms
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+        self._lock = threading.Lock()
+        self._session: StackSampler | None = None
+        self._session_id: str | None = None
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            self._profiles.move_to_end(profile.id)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Profile | None:
+        return self._profiles.get(profile_id)
+
+    def profiles(self) -> list[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def profile_request(self, profile_id: str, cpu: bool = True, memory: bool = False) -> "RequestProfiling":
+        """
+        Perfil da tarefa atual, do `start` ao `stop` da medição devolvida.
+        """
+        return RequestProfiling(self, profile_id, cpu=cpu, memory=memory)
+
+    @property
+    def session_running(self) -> bool:
+        return self._session is not None and self._session.running
+
+    def start_session(self, duration_seconds: float, interval_ms: float) -> str:
+        """
+        Amostra todas as threads do processo por até `duration_seconds`; o perfil é guardado ao terminar.
+
+        :return: Id do perfil que a sessão vai gerar.
+        """
+        with self._lock:
+            if self.session_running:
+                raise ProfileSessionRunningException()
+            self._session_id = f"session-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}"
+            self._session = StackSampler(
+                interval_ms, duration_seconds=duration_seconds, on_finish=self._finish_session
+            ).start()
+            return self._session_id
+
+    def stop_session(self) -> str | None:
+        """
+        Encerra antes do prazo a sessão em andamento, se houver.
+
+        :return: Id do perfil gerado.
+        """
+        session, session_id = self._session, self._session_id
+        if session is None or not session.running:
+            return None
+        session.stop()
+        return session_id
+
+    def _finish_session(self, sampler: StackSampler) -> None:
+        session_id = self._session_id or "session"
+        self.add(
+            Profile(
+                id=session_id,
+                kind=SESSION,
+                duration_ms=round(sampler.elapsed * 1000, 2),
+                samples=sampler.sample_count,
+                cpu=sampler.to_speedscope(session_id),
+            )
+        )
+
+
+class RequestProfiling:
+    """
+    Medição de uma requisição em andamento; criada por `Profiler.profile_request`.
+    """
+
+    def __init__(self, profiler: Profiler, profile_id: str, cpu: bool, memory: bool):
+        self.profiler = profiler
+        self.profile_id = profile_id
+        self._sampler: StackSampler | None = None
+        self._allocations = AllocationTracker() if memory else None
+        self._cpu = cpu
+        self._started = 0.0
+
+    def start(self) -> "RequestProfiling":
+        self._started = time.perf_counter()
+        if self._allocations is not None:
+            self._allocations.start()
+        if self._cpu:
+            self._sampler = StackSampler(
+                self.profiler.interval_ms, thread_id=threading.get_ident(), task=asyncio.current_task()
+            ).start()
+        return self
+
+    def stop(self) -> Profile:
+        duration_ms = round((time.perf_counter() - self._started) * 1000, 2)
+        cpu, samples = None, 0
+        if self._sampler is not None:
+            self._sampler.stop()
+            cpu = self._sampler.to_speedscope(self.profile_id)
+            samples = self._sampler.sample_count
+        memory = self._allocations.stop().allocations if self._allocations is not None else None
+        profile = Profile(
+            id=self.profile_id, kind=REQUEST, duration_ms=duration_ms, samples=samples, cpu=cpu, memory=memory
+        )
+        self.profiler.add(profile)
+        return profile
@@ -0,0 +1,151 @@
+import asyncio
+import sys
+import threading
+import time
+from collections import defaultdict
+from types import FrameType
+from typing import Any, Callable
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# (arquivo, função, linha da definição): agrupa as amostras por função, não por linha
+FrameKey = tuple[str, str, int]
+
+
+def _stack(frame: FrameType | None) -> tuple[FrameKey, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_qualname, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class StackSampler:
+    """
+    Profiler de CPU por amostragem, só com a biblioteca padrão.
+
+    Uma thread lê as pilhas de `sys._current_frames()` a cada `interval_ms`. Com `task`, só conta as amostras em que
+    essa tarefa está executando no loop: o perfil de uma requisição não mistura as outras que dividem o loop, e o
+    tempo em que ela espera por I/O não aparece como CPU.
+
+    Enquanto houver amostragem, o intervalo de troca do GIL cai para `interval_ms`; com o padrão de 5ms, a thread
+    do sampler só conseguiria a vez uma vez a cada 5ms com o loop ocupado.
+    """
+
+    _lock = threading.Lock()
+    _active = 0
+    _switch_interval = 0.0
+
+    def __init__(
+        self,
+        interval_ms: float,
+        thread_id: int | None = None,
+        task: asyncio.Task | None = None,
+        duration_seconds: float | None = None,
+        on_finish: Callable[["StackSampler"], None] | None = None,
+    ):
+        """
+        :param interval_ms: Intervalo entre amostras.
+        :param thread_id: Só amostra esta thread; `None` amostra todas.
+        :param task: Só conta as amostras com esta tarefa em execução (exige `thread_id` da thread do loop).
+        :param duration_seconds: Encerra sozinho depois desse tempo.
+        :param on_finish: Chamado ao encerrar, na thread do sampler ou de quem chamou `stop`.
+        """
+        self.interval = interval_ms / 1000
+        self.thread_id = thread_id
+        self.task = task
+        self.duration_seconds = duration_seconds
+        self.on_finish = on_finish
+        # Pilha -> ms atribuídos; cada amostra vale o tempo real desde a anterior, não o intervalo nominal
+        self.samples: defaultdict[tuple[FrameKey, ...], float] = defaultdict(float)
+        self.sample_count = 0
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self._loop = task.get_loop() if task is not None else None
+        self._stopping = threading.Event()
+        self._finished = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._finished.is_set()
+
+    def start(self) -> "StackSampler":
+        with StackSampler._lock:
+            if StackSampler._active == 0:
+                StackSampler._switch_interval = sys.getswitchinterval()
+            StackSampler._active += 1
+            sys.setswitchinterval(min(sys.getswitchinterval(), self.interval))
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stopping.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        return self
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        deadline = self.started_at + self.duration_seconds if self.duration_seconds else None
+        last = self.started_at
+        while not self._stopping.wait(self.interval):
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                break
+            self._sample(own_id, (now - last) * 1000)
+            last = now
+        self.elapsed = time.perf_counter() - self.started_at
+        with StackSampler._lock:
+            StackSampler._active -= 1
+            if StackSampler._active == 0:
+                sys.setswitchinterval(StackSampler._switch_interval)
+        self._finished.set()
+        if self.on_finish is not None:
+            self.on_finish(self)
+
+    def _sample(self, own_id: int, weight_ms: float) -> None:
+        if self.task is not None and asyncio.current_task(self._loop) is not self.task:
+            return
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or (self.thread_id is not None and thread_id != self.thread_id):
+                continue
+            stack = _stack(frame)
+            if self._stopping.is_set():
+                # A pilha já pode ser a do próprio `stop`
+                return
+            if self.thread_id is None:
+                # Sessões do processo inteiro: uma raiz por thread
+                stack = ((f"thread {thread_id}", "<thread>", 0),) + stack
+            self.samples[stack] += weight_ms
+            self.sample_count += 1
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        """
+        Perfil no formato de arquivo do speedscope (https://www.speedscope.app), tipo "sampled", em ms.
+        """
+        frames: dict[FrameKey, int] = {}
+        samples, weights = [], []
+        for stack, weight_ms in sorted(self.samples.items(), key=lambda item: item[1], reverse=True):
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(round(weight_ms, 3))
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "shared": {"frames": [{"name": function, "file": file, "line": line} for file, function, line in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
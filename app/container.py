@@ -1,9 +1,17 @@
 # container.py
+from app.common.compression import CompressionPolicy
+from app.common.event_loop_monitor import EventLoopMonitor
+from app.common.load_shedding import LoadShedder
+from app.common.profiling import Profiler
+from app.integrations.cache import GenerationalCache, HotKeyStore, HotKeyTracker, LruCache
 from app.integrations.database.mongo_client import MongoClient
+from app.integrations.database.partitioning import DEFAULT_PARTITION, build_partition_router
 from dependency_injector import containers, providers
 
+from app.models.frete_model import INITIAL_VERSION
 from app.repositories import FreteRepository
-from app.services import FreteService, HealthCheckService
+from app.repositories.base import WriteBatcher
+from app.services import FreteService, HealthCheckService, Readiness
 from app.settings.app import AppSettings
 from app.settings.app import settings as settings_instance
 
@@ -15,16 +23,120 @@ class Container(containers.DeclarativeContainer):
     mongo_client = providers.Singleton(
         MongoClient,
         mongo_url=config.app_db_url_mongo,
+        monitoring_enabled=config.mongo_monitoring_enabled,
+        slow_query_ms=config.mongo_slow_query_ms,
+        client_options=settings.provided.mongo_client_options,
+        driver=config.mongo_driver,
+    )
+
+    partition_router = providers.Singleton(
+        build_partition_router,
+        default_client=mongo_client,
+        db_name=config.MONGO_DB,
+        partition_urls=config.mongo_partitions,
+        overrides=config.mongo_partition_overrides,
+        vnodes=config.mongo_partition_vnodes,
+        monitoring_enabled=config.mongo_monitoring_enabled,
+        slow_query_ms=config.mongo_slow_query_ms,
+        client_options=settings.provided.mongo_client_options,
+        driver=config.mongo_driver,
+    )
+
+    frete_write_batcher = providers.Singleton(
+        WriteBatcher,
+        collection_name=FreteRepository.COLLECTION_NAME,
+        key_fields=("seller_id", "sku"),
+        window_ms=config.frete_write_batch_window_ms,
+        max_size=config.frete_write_batch_max_size,
+        initial_version=INITIAL_VERSION,
+        enabled=config.frete_write_batching_enabled,
     )
 
     frete_repository = providers.Singleton(
         FreteRepository,
-        client=mongo_client,
-        db_name=config.MONGO_DB,
+        router=partition_router,
+        max_staleness_seconds=config.mongo_max_staleness_seconds,
+        write_batcher=frete_write_batcher,
+    )
+
+    readiness = providers.Singleton(Readiness)
+
+    frete_list_cache = providers.Singleton(
+        GenerationalCache,
+        name="frete_list",
+        max_entries=config.frete_list_cache_max_entries,
+        max_bytes=config.frete_list_cache_max_bytes,
+        ttl_seconds=config.frete_list_cache_ttl_seconds,
+    )
+
+    frete_hot_keys = providers.Singleton(
+        HotKeyTracker,
+        name="frete_item",
+        capacity=config.frete_hot_keys_capacity,
+        window=config.frete_hot_keys_window,
+    )
+
+    hot_key_store = providers.Singleton(
+        HotKeyStore, database=partition_router.provided.database.call(DEFAULT_PARTITION)
+    )
+
+    frete_item_cache = providers.Singleton(
+        LruCache,
+        name="frete_item",
+        max_entries=config.frete_item_cache_max_entries,
+        max_bytes=config.frete_item_cache_max_bytes,
+        ttl_seconds=config.frete_item_cache_ttl_seconds,
+        hot_keys=frete_hot_keys,
+    )
+
+    event_loop_monitor = providers.Singleton(
+        EventLoopMonitor,
+        interval_ms=config.event_loop_monitor_interval_ms,
+        blocked_threshold_ms=config.event_loop_blocked_threshold_ms,
+        debug=config.event_loop_debug,
+    )
+
+    profiler = providers.Singleton(
+        Profiler, interval_ms=config.profiling_interval_ms, max_profiles=config.profiling_max_profiles
+    )
+
+    compression_policy = providers.Singleton(
+        CompressionPolicy,
+        codecs=config.compression_codecs,
+        min_size=config.compression_min_size,
+        large_size=config.compression_large_size,
+        routes=config.compression_routes,
+        enabled=config.compression_enabled,
+    )
+
+    load_shedder = providers.Singleton(
+        LoadShedder,
+        initial_limit=config.load_shedding_initial_limit,
+        min_limit=config.load_shedding_min_limit,
+        max_limit=config.load_shedding_max_limit,
+        tolerance=config.load_shedding_tolerance,
+        seller_burst_seconds=config.load_shedding_seller_burst_seconds,
+        seller_window_seconds=config.load_shedding_seller_window_seconds,
+        max_sellers=config.load_shedding_max_sellers,
+        retry_after_seconds=config.load_shedding_retry_after_seconds,
+        enabled=config.load_shedding_enabled,
     )
 
     health_check_service = providers.Singleton(
-        HealthCheckService, checkers=config.health_check_checkers, settings=settings
+        HealthCheckService,
+        checkers=config.health_check_checkers,
+        settings=settings,
+        partition_router=partition_router,
+        caches=providers.List(frete_item_cache, frete_list_cache),
+        event_loop_monitor=event_loop_monitor,
     )
 
-    frete_service = providers.Singleton(FreteService, repository=frete_repository)
+    frete_service = providers.Singleton(
+        FreteService,
+        repository=frete_repository,
+        read_consistency=config.frete_read_consistency,
+        list_cache=frete_list_cache,
+        item_cache=frete_item_cache,
+        changes_settle_ms=config.frete_changes_settle_ms,
+        changes_retention_days=config.frete_changes_retention_days,
+    )
@@ -0,0 +1,5 @@
+from .hot_key_store import HotKeyStore
+from .hot_keys import HotKey, HotKeyTracker
+from .memory_cache import CachedResponse, GenerationalCache, LruCache
+
+__all__ = ["CachedResponse", "GenerationalCache", "HotKey", "HotKeyStore", "HotKeyTracker", "LruCache"]
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from .hot_keys import HotKeyTracker, TrackedKey
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOTS_COLLECTION = "hot_key_snapshots"
+
+
+class HotKeyStore:
+    """
+    Guarda no MongoDB a lista mais recente de chaves quentes de cada rastreador.
+
+    Um documento por rastreador, sobrescrito por qualquer instância: vale o retrato mais recente, que é o que a
+    próxima instância a subir usa para pré-carregar o cache.
+    """
+
+    def __init__(self, database: Any, collection_name: str = SNAPSHOTS_COLLECTION):
+        """
+        :param database: Banco onde fica a coleção dos retratos.
+        :param collection_name: Nome da coleção.
+        """
+        self.collection = database[collection_name]
+
+    async def save(self, tracker: HotKeyTracker, limit: int) -> int:
+        """
+        Grava as `limit` chaves mais acessadas do rastreador; um rastreador vazio não apaga o retrato anterior.
+        """
+        keys = tracker.top(limit)
+        if not keys:
+            return 0
+        await self.collection.replace_one(
+            {"_id": tracker.name},
+            {
+                "_id": tracker.name,
+                "keys": [{"key": list(hot_key.key), "count": hot_key.count} for hot_key in keys],
+                "updated_at": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+        return len(keys)
+
+    async def load(self, name: str, limit: int) -> list[TrackedKey]:
+        """
+        Chaves do último retrato do rastreador, da mais para a menos acessada.
+        """
+        document = await self.collection.find_one({"_id": name})
+        if document is None:
+            return []
+        return [(entry["key"][0], entry["key"][1]) for entry in document["keys"][:limit]]
+
+    async def save_periodically(self, tracker: HotKeyTracker, limit: int, interval_seconds: float) -> None:
+        """
+        Laço de gravação do retrato; roda enquanto a aplicação estiver no ar.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.save(tracker, limit)
+            except Exception as exc:
+                logger.warning(f"Não foi possível gravar as chaves quentes de {tracker.name}: {exc!r}")
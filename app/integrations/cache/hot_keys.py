@@ -0,0 +1,143 @@
+import heapq
+import secrets
+from dataclasses import dataclass
+from typing import Hashable
+
+from app.common.metrics import HOT_KEYS_TOP_SHARE, HOT_KEYS_TRACKED
+
+# Atualiza as métricas a cada tantas contagens, para não pesar no caminho da requisição
+METRICS_EVERY = 1024
+
+# Primo de Mersenne do hash universal de cada linha do sketch
+_HASH_PRIME = (1 << 61) - 1
+
+# Chave acompanhada: (seller_id, sku)
+TrackedKey = tuple[str, str]
+
+
+@dataclass(frozen=True)
+class HotKey:
+    key: TrackedKey
+    count: int
+    # Quanto a contagem pode estar superestimada (colisões do sketch na admissão)
+    error: int
+
+
+class HotKeyTracker:
+    """
+    Top-K das chaves mais acessadas em fluxo, com memória constante.
+
+    Um count-min sketch estima a frequência de qualquer chave, e só as que superam a menos frequente do top-K
+    entram no acompanhamento exato. A cada `window` contagens tudo é dividido por dois, para o ranking seguir
+    mudanças de tráfego em vez de acumular desde o início do processo.
+    """
+
+    def __init__(self, name: str, capacity: int, window: int, width: int = 4096, depth: int = 4):
+        """
+        :param name: Nome do rastreador nas métricas.
+        :param capacity: Quantas chaves o top-K acompanha; 0 desliga a contagem.
+        :param window: Contagens entre cada decaimento pela metade.
+        :param width: Colunas de cada linha do sketch.
+        :param depth: Linhas (funções de hash) do sketch.
+        """
+        self.name = name
+        self.capacity = capacity
+        self.window = window
+        self._width = width
+        self._rows = [[0] * width for _ in range(depth)]
+        # Um hash universal (a·h + b mod p) por linha: derivar as linhas do hash da tupla (linha, chave) dá posições
+        # correlacionadas, e a chave que colide numa linha colide em todas
+        self._salts = [(secrets.randbelow(_HASH_PRIME - 1) + 1, secrets.randbelow(_HASH_PRIME)) for _ in range(depth)]
+        self._top: dict[TrackedKey, list[int]] = {}  # chave -> [contagem, erro]
+        self._heap: list[tuple[int, int, TrackedKey]] = []  # (contagem, desempate, chave), atualizado sob demanda
+        self._sequence = 0
+        self._since_decay = 0
+        self._total = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _cells(self, key: TrackedKey) -> list[tuple[list[int], int]]:
+        hashed = hash(key)
+        return [(row, (a * hashed + b) % _HASH_PRIME % self._width) for row, (a, b) in zip(self._rows, self._salts)]
+
+    def _estimate(self, cells: list[tuple[list[int], int]]) -> int:
+        return min(row[index] for row, index in cells)
+
+    def add(self, key: TrackedKey) -> None:
+        if not self.enabled:
+            return
+        cells = self._cells(key)
+        for row, index in cells:
+            row[index] += 1
+        self._total += 1
+
+        tracked = self._top.get(key)
+        if tracked is not None:
+            tracked[0] += 1
+        else:
+            self._admit(key, self._estimate(cells))
+
+        self._since_decay += 1
+        if self._since_decay >= self.window:
+            self._decay()
+        elif self._total % METRICS_EVERY == 0:
+            self._update_gauges()
+
+    def _admit(self, key: TrackedKey, estimate: int) -> None:
+        if len(self._top) < self.capacity:
+            self._push(key, estimate, estimate - 1)
+            return
+        minimum_key, minimum = self._minimum()
+        if estimate > minimum:
+            del self._top[minimum_key]
+            heapq.heappop(self._heap)
+            # A contagem exata só começa agora: o que veio antes é estimativa do sketch
+            self._push(key, estimate, estimate - 1)
+
+    def _push(self, key: TrackedKey, count: int, error: int) -> None:
+        self._top[key] = [count, error]
+        self._sequence += 1
+        heapq.heappush(self._heap, (count, self._sequence, key))
+
+    def _minimum(self) -> tuple[TrackedKey, int]:
+        # As contagens só crescem entre decaimentos: entradas defasadas sobem ao topo e são corrigidas
+        while True:
+            count, _, key = self._heap[0]
+            current = self._top[key][0]
+            if current == count:
+                return key, count
+            self._sequence += 1
+            heapq.heapreplace(self._heap, (current, self._sequence, key))
+
+    def _decay(self) -> None:
+        for row in self._rows:
+            row[:] = [value >> 1 for value in row]
+        self._top = {key: [count >> 1, error >> 1] for key, (count, error) in self._top.items() if count >> 1}
+        self._heap = [(count, index, key) for index, (key, (count, _)) in enumerate(self._top.items())]
+        heapq.heapify(self._heap)
+        self._sequence = len(self._heap)
+        self._total >>= 1
+        self._since_decay = 0
+        self._update_gauges()
+
+    def is_hot(self, key: Hashable) -> bool:
+        return key in self._top
+
+    def top(self, limit: int | None = None) -> list[HotKey]:
+        """
+        Chaves acompanhadas, da mais para a menos acessada.
+        """
+        ranked = sorted(self._top.items(), key=lambda item: item[1][0], reverse=True)
+        return [HotKey(key, count, error) for key, (count, error) in ranked[:limit]]
+
+    def share(self) -> float:
+        """
+        Fração das contagens da janela que caiu nas chaves acompanhadas: o acerto que um cache desse tamanho teria.
+        """
+        return min(1.0, sum(count for count, _ in self._top.values()) / self._total) if self._total else 0.0
+
+    def _update_gauges(self) -> None:
+        HOT_KEYS_TRACKED.labels(self.name).set(len(self._top))
+        HOT_KEYS_TOP_SHARE.labels(self.name).set(self.share())
@@ -0,0 +1,207 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+from app.common.context import timed
+from app.common.metrics import CACHE_BYTES, CACHE_ENTRIES, CACHE_EVICTIONS, CACHE_REQUESTS
+
+from .hot_keys import HotKeyTracker
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """
+    Resposta HTTP já serializada: corpo e cabeçalhos prontos para reenviar.
+
+    `encodings` guarda o corpo já comprimido por algoritmo (Content-Encoding), para o acerto do cache não
+    comprimir de novo a cada envio.
+    """
+
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    media_type: str = "application/json"
+    encodings: dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return (
+            len(self.body)
+            + sum(len(name) + len(value) for name, value in self.headers.items())
+            + sum(len(encoded) for encoded in self.encodings.values())
+        )
+
+
+class LruCache:
+    """
+    Cache LRU em memória limitado por quantidade de entradas e por bytes, com expiração opcional.
+
+    Os valores precisam expor `size` (bytes). Não é compartilhado entre processos: cada instância da API mantém
+    o próprio cache, e o TTL limita por quanto tempo uma escrita feita em outra instância pode não ser vista.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float | None = None,
+        hot_keys: HotKeyTracker | None = None,
+    ):
+        """
+        :param name: Nome do cache nas métricas.
+        :param max_entries: Máximo de entradas.
+        :param max_bytes: Máximo de bytes somando os valores.
+        :param ttl_seconds: Validade de cada entrada; `None` mantém até ser expulsa pelo LRU.
+        :param hot_keys: Chaves quentes que o LRU poupa ao expulsar; continuam sujeitas ao TTL e à invalidação.
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hot_keys = hot_keys
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._bytes = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def invalidations(self) -> int:
+        """
+        Quantas vezes `delete` foi chamado; lido antes de montar um valor e repassado ao `set` como `since`.
+        """
+        return self._invalidations
+
+    def get(self, key: Hashable) -> Any | None:
+        with timed("cache"):
+            return self._get(key)
+
+    def _get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            CACHE_REQUESTS.labels(self.name, "miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        CACHE_REQUESTS.labels(self.name, "hit").inc()
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, since: int | None = None) -> None:
+        """
+        :param since: Valor de `invalidations` lido antes de montar o valor. Se houve invalidação nesse meio tempo
+            o valor pode já estar desatualizado e não é guardado.
+        """
+        size = value.size
+        if not self.enabled or size > self.max_bytes or (since is not None and since != self._invalidations):
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        self._add(key, expires_at, value)
+        # Cada chave quente ganha uma segunda chance; o limite evita girar para sempre se todas forem quentes
+        spared = 0
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            victim = next(iter(self._entries))
+            if victim != key and spared < len(self._entries) and self._is_hot(victim):
+                self._entries.move_to_end(victim)
+                spared += 1
+                continue
+            self._remove(victim)
+            CACHE_EVICTIONS.labels(self.name).inc()
+        self._update_gauges()
+
+    def _is_hot(self, key: Hashable) -> bool:
+        return self.hot_keys is not None and self.hot_keys.is_hot(key)
+
+    def delete(self, key: Hashable) -> None:
+        self._invalidations += 1
+        if key in self._entries:
+            self._remove(key)
+            self._update_gauges()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._update_gauges()
+
+    def _add(self, key: Hashable, expires_at: float, value: Any) -> None:
+        self._entries[key] = (expires_at, value)
+        self._bytes += value.size
+
+    def _remove(self, key: Hashable) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= value.size
+
+    def _update_gauges(self) -> None:
+        CACHE_ENTRIES.labels(self.name).set(len(self._entries))
+        CACHE_BYTES.labels(self.name).set(self._bytes)
+
+
+class GenerationalCache(LruCache):
+    """
+    LRU particionado por namespace (ex.: seller) com invalidação em O(1) por geração.
+
+    A geração do namespace faz parte da chave; `invalidate` só troca a geração, e as entradas da geração anterior
+    deixam de ser encontradas e saem pelo LRU/TTL. As gerações saem de um relógio único que avança a cada
+    invalidação, e só os namespaces com entradas no cache guardam a sua: um namespace sem entradas está na geração
+    do relógio. Assim a memória das gerações fica limitada pela das entradas, e um valor montado antes de uma
+    invalidação nunca casa com a geração de depois, mesmo que o namespace tenha saído do cache nesse meio tempo.
+    """
+
+    def __init__(self, name: str, max_entries: int, max_bytes: int, ttl_seconds: float | None = None):
+        super().__init__(name, max_entries=max_entries, max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+        self._clock = 0
+        self._namespaces: dict[str, list[int]] = {}  # namespace -> [geração, entradas no cache]
+
+    def generation(self, namespace: str) -> int:
+        state = self._namespaces.get(namespace)
+        return state[0] if state is not None else self._clock
+
+    def invalidate(self, namespace: str) -> None:
+        self._clock += 1
+        state = self._namespaces.get(namespace)
+        if state is not None:
+            state[0] = self._clock
+
+    def get_in(self, namespace: str, key: Hashable) -> Any | None:
+        return self.get((namespace, self.generation(namespace), key))
+
+    def set_in(self, namespace: str, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """
+        :param generation: Geração lida antes de montar o valor. Se o namespace foi invalidado nesse meio tempo,
+            o valor já nasce desatualizado e não é guardado.
+        """
+        current = self.generation(namespace)
+        if generation is not None and generation != current:
+            return
+        self.set((namespace, current, key), value)
+
+    def _add(self, key: Hashable, expires_at: float, value: Any) -> None:
+        super()._add(key, expires_at, value)
+        # As chaves são sempre `(namespace, geração, chave)`, montadas por `set_in`
+        namespace, generation = key[0], key[1]  # type: ignore[index]
+        self._namespaces.setdefault(namespace, [generation, 0])[1] += 1
+
+    def _remove(self, key: Hashable) -> None:
+        super()._remove(key)
+        namespace = key[0]  # type: ignore[index]
+        state = self._namespaces[namespace]
+        state[1] -= 1
+        if not state[1]:
+            del self._namespaces[namespace]
+
+    def clear(self) -> None:
+        super().clear()
+        self._namespaces.clear()
@@ -1,10 +1,27 @@
 import asyncio
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Literal
 
 from bson.binary import UuidRepresentation
 from bson.codec_options import CodecOptions, TypeCodec, TypeRegistry
-from motor.core import AgnosticClient, AgnosticCollection, AgnosticDatabase
-from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import MongoDsn
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+
+from .monitoring import PoolMonitor, build_event_listeners
+
+logger = logging.getLogger(__name__)
+
+MongoDriver = Literal["pymongo", "motor"]
+
+# Intervalo entre as verificações do pool durante o pré-aquecimento
+PREWARM_POLL_SECONDS = 0.05
+
+# Topologias que aceitam transações; um servidor isolado (como o do docker-compose) não aceita
+TRANSACTION_TOPOLOGIES = frozenset({"ReplicaSetWithPrimary", "Sharded"})
 
 
 class SetCodec(TypeCodec):
@@ -19,27 +36,155 @@ class SetCodec(TypeCodec):
 
 
 class MongoDB:
-    def __init__(self, db: AgnosticDatabase):
+    def __init__(self, db: AsyncDatabase):
         self.db = db
 
-    def __getitem__(self, name: str) -> AgnosticCollection:
+    def __getitem__(self, name: str) -> AsyncCollection:
         return self.db[name]
 
+    def get_collection(self, name: str, **options: Any) -> AsyncCollection:
+        """
+        Coleção com opções próprias (read_preference, read_concern, write_concern).
+        """
+        return self.db.get_collection(name, **options)
+
+
+def _create_driver_client(driver: MongoDriver, mongo_url: str, **options: Any) -> Any:
+    """
+    Cria o cliente do driver escolhido.
+
+    - `pymongo`: cliente asyncio nativo do PyMongo, executa as operações no próprio event loop.
+    - `motor`: mantido como alternativa; despacha cada operação para um pool de threads.
+    """
+    if driver == "pymongo":
+        return AsyncMongoClient(mongo_url, **options)
+    if driver == "motor":
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        class EventLoopMotorClient(AsyncIOMotorClient):
+            # Usa o event loop de quem chama, não o de quando o cliente foi criado
+            def get_io_loop(self) -> asyncio.AbstractEventLoop:
+                return asyncio.get_event_loop()
+
+        return EventLoopMotorClient(mongo_url, **options)
+    raise ValueError(f"Driver do MongoDB desconhecido: {driver}")
+
 
 class MongoClient:
-    def __init__(self, mongo_url: MongoDsn):
+    # Sem monitoramento (ou no cliente em memória) não há como medir a saturação do pool
+    pool_monitor: PoolMonitor | None = None
+
+    def __init__(
+        self,
+        mongo_url: MongoDsn,
+        monitoring_enabled: bool = True,
+        slow_query_ms: int = 100,
+        client_options: dict[str, Any] | None = None,
+        driver: MongoDriver = "pymongo",
+    ):
+        """
+        :param mongo_url: URI de conexão com o MongoDB.
+        :param monitoring_enabled: Registra os listeners de comandos e do pool (métricas e log de consultas lentas).
+        :param slow_query_ms: A partir de quantos milissegundos um comando é registrado como consulta lenta.
+        :param client_options: Opções do driver (maxPoolSize, compressors, ...). Têm precedência sobre a URI.
+        :param driver: `pymongo` (asyncio nativo) ou `motor`.
+        """
         self.mongo_url = mongo_url
-        self.motor_client: AgnosticClient = AsyncIOMotorClient(str(mongo_url))
-        self.motor_client.get_io_loop = asyncio.get_event_loop
+        self.driver = driver
+        self.client_options = client_options or {}
+        event_listeners = build_event_listeners(slow_query_ms) if monitoring_enabled else []
+        self.pool_monitor = next((listener for listener in event_listeners if isinstance(listener, PoolMonitor)), None)
+        self.driver_client = _create_driver_client(
+            driver, str(mongo_url), event_listeners=event_listeners, **self.client_options
+        )
 
-    def close(self):
-        self.motor_client.close()
+    @property
+    def min_pool_size(self) -> int:
+        return self.driver_client.options.pool_options.min_pool_size
 
-    def __del__(self):
+    @property
+    def max_pool_size(self) -> int:
+        return self.driver_client.options.pool_options.max_pool_size
+
+    def pool_in_use(self) -> dict[str, int]:
+        """
+        Conexões emprestadas por servidor; vazio quando o pool não é monitorado.
+        """
+        return dict(self.pool_monitor.in_use) if self.pool_monitor is not None else {}
+
+    async def ping(self) -> None:
+        await self.driver_client.admin.command("ping")
+
+    async def prewarm(self, timeout_ms: int = 5000) -> None:
+        """
+        Espera as `minPoolSize` conexões de cada servidor antes das primeiras requisições.
+
+        Quem abre as conexões é o próprio driver, em segundo plano (até `maxConnecting` por vez, a cada segundo):
+        pings simultâneos não bastariam, já que o driver reaproveita as conexões devolvidas ao pool. O ping só
+        dispara a descoberta dos servidores; a espera acompanha as conexões abertas no `PoolMonitor`. Sem o
+        monitoramento não há como medir o pool e o pré-aquecimento se resume ao ping. Falhas e o fim do prazo
+        são apenas logados para não impedir a subida da aplicação.
+        """
+        connections = self.min_pool_size
+        if not connections:
+            return
         try:
-            self.close()
-        except Exception:
-            ...
+            async with asyncio.timeout(timeout_ms / 1000):
+                await self.driver_client.admin.command("ping")
+                while not self._pool_filled(connections):
+                    await asyncio.sleep(PREWARM_POLL_SECONDS)
+            logger.info(f"Pool do MongoDB pré-aquecido com {connections} conexões por servidor")
+        except Exception as exc:
+            logger.warning(f"Não foi possível pré-aquecer o pool do MongoDB: {exc!r}")
+
+    def _pool_filled(self, connections: int) -> bool:
+        if self.pool_monitor is None:
+            return True
+        opened = self.pool_monitor.connections
+        return bool(opened) and all(count >= connections for count in opened.values())
+
+    @asynccontextmanager
+    async def start_session(self, causal_consistency: bool = True) -> AsyncIterator[Any]:
+        # No Motor start_session é corrotina; no PyMongo assíncrono devolve a sessão direto
+        session = self.driver_client.start_session(causal_consistency=causal_consistency)
+        if inspect.isawaitable(session):
+            session = await session
+        async with session:
+            yield session
+
+    @property
+    def supports_transactions(self) -> bool:
+        """
+        Se o servidor aceita transações, pela topologia já descoberta; antes da primeira operação ainda é `False`.
+        """
+        return self.driver_client.topology_description.topology_type_name in TRANSACTION_TOPOLOGIES
+
+    @asynccontextmanager
+    async def transaction(self, session: Any = None) -> AsyncIterator[Any]:
+        """
+        Transação na `session` (ou numa sessão nova), confirmada ao fim do bloco e abortada se ele levantar uma
+        exceção. Sem suporte a transações, o bloco roda com a `session` recebida e cada escrita vale sozinha.
+        """
+        if not self.supports_transactions:
+            yield session
+            return
+        if session is None:
+            async with self.start_session() as new_session:
+                async with self.transaction(new_session) as transaction_session:
+                    yield transaction_session
+            return
+        # No PyMongo assíncrono start_transaction é corrotina; no Motor devolve o contexto direto
+        context = session.start_transaction()
+        if inspect.isawaitable(context):
+            context = await context
+        async with context:
+            yield session
+
+    async def close(self):
+        # No PyMongo assíncrono o close é uma corrotina; no Motor é síncrono
+        result = self.driver_client.close()
+        if inspect.isawaitable(result):
+            await result
 
     def get_database(self, db_name: str) -> MongoDB:
         """
@@ -50,7 +195,7 @@ class MongoClient:
             type_registry=type_registry, uuid_representation=UuidRepresentation.STANDARD, tz_aware=True
         )
         # Acessa o banco de dados pelo nome e aplica os codecs
-        database = self.motor_client.get_database(db_name, codec_options=codec_options)
+        database = self.driver_client.get_database(db_name, codec_options=codec_options)
         return MongoDB(database)
 
     def __getitem__(self, name: str) -> MongoDB:
@@ -0,0 +1,207 @@
+import json
+import logging
+from typing import Any, Mapping
+
+from asgi_correlation_id import correlation_id
+from pymongo import monitoring
+
+from app.common.context import RequestTimings, get_timings
+from app.common.metrics import (
+    MONGO_COMMAND_DURATION,
+    MONGO_COMMAND_FAILURES,
+    MONGO_POOL_CHECKOUT_FAILURES,
+    MONGO_POOL_CHECKOUT_WAIT,
+    MONGO_POOL_CONNECTIONS,
+    MONGO_POOL_CONNECTIONS_IN_USE,
+)
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER = "?"
+NO_SHAPE = "-"
+
+# Onde cada comando carrega o filtro da consulta
+_FILTER_EXTRACTORS = {
+    "find": lambda command: command.get("filter"),
+    "count": lambda command: command.get("query"),
+    "distinct": lambda command: command.get("query"),
+    "findAndModify": lambda command: command.get("query"),
+    "update": lambda command: (command.get("updates") or [{}])[0].get("q"),
+    "delete": lambda command: (command.get("deletes") or [{}])[0].get("q"),
+    "aggregate": lambda command: next(
+        (stage["$match"] for stage in command.get("pipeline", []) if "$match" in stage), None
+    ),
+}
+
+
+def _shape_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _shape_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value and all(isinstance(item, dict) for item in value):
+        # $and/$or: mantém a estrutura das cláusulas
+        return [_shape_value(item) for item in value]
+    return PLACEHOLDER
+
+
+def query_shape(command_name: str, command: Mapping[str, Any]) -> str:
+    """
+    Formato do filtro do comando com os valores substituídos por `?`.
+
+    Ex.: `{"seller_id": "abc", "valor": {"$gte": 10}}` vira `{"seller_id":"?","valor":{"$gte":"?"}}`.
+    Não expõe dados nos logs e mantém a cardinalidade das métricas limitada aos formatos do código.
+    """
+    extractor = _FILTER_EXTRACTORS.get(command_name)
+    if extractor is None:
+        return NO_SHAPE
+    query = extractor(command)
+    if not query:
+        return "{}"
+    shape = _shape_value(query)
+    if command_name == "find" and command.get("sort"):
+        shape = {"filter": shape, "sort": dict(command["sort"])}
+    return json.dumps(shape, separators=(",", ":"), default=str)
+
+
+def _collection_name(event: monitoring.CommandStartedEvent) -> str:
+    if event.command_name == "getMore":
+        return str(event.command.get("collection", NO_SHAPE))
+    value = event.command.get(event.command_name)
+    return value if isinstance(value, str) else NO_SHAPE
+
+
+def _address(event: Any) -> str:
+    host, port = event.address
+    return f"{host}:{port}"
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Mede a latência de cada comando e registra as consultas lentas com o X-Request-ID da requisição.
+
+    O evento de término não traz o comando, então os dados do início ficam guardados pelo `request_id`
+    do driver até a resposta chegar. A duração também entra nas etapas da requisição (Server-Timing), quando
+    ela estiver sendo medida.
+    """
+
+    # Comandos internos do driver (handshake, heartbeat, autenticação) ficam de fora
+    IGNORED_COMMANDS = frozenset({"hello", "isMaster", "ismaster", "ping", "saslStart", "saslContinue", "endSessions"})
+
+    def __init__(self, slow_query_ms: int):
+        self.slow_query_ms = slow_query_ms
+        self._pending: dict[int, tuple[str, str, str | None, RequestTimings | None]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in self.IGNORED_COMMANDS:
+            return
+        self._pending[event.request_id] = (
+            _collection_name(event),
+            query_shape(event.command_name, event.command),
+            correlation_id.get(),
+            get_timings(),
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pending = self._pending.pop(event.request_id, None)
+        if pending is None:
+            return
+        collection, shape, request_id, timings = pending
+        duration = event.duration_micros / 1_000_000
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name, shape).observe(duration)
+        if timings is not None:
+            timings.add("mongo", duration)
+
+        duration_ms = event.duration_micros / 1000
+        if duration_ms >= self.slow_query_ms:
+            logger.warning(
+                f"Consulta lenta no MongoDB: {event.command_name} em {collection} ({duration_ms:.1f} ms)",
+                extra={
+                    "collection": collection,
+                    "command": event.command_name,
+                    "shape": shape,
+                    "duration_ms": duration_ms,
+                    "database": event.database_name,
+                    "request_id": request_id,
+                },
+            )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pending = self._pending.pop(event.request_id, None)
+        if pending is None:
+            return
+        collection, shape, request_id, timings = pending
+        if timings is not None:
+            timings.add("mongo", event.duration_micros / 1_000_000)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+        logger.warning(
+            f"Comando {event.command_name} falhou no MongoDB em {collection}",
+            extra={
+                "collection": collection,
+                "command": event.command_name,
+                "shape": shape,
+                "duration_ms": event.duration_micros / 1000,
+                # Só o código: o errmsg repete valores da consulta (ex.: a chave duplicada de um E11000)
+                "code": event.failure.get("code"),
+                "code_name": event.failure.get("codeName"),
+                "request_id": request_id,
+            },
+        )
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Exporta o tamanho do pool, conexões em uso e o tempo de espera por uma conexão.
+
+    Também guarda, por servidor do próprio cliente, as conexões abertas (usadas no pré-aquecimento do pool) e as
+    em uso (usadas pelo health check de saturação).
+    """
+
+    def __init__(self) -> None:
+        self.connections: dict[str, int] = {}
+        self.in_use: dict[str, int] = {}
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(_address(event)).set(0)
+        MONGO_POOL_CONNECTIONS_IN_USE.labels(_address(event)).set(0)
+        self.connections[_address(event)] = 0
+        self.in_use[_address(event)] = 0
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None: ...
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None: ...
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(_address(event)).set(0)
+        MONGO_POOL_CONNECTIONS_IN_USE.labels(_address(event)).set(0)
+        self.connections.pop(_address(event), None)
+        self.in_use.pop(_address(event), None)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(_address(event)).inc()
+        self.connections[_address(event)] = self.connections.get(_address(event), 0) + 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None: ...
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(_address(event)).dec()
+        self.connections[_address(event)] = max(0, self.connections.get(_address(event), 0) - 1)
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None: ...
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        MONGO_POOL_CHECKOUT_FAILURES.labels(_address(event), event.reason).inc()
+        if event.duration is not None:
+            MONGO_POOL_CHECKOUT_WAIT.labels(_address(event)).observe(event.duration)
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        MONGO_POOL_CONNECTIONS_IN_USE.labels(_address(event)).inc()
+        self.in_use[_address(event)] = self.in_use.get(_address(event), 0) + 1
+        if event.duration is not None:
+            MONGO_POOL_CHECKOUT_WAIT.labels(_address(event)).observe(event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        MONGO_POOL_CONNECTIONS_IN_USE.labels(_address(event)).dec()
+        self.in_use[_address(event)] = max(0, self.in_use.get(_address(event), 0) - 1)
+
+
+def build_event_listeners(slow_query_ms: int) -> list[monitoring._EventListener]:
+    return [CommandMonitor(slow_query_ms=slow_query_ms), PoolMonitor()]
@@ -0,0 +1,181 @@
+import asyncio
+import bisect
+import hashlib
+import logging
+from typing import Any, Iterable
+
+from .mongo_client import MongoClient, MongoDB
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITION = "default"
+OVERRIDES_COLLECTION = "seller_partitions"
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Anel de hash consistente com nós virtuais.
+
+    Ao incluir uma partição só ~1/N dos sellers mudam de lugar, e os nós virtuais espalham a carga
+    de forma uniforme mesmo com poucas partições.
+    """
+
+    def __init__(self, nodes: Iterable[str], vnodes: int = 128):
+        ring = sorted((_hash(f"{node}#{replica}"), node) for node in nodes for replica in range(vnodes))
+        if not ring:
+            raise ValueError("O anel de hash precisa de pelo menos uma partição")
+        self._keys = [key for key, _ in ring]
+        self._nodes = [node for _, node in ring]
+
+    def node_for(self, key: str) -> str:
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._nodes[index]
+
+
+class PartitionRouter:
+    """
+    Decide em qual cluster/banco fica cada seller.
+
+    A partição vem da tabela de exceções (sellers gigantes ou em realocação) e, na falta dela, do anel de
+    hash consistente sobre o `seller_id`. A tabela combina as exceções fixas da configuração com a coleção
+    `seller_partitions` da partição `default`, mantida pela ferramenta de rebalanceamento e recarregada
+    periodicamente.
+    """
+
+    def __init__(
+        self,
+        clients: dict[str, MongoClient],
+        db_name: str,
+        overrides: dict[str, str] | None = None,
+        vnodes: int = 128,
+    ):
+        """
+        :param clients: Cliente de cada partição pelo nome; `default` é obrigatória.
+        :param db_name: Nome do banco usado em todas as partições.
+        :param overrides: Partição fixa por seller_id, com precedência sobre o hash.
+        :param vnodes: Nós virtuais por partição no anel.
+        """
+        if DEFAULT_PARTITION not in clients:
+            raise ValueError(f"A partição '{DEFAULT_PARTITION}' é obrigatória")
+        self.static_overrides = dict(overrides or {})
+        self._validate(self.static_overrides, clients)
+        self.clients = clients
+        self.db_name = db_name
+        self.ring = HashRing(clients, vnodes=vnodes)
+        self._databases = {name: client.get_database(db_name) for name, client in clients.items()}
+        self._dynamic_overrides: dict[str, str] = {}
+
+    @staticmethod
+    def _validate(overrides: dict[str, str], clients: dict[str, Any]) -> None:
+        unknown = {partition for partition in overrides.values() if partition not in clients}
+        if unknown:
+            raise ValueError(f"Partições desconhecidas na tabela de exceções: {sorted(unknown)}")
+
+    @property
+    def partitions(self) -> list[str]:
+        return list(self.clients)
+
+    @property
+    def is_partitioned(self) -> bool:
+        return len(self.clients) > 1
+
+    def partition_for(self, seller_id: str) -> str:
+        seller_id = str(seller_id)
+        partition = self._dynamic_overrides.get(seller_id) or self.static_overrides.get(seller_id)
+        return partition or self.ring.node_for(seller_id)
+
+    def client(self, partition: str) -> MongoClient:
+        return self.clients[partition]
+
+    def database(self, partition: str) -> MongoDB:
+        return self._databases[partition]
+
+    @property
+    def overrides_collection(self) -> Any:
+        return self.database(DEFAULT_PARTITION)[OVERRIDES_COLLECTION]
+
+    async def load_overrides(self) -> None:
+        """
+        Recarrega a tabela de exceções mantida pelo rebalanceamento.
+        """
+        overrides = {}
+        async for document in self.overrides_collection.find({}):
+            overrides[str(document["_id"])] = document["partition"]
+        unknown = {seller: partition for seller, partition in overrides.items() if partition not in self.clients}
+        if unknown:
+            logger.warning(f"Sellers apontando para partições desconhecidas ignorados: {unknown}")
+        self._dynamic_overrides = {seller: p for seller, p in overrides.items() if seller not in unknown}
+
+    async def set_override(self, seller_id: str, partition: str, reason: str = "move") -> None:
+        """
+        :param reason: `move` para realocações definitivas, `pin` para fixações temporárias até o rebalanceamento.
+        """
+        self._validate({seller_id: partition}, self.clients)
+        await self.overrides_collection.replace_one(
+            {"_id": seller_id}, {"_id": seller_id, "partition": partition, "reason": reason}, upsert=True
+        )
+        self._dynamic_overrides[seller_id] = partition
+
+    async def remove_override(self, seller_id: str) -> None:
+        await self.overrides_collection.delete_one({"_id": seller_id})
+        self._dynamic_overrides.pop(seller_id, None)
+
+    async def refresh_overrides(self, interval_seconds: float) -> None:
+        """
+        Laço de recarga da tabela de exceções; roda enquanto a aplicação estiver no ar.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.load_overrides()
+            except Exception as exc:
+                logger.warning(f"Não foi possível recarregar a tabela de partições: {exc!r}")
+
+    async def prewarm(self, timeout_ms: int = 5000) -> None:
+        await asyncio.gather(*(client.prewarm(timeout_ms=timeout_ms) for client in self.clients.values()))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(client.close() for client in self.clients.values()))
+
+
+def build_partition_router(
+    default_client: MongoClient,
+    db_name: str,
+    partition_urls: dict[str, Any] | None = None,
+    overrides: dict[str, str] | None = None,
+    vnodes: int = 128,
+    **client_kwargs: Any,
+) -> PartitionRouter:
+    """
+    Monta o roteador com o cliente principal como partição `default` e um cliente por cluster adicional,
+    todos com as mesmas opções.
+    """
+    clients = {DEFAULT_PARTITION: default_client}
+    for name, url in (partition_urls or {}).items():
+        if name == DEFAULT_PARTITION:
+            raise ValueError(f"'{DEFAULT_PARTITION}' é reservado para o cluster de APP_DB_URL_MONGO")
+        clients[name] = MongoClient(url, **client_kwargs)
+    return PartitionRouter(clients, db_name=db_name, overrides=overrides, vnodes=vnodes)
+
+
+def router_from_settings(settings: Any, db_name: str | None = None) -> PartitionRouter:
+    """
+    Roteador montado direto das configurações, para scripts que rodam fora do container.
+    """
+    client_kwargs = {
+        "monitoring_enabled": False,
+        "client_options": settings.mongo_client_options,
+        "driver": settings.mongo_driver,
+    }
+    return build_partition_router(
+        MongoClient(settings.app_db_url_mongo, **client_kwargs),
+        db_name=db_name or settings.MONGO_DB,
+        partition_urls=settings.mongo_partitions,
+        overrides=settings.mongo_partition_overrides,
+        vnodes=settings.mongo_partition_vnodes,
+        **client_kwargs,
+    )
@@ -1,6 +1,13 @@
+from pydantic import Field
+
 from . import PersistableEntity
 
+# Documentos gravados antes do campo `version` (ainda não migrados) valem como a primeira versão
+INITIAL_VERSION = 1
+
+
 class Frete(PersistableEntity):
     seller_id: str
     sku: str
     valor: int
+    version: int = Field(default=INITIAL_VERSION, description="Versão do frete, incrementada a cada escrita")
@@ -1,4 +1,5 @@
 from .async_crud_repository import AsyncCrudRepository
 from .memory_repository import AsyncMemoryRepository
+from .write_batcher import WriteBatcher, versioned_set
 
-__all__ = ["AsyncMemoryRepository", "AsyncCrudRepository"]
+__all__ = ["AsyncMemoryRepository", "AsyncCrudRepository", "WriteBatcher", "versioned_set"]
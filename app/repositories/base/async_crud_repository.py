@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
+
+from app.settings.app import ReadConsistency
 
 T = TypeVar("T")
-Q = TypeVar("Q")
 
 
 class AsyncCrudRepository(ABC, Generic[T]):
@@ -17,19 +18,37 @@ class AsyncCrudRepository(ABC, Generic[T]):
         """
 
     @abstractmethod
-    async def find_by_id(self, seller_id: str) -> T | None:
+    async def find_by_id(
+        self, entity_id: Any, consistency: ReadConsistency = "primary", session: Any = None, seller_id: Any = None
+    ) -> T | None:
         """
         Busca uma entidade pelo seu identificador único.
         """
 
     @abstractmethod
-    async def find(self, filters: Q, limit: int = 20, offset: int = 0, sort: dict | None = None) -> list[T]:
+    async def find(
+        self,
+        filters: dict,
+        limit: int = 20,
+        offset: int = 0,
+        sort: dict | None = None,
+        consistency: ReadConsistency = "primary",
+        session: Any = None,
+    ) -> list[T]:
         """
         Busca entidades no repositório, utilizando filtros e paginação.
         """
 
     @abstractmethod
-    async def update(self, seller_id: str, entity: T) -> T:
+    async def update(
+        self,
+        entity_id: Any,
+        entity: T,
+        seller_id: Any = None,
+        expected_version: int | None = None,
+        consistency: ReadConsistency = "primary",
+        session: Any = None,
+    ) -> T | None:
         """
         Atualiza uma entidade existente no repositório.
         """
@@ -41,7 +60,7 @@ class AsyncCrudRepository(ABC, Generic[T]):
         """
 
     @abstractmethod
-    async def delete_by_id(self, entity_id: str) -> bool:
+    async def delete_by_id(self, entity_id: Any) -> bool:
         """
         Remove uma entidade pelo seu identificador único.
         """
@@ -0,0 +1,46 @@
+from typing import Any
+
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import Primary, SecondaryPreferred
+from pymongo.write_concern import WriteConcern
+
+from app.integrations.database.mongo_client import MongoDB
+from app.settings.app import ReadConsistency
+
+PRIMARY: ReadConsistency = "primary"
+SECONDARY_PREFERRED: ReadConsistency = "secondary_preferred"
+CAUSAL: ReadConsistency = "causal"
+
+
+def consistency_options(consistency: ReadConsistency, max_staleness_seconds: int) -> dict[str, Any]:
+    """
+    Opções de coleção para cada nível de consistência.
+
+    - `primary`: leitura sempre no primário, sem atraso.
+    - `secondary_preferred`: aceita secundários com até `max_staleness_seconds` de atraso.
+    - `causal`: usado dentro de uma sessão causal; leituras e escritas com maioria garantem ler o que
+      a própria sessão escreveu, mesmo lendo de um secundário.
+    """
+    if consistency == PRIMARY:
+        return {"read_preference": Primary()}
+    if consistency == SECONDARY_PREFERRED:
+        return {"read_preference": SecondaryPreferred(max_staleness=max_staleness_seconds)}
+    if consistency == CAUSAL:
+        return {
+            "read_preference": SecondaryPreferred(max_staleness=max_staleness_seconds),
+            "read_concern": ReadConcern("majority"),
+            "write_concern": WriteConcern("majority"),
+        }
+    raise ValueError(f"Nível de consistência desconhecido: {consistency}")
+
+
+def build_consistency_collections(
+    database: MongoDB, collection_name: str, max_staleness_seconds: int
+) -> dict[ReadConsistency, Any]:
+    """
+    Pré-monta uma coleção por nível de consistência para não recriá-las a cada operação.
+    """
+    return {
+        consistency: database.get_collection(collection_name, **consistency_options(consistency, max_staleness_seconds))
+        for consistency in (PRIMARY, SECONDARY_PREFERRED, CAUSAL)
+    }
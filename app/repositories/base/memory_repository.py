@@ -1,14 +1,23 @@
-from typing import Any, Generic, List, Optional, Type, TypeVar
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Generic, Iterator, List, Optional, Type, TypeVar
 from uuid import UUID
 
+import pymongo
 from pydantic import BaseModel
 from bson import ObjectId
+from pymongo.errors import PyMongoError
 
+from app.common.context import get_deadline
 from app.common.datetime import utcnow
-from app.integrations.database.mongo_client import MongoClient
+from app.common.exceptions import DeadlineExceededException
+from app.common.metrics import DB_OPERATIONS
+from app.integrations.database.partitioning import PartitionRouter
 from app.models.query_model import QueryModel
+from app.settings.app import ReadConsistency
 
 from .async_crud_repository import AsyncCrudRepository
+from .consistency import CAUSAL, PRIMARY, build_consistency_collections
 
 T = TypeVar("T", bound=BaseModel)
 ID = TypeVar("ID", bound=UUID)
@@ -16,35 +25,116 @@ Q = TypeVar("Q", bound=QueryModel)
 
 
 DEFAULT_USER = "system"
+# Campos suficientes para calcular ETag/Last-Modified sem trazer o documento inteiro
+VERSION_PROJECTION = {"_id": 1, "version": 1, "created_at": 1, "updated_at": 1}
+
 
 class AsyncMemoryRepository(AsyncCrudRepository[T], Generic[T]):
 
-    def __init__(self, client: MongoClient, db_name: str, collection_name: str, model_class: Type[T]):
+    def __init__(
+        self,
+        router: PartitionRouter,
+        collection_name: str,
+        model_class: Type[T],
+        max_staleness_seconds: int = 90,
+    ):
         """
-        Repositório genérico para MongoDB.
+        Repositório genérico para MongoDB, particionado por seller_id.
+
+        Operações com `seller_id` vão direto para a partição do seller; as demais consultam todas as partições
+        e juntam os resultados.
 
-        :param client: Instância do MongoClient.
-        :param db_name: Nome do banco de dados a ser utilizado.
+        :param router: Roteador que indica a partição (cluster/banco) de cada seller.
         :param collection_name: Nome da coleção.
         :param model_class: Classe do modelo (usada para criar instâncias de saída).
+        :param max_staleness_seconds: Atraso máximo aceito nas leituras em secundários.
         """
-        database = client.get_database(db_name)
-        self.collection = database[collection_name]
+        self.router = router
+        self.collection_name = collection_name
         self.model_class = model_class
+        self._collections = {
+            partition: build_consistency_collections(
+                router.database(partition), collection_name, max_staleness_seconds
+            )
+            for partition in router.partitions
+        }
+
+    def _collection_for(self, consistency: ReadConsistency, seller_id: Any) -> Any:
+        return self._collections[self.router.partition_for(seller_id)][consistency]
+
+    def partition_collections(self, consistency: ReadConsistency = PRIMARY) -> dict[str, Any]:
+        """
+        Coleção de cada partição, usada nas consultas que cruzam sellers.
+        """
+        return {partition: collections[consistency] for partition, collections in self._collections.items()}
+
+    @asynccontextmanager
+    async def session(self, consistency: ReadConsistency = PRIMARY, seller_id: Any = None) -> AsyncIterator[Any]:
+        """
+        Abre uma sessão causal, no cluster do seller, quando a consistência pede ler as próprias escritas;
+        caso contrário não há sessão.
+        """
+        if consistency != CAUSAL or seller_id is None:
+            yield None
+            return
+        client = self.router.client(self.router.partition_for(seller_id))
+        async with client.start_session(causal_consistency=True) as session:
+            yield session
+
+    @asynccontextmanager
+    async def transaction(self, seller_id: Any, session: Any = None) -> AsyncIterator[Any]:
+        """
+        Transação no cluster do seller, na `session` informada ou numa nova: as escritas do bloco que recebem a
+        sessão devolvida valem juntas ou nenhuma. Num servidor sem transações (isolado, como o do docker-compose),
+        cada escrita vale sozinha.
+        """
+        client = self.router.client(self.router.partition_for(seller_id))
+        async with client.transaction(session) as transaction_session:
+            yield transaction_session
+
+    @contextmanager
+    def _command(self, operation: str) -> Iterator[None]:
+        """
+        Contabiliza a operação enviada ao banco nas métricas da aplicação e a limita ao prazo da requisição.
+
+        O tempo que resta do prazo vira o timeout do driver (`pymongo.timeout`), enviado como `maxTimeMS` em cada
+        comando do bloco, inclusive nos `getMore` do cursor: o servidor abandona a consulta junto com o cliente.
+        Com o prazo já vencido o comando nem é enviado.
+        """
+        DB_OPERATIONS.labels(self.collection_name, operation).inc()
+        deadline = get_deadline()
+        if deadline is None:
+            yield
+            return
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededException()
+        try:
+            with pymongo.timeout(remaining):
+                yield
+        except PyMongoError as exc:
+            if exc.timeout:
+                raise DeadlineExceededException() from exc
+            raise
 
     async def create(self, entity: T) -> T:
         now = utcnow()
         entity_dict = entity.model_dump(by_alias=True)
         entity_dict.setdefault("created_at", now)
-        entity_dict.setdefault("updated_at", now)
+        # O modelo traz `updated_at=None`, que o `setdefault` manteria; o feed de mudanças ordena por este campo
+        if entity_dict.get("updated_at") is None:
+            entity_dict["updated_at"] = entity_dict["created_at"] or now
         entity_dict.setdefault("created_by", DEFAULT_USER)
         entity_dict.setdefault("updated_by", DEFAULT_USER)
         entity_dict.setdefault("audit_created_at", now)
         entity_dict.setdefault("audit_updated_at", now)
-        await self.collection.insert_one(entity_dict)
+        with self._command("insert_one"):
+            await self._collection_for(PRIMARY, entity_dict["seller_id"]).insert_one(entity_dict)
         return self.model_class(**entity_dict)
 
-    async def find_by_id(self, entity_id: Any) -> Optional[T]:
+    async def find_by_id(
+        self, entity_id: Any, consistency: ReadConsistency = PRIMARY, session: Any = None, seller_id: Any = None
+    ) -> Optional[T]:
         # converter entity_id para ObjectId se possível
         try:
             oid = ObjectId(entity_id)
@@ -52,45 +142,164 @@ class AsyncMemoryRepository(AsyncCrudRepository[T], Generic[T]):
             # se não for um ObjectId válido, usa como string mesmo
             oid = entity_id
 
-        result = await self.collection.find_one({"_id": oid})
+        with self._command("find_one"):
+            if seller_id is not None:
+                result = await self._collection_for(consistency, seller_id).find_one({"_id": oid}, session=session)
+            else:
+                # Sem o seller não há como saber a partição: pergunta a todas
+                results = await asyncio.gather(
+                    *(
+                        collection.find_one({"_id": oid})
+                        for collection in self.partition_collections(consistency).values()
+                    )
+                )
+                result = next((document for document in results if document), None)
         if result:
             return self.model_class(**result)
         return None
 
-    async def find(self, filters: dict, limit: int = 10, offset: int = 0, sort: Optional[dict] = None) -> List[T]:
-        cursor = self.collection.find(filters)
+    async def find(
+        self,
+        filters: dict,
+        limit: int = 10,
+        offset: int = 0,
+        sort: Optional[dict] = None,
+        consistency: ReadConsistency = PRIMARY,
+        session: Any = None,
+    ) -> List[T]:
+        with self._command("find"):
+            documents = await self._find_routed(filters, limit, offset, sort, consistency, session)
+        return [self.model_class(**document) for document in documents]
+
+    async def find_versions(
+        self,
+        filters: dict,
+        limit: int = 10,
+        offset: int = 0,
+        sort: Optional[dict] = None,
+        consistency: ReadConsistency = PRIMARY,
+    ) -> list[dict]:
+        """
+        Mesma consulta do `find`, trazendo só `_id`, `version`, `created_at` e `updated_at` e sem montar os modelos.
+        """
+        with self._command("find_versions"):
+            return await self._find_routed(filters, limit, offset, sort, consistency, projection=VERSION_PROJECTION)
+
+    async def _find_routed(
+        self,
+        filters: dict,
+        limit: int,
+        offset: int,
+        sort: Optional[dict],
+        consistency: ReadConsistency,
+        session: Any = None,
+        projection: Optional[dict] = None,
+    ) -> list[dict]:
+        seller_id = filters.get("seller_id")
+        if isinstance(seller_id, str):
+            return await self._find_documents(
+                self._collection_for(consistency, seller_id), filters, limit, offset, sort, session, projection
+            )
+        return await self._fan_out_find(filters, limit, offset, sort, consistency, projection)
+
+    @staticmethod
+    async def _find_documents(
+        collection: Any,
+        filters: dict,
+        limit: int,
+        offset: int,
+        sort: Optional[dict],
+        session: Any = None,
+        projection: Optional[dict] = None,
+    ) -> list[dict]:
+        cursor = collection.find(filters, projection, session=session)
         if sort:
             # sort: {"field": 1/-1}
             cursor = cursor.sort(list(sort.items()))
         cursor = cursor.skip(offset).limit(limit)
-        results = []
-        async for doc in cursor:
-            results.append(self.model_class(**doc))
-        return results
+        return [document async for document in cursor]
 
-    async def update(self, seller_id: str, entity: Any) -> Optional[T]:
+    async def _fan_out_find(
+        self,
+        filters: dict,
+        limit: int,
+        offset: int,
+        sort: Optional[dict],
+        consistency: ReadConsistency,
+        projection: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Consulta todas as partições em paralelo e pagina sobre o resultado combinado.
+
+        Cada partição devolve até `offset + limit` documentos já ordenados, o suficiente para montar a página
+        depois da junção. O `_id` desempata a ordenação (e é a ordem padrão), para que a junção monte sempre as
+        mesmas páginas. Sessões não atravessam clusters, então a leitura é feita sem sessão.
+        """
+        sort = dict(sort or {})
+        sort.setdefault("_id", 1)
+        collections = self.partition_collections(consistency)
+        if len(collections) == 1:
+            (collection,) = collections.values()
+            return await self._find_documents(collection, filters, limit, offset, sort, projection=projection)
+
+        if projection is not None:
+            # A junção ordena na aplicação, então os campos da ordenação precisam vir na projeção
+            projection = {**projection, **{field: 1 for field in sort}}
+        pages = await asyncio.gather(
+            *(
+                self._find_documents(collection, filters, offset + limit, 0, sort, projection=projection)
+                for collection in collections.values()
+            )
+        )
+        documents = [document for page in pages for document in page]
+        for field, direction in reversed(list(sort.items())):
+            # Ordenações estáveis do último critério ao primeiro; nulos primeiro, como no MongoDB
+            documents.sort(key=lambda doc: (doc.get(field) is not None, doc.get(field)), reverse=direction < 0)
+        end = offset + limit
+        return documents[offset:end]
+
+    async def update(
+        self,
+        entity_id: Any,
+        entity: Any,
+        seller_id: Any = None,
+        expected_version: int | None = None,
+        consistency: ReadConsistency = PRIMARY,
+        session: Any = None,
+    ) -> Optional[T]:
         # PUT: substitui todos os campos (menos _id)
         entity_dict = entity.model_dump(by_alias=True, exclude={"identity"})
-        result = await self.collection.find_one_and_update(
-            {"seller_id": str(seller_id)}, {"$set": entity_dict}, return_document=True
-        )
+        entity_dict.pop("_id", None)
+        filters: dict[str, Any] = {"_id": entity_id}
+        if expected_version is not None:
+            filters["version"] = expected_version
+        seller_id = seller_id if seller_id is not None else entity_dict.get("seller_id")
+        with self._command("find_one_and_update"):
+            result = await self._collection_for(consistency, seller_id).find_one_and_update(
+                filters, {"$set": entity_dict}, return_document=True, session=session
+            )
         if result:
             return self.model_class(**result)
         return None
 
     async def delete_by_id(self, seller_id: str) -> bool:
-        result = await self.collection.delete_one({"seller_id": str(seller_id)})
+        with self._command("delete_one"):
+            result = await self._collection_for(PRIMARY, seller_id).delete_one({"seller_id": str(seller_id)})
         return result.deleted_count > 0
 
     async def delete_by_seller_id_and_sku(self, seller_id: str, sku: str) -> bool:
-        result = await self.collection.delete_one({"seller_id": str(seller_id), "sku": sku})
+        with self._command("delete_one"):
+            result = await self._collection_for(PRIMARY, seller_id).delete_one(
+                {"seller_id": str(seller_id), "sku": sku}
+            )
         return result.deleted_count > 0
 
     async def patch(self, seller_id: str, update_fields: dict) -> Optional[T]:
         # PATCH: atualiza só os campos enviados
-        result = await self.collection.find_one_and_update(
-            {"seller_id": str(seller_id)}, {"$set": update_fields}, return_document=True
-        )
+        with self._command("find_one_and_update"):
+            result = await self._collection_for(PRIMARY, seller_id).find_one_and_update(
+                {"seller_id": str(seller_id)}, {"$set": update_fields}, return_document=True
+            )
         if result:
             return self.model_class(**result)
         return None
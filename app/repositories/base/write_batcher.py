@@ -0,0 +1,179 @@
+import asyncio
+import contextvars
+from typing import Any
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
+
+from app.common.metrics import DB_OPERATIONS, DB_WRITE_BATCH_SIZE
+
+# Confirmação exigida de cada lote: gravado no journal da maioria dos nós
+DURABLE_WRITE_CONCERN = WriteConcern("majority", j=True)
+
+
+def versioned_set(fields: dict[str, Any], initial_version: int) -> list[dict]:
+    """
+    Atualização em pipeline que grava `fields` e incrementa a `version`, a partir de `initial_version` nos
+    documentos que ainda não têm o campo. Os valores vão como `$literal`: um texto começando com `$` não vira campo.
+    """
+    values = {name: {"$literal": value} for name, value in fields.items()}
+    values["version"] = {"$add": [{"$ifNull": ["$version", initial_version]}, 1]}
+    return [{"$set": values}]
+
+
+class _PendingWrite:
+    __slots__ = ("fields", "waiters")
+
+    def __init__(self) -> None:
+        self.fields: dict[str, Any] = {}
+        self.waiters: list[asyncio.Future] = []
+
+
+class _Batch:
+    __slots__ = ("collection", "writes", "size", "timer")
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+        self.writes: dict[tuple, _PendingWrite] = {}
+        self.size = 0
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class WriteBatcher:
+    """
+    Agrupa as atualizações parciais que chegam numa janela curta e as envia num único `bulk_write` não ordenado por
+    coleção (group commit). As coleções recebidas devem ter a write concern `DURABLE_WRITE_CONCERN`.
+
+    Atualizações na mesma chave são fundidas: vale o último valor de cada campo (last writer wins), e a versão do
+    documento sobe uma vez por lote. Cada chamador recebe o documento como ficou depois do lote, relido numa única
+    consulta para o lote inteiro, ou `None` se a chave não existir; o resultado só sai depois de o banco confirmar
+    o lote (com `majority` e journal).
+
+    O lote roda fora do contexto de quem o abriu: o prazo de uma requisição não interrompe as escritas das outras.
+    Quem desiste antes só deixa de esperar; a escrita segue no lote.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        key_fields: tuple[str, ...],
+        window_ms: float,
+        max_size: int,
+        initial_version: int,
+        enabled: bool = True,
+    ):
+        """
+        :param collection_name: Nome da coleção, para as métricas.
+        :param key_fields: Campos que identificam o documento (ex.: `("seller_id", "sku")`).
+        :param window_ms: Espera máxima, a partir da primeira escrita, antes de enviar o lote.
+        :param max_size: Chaves distintas que enviam o lote na hora, sem esperar a janela.
+        :param initial_version: Versão dos documentos ainda sem o campo `version`.
+        :param enabled: Desligado, o repositório grava cada atualização na hora.
+        """
+        self.collection_name = collection_name
+        self.key_fields = key_fields
+        self.window_seconds = window_ms / 1000
+        self.max_size = max_size
+        self.initial_version = initial_version
+        self.enabled = enabled
+        self._batches: dict[int, _Batch] = {}
+        self._flushing: set[asyncio.Task] = set()
+
+    async def submit(self, collection: Any, key: tuple, fields: dict[str, Any]) -> dict | None:
+        """
+        Entra no próximo lote da coleção e espera o envio.
+
+        :param key: Valores de `key_fields` do documento.
+        :param fields: Campos a gravar.
+        :return: O documento depois do lote, ou `None` se não existir.
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(id(collection))
+        if batch is None:
+            batch = self._batches[id(collection)] = _Batch(collection)
+            batch.timer = loop.call_later(self.window_seconds, self._flush_batch, id(collection))
+        write = batch.writes.get(key)
+        if write is None:
+            write = batch.writes[key] = _PendingWrite()
+        write.fields.update(fields)
+        waiter = loop.create_future()
+        write.waiters.append(waiter)
+        batch.size += 1
+        if len(batch.writes) >= self.max_size:
+            self._flush_batch(id(collection))
+        return await waiter
+
+    def _flush_batch(self, collection_id: int) -> None:
+        batch = self._batches.pop(collection_id, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        # Contexto vazio: sem o prazo nem o timeout do driver de quem abriu o lote
+        task = asyncio.get_running_loop().create_task(self._flush(batch), context=contextvars.Context())
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def close(self) -> None:
+        """
+        Envia os lotes ainda abertos e espera todos os envios terminarem; chamado no desligamento, antes de fechar o
+        cliente do banco.
+        """
+        for collection_id in list(self._batches):
+            self._flush_batch(collection_id)
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    async def _flush(self, batch: _Batch) -> None:
+        keys = list(batch.writes)
+        DB_WRITE_BATCH_SIZE.labels(self.collection_name).observe(batch.size)
+        collection = batch.collection
+        failed: dict[tuple, Exception] = {}
+        try:
+            DB_OPERATIONS.labels(self.collection_name, "bulk_write").inc()
+            await collection.bulk_write(
+                [
+                    UpdateOne(self._filter(key), versioned_set(batch.writes[key].fields, self.initial_version))
+                    for key in keys
+                ],
+                ordered=False,
+            )
+        except BulkWriteError as exc:
+            # Sem ordem, as demais operações do lote seguem valendo; só as que falharam levam o erro
+            for error in exc.details.get("writeErrors", []):
+                failed[keys[error["index"]]] = exc
+            if exc.details.get("writeConcernErrors"):
+                self._resolve(batch, {}, {key: exc for key in keys})
+                return
+        except Exception as exc:
+            self._resolve(batch, {}, {key: exc for key in keys})
+            return
+
+        written = [self._filter(key) for key in keys if key not in failed]
+        if not written:
+            self._resolve(batch, {}, failed)
+            return
+        try:
+            DB_OPERATIONS.labels(self.collection_name, "find").inc()
+            cursor = collection.find({"$or": written})
+            documents = [document async for document in cursor]
+        except Exception as exc:
+            self._resolve(batch, {}, {key: failed.get(key, exc) for key in keys})
+            return
+        found = {tuple(document.get(field) for field in self.key_fields): document for document in documents}
+        self._resolve(batch, found, failed)
+
+    @staticmethod
+    def _resolve(batch: _Batch, found: dict[tuple, dict], failed: dict[tuple, Exception]) -> None:
+        for key, write in batch.writes.items():
+            for waiter in write.waiters:
+                if waiter.done():
+                    continue
+                if key in failed:
+                    waiter.set_exception(failed[key])
+                else:
+                    waiter.set_result(found.get(key))
+
+    def _filter(self, key: tuple) -> dict:
+        return dict(zip(self.key_fields, key))
@@ -1,23 +1,63 @@
-from typing import Optional
+import asyncio
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from app.common.exceptions import NotFoundException
+from app.common.datetime import utcnow
+from app.common.exceptions import NotFoundException, PreconditionFailedException
+
+from pymongo import ReturnDocument
+from uuid_extensions import uuid7
 
 from ..models import Frete
-from .base import AsyncMemoryRepository
+from ..models.frete_model import INITIAL_VERSION
+from .base import AsyncMemoryRepository, WriteBatcher, versioned_set
+from .base.write_batcher import DURABLE_WRITE_CONCERN
 from ..api.common.schemas import Paginator
-from typing import List
 
-from app.integrations.database.mongo_client import MongoClient
+from app.integrations.database.partitioning import PartitionRouter
+from app.settings.app import ReadConsistency
+
 
 class FreteRepository(AsyncMemoryRepository[Frete]):
 
     COLLECTION_NAME = "fretes"
+    # Remoções (e trocas de seller/sku) para o feed de mudanças; expiram pelo índice TTL em `deleted_at`
+    TOMBSTONES_COLLECTION_NAME = "frete_tombstones"
+
+    def __init__(
+        self, router: PartitionRouter, max_staleness_seconds: int = 90, write_batcher: WriteBatcher | None = None
+    ):
+        """
+        :param write_batcher: Agrupamento das atualizações parciais sem condição de versão; sem ele (ou desligado),
+            cada uma é gravada na hora.
+        """
+        super().__init__(
+            router,
+            collection_name=self.COLLECTION_NAME,
+            model_class=Frete,
+            max_staleness_seconds=max_staleness_seconds,
+        )
+        self.write_batcher = write_batcher
+        # Os lotes só são confirmados aos chamadores depois de gravados no journal da maioria dos nós
+        self._batch_collections = {
+            partition: router.database(partition).get_collection(
+                self.COLLECTION_NAME, write_concern=DURABLE_WRITE_CONCERN
+            )
+            for partition in router.partitions
+        }
+        self._tombstones = {
+            partition: router.database(partition).get_collection(self.TOMBSTONES_COLLECTION_NAME)
+            for partition in router.partitions
+        }
 
-    def __init__(self,client: "MongoClient", db_name: str):
-        super().__init__(client, db_name=db_name, collection_name=self.COLLECTION_NAME, model_class=Frete)
+    @property
+    def batches_writes(self) -> bool:
+        return self.write_batcher is not None and self.write_batcher.enabled
 
-    async def find_all(self, paginator: Paginator, filters: dict) -> List[Frete]:
+    async def find_all(
+        self, paginator: Paginator, filters: dict, consistency: ReadConsistency = "primary"
+    ) -> list[Frete]:
         """
         Busca todos os fretes com paginação e filtragem por seller_id.
         """
@@ -25,15 +65,19 @@ class FreteRepository(AsyncMemoryRepository[Frete]):
             filters=filters,
             limit=paginator.limit,
             offset=paginator.offset,
-            sort=paginator.get_sort_order()
+            sort=paginator.get_sort_order(),
+            consistency=consistency,
         )
 
-    async def find_by_seller_id_and_sku(self, seller_id: str, sku: str) -> Frete | None:
+    async def find_by_seller_id_and_sku(
+        self, seller_id: str, sku: str, consistency: ReadConsistency = "primary"
+    ) -> Frete | None:
         """
         Busca um frete pela junção de seller_id + sku
         """
         frete = await self.find(
-            filters={"seller_id": seller_id, "sku": sku}
+            filters={"seller_id": seller_id, "sku": sku},
+            consistency=consistency,
         )
         if not frete:
             return None
@@ -42,32 +86,233 @@ class FreteRepository(AsyncMemoryRepository[Frete]):
     async def delete_by_seller_id_and_sku(self, seller_id: str, sku: str):
         """
         Remove um frete da memória com base no seller_id e sku.
+
+        A remoção e o registro dela no feed de mudanças são gravados na mesma transação.
         """
+        async with self.transaction(seller_id) as session:
+            with self._command("find_one_and_delete"):
+                document = await self._collection_for("primary", seller_id).find_one_and_delete(
+                    {"seller_id": seller_id, "sku": sku}, projection={"_id": True}, session=session
+                )
+            if document is None:
+                raise NotFoundException()
+            await self.record_deletion(seller_id, sku, document["_id"], session=session)
 
-        frete = await self.find_by_seller_id_and_sku(seller_id, sku)
-        if not frete:
-            raise NotFoundException()
-        await self.collection.delete_one({"seller_id": seller_id, "sku": sku})
+    async def record_deletion(self, seller_id: str, sku: str, entity_id: Any, session: Any = None) -> None:
+        """
+        Registra no feed de mudanças que o frete deixou de existir em (seller_id, sku): removido ou movido para
+        outro seller/sku.
 
-    async def update(self, entity_id: str, entity: Frete) -> Frete:
+        :param session: Sessão da transação (ver `transaction`) da escrita que tirou o frete do par, para as duas
+            valerem juntas; sem transação, uma falha entre as duas deixa o consumidor do feed com o frete removido.
         """
-        Atualiza um frete no MongoDB usando o ID.
+        tombstone = {"_id": uuid7(), "seller_id": seller_id, "sku": sku, "frete_id": entity_id, "deleted_at": utcnow()}
+        with self._command("insert_tombstone"):
+            await self._tombstones[self.router.partition_for(seller_id)].insert_one(tombstone, session=session)
+
+    async def find_changes(
+        self, seller_id: str, after: tuple[datetime, UUID] | None, until: datetime, limit: int
+    ) -> tuple[list[Frete], list[dict]]:
+        """
+        Fretes gravados e remoções do seller depois da posição `after` e até `until`, em ordem de (data, `_id`).
+
+        As duas consultas seguem os índices `(seller_id, updated_at, _id)` e `(seller_id, deleted_at, _id)`: o
+        custo acompanha o número de mudanças, não o de fretes.
+
+        :param after: Posição (data, `_id`) da última mudança já entregue; `None` começa do início.
+        :return: Até `limit` fretes e até `limit` remoções.
+        """
+        partition = self.router.partition_for(seller_id)
+        collection = self._collections[partition]["primary"]
+        with self._command("find_changes"):
+            documents, tombstones = await asyncio.gather(
+                self._find_after(collection, "updated_at", seller_id, after, until, limit),
+                self._find_after(self._tombstones[partition], "deleted_at", seller_id, after, until, limit),
+            )
+        return [Frete(**document) for document in documents], tombstones
+
+    @staticmethod
+    async def _find_after(
+        collection: Any, field: str, seller_id: str, after: tuple[datetime, UUID] | None, until: datetime, limit: int
+    ) -> list[dict]:
+        filters: dict[str, Any] = {"seller_id": seller_id, field: {"$lte": until}}
+        if after is not None:
+            timestamp, entity_id = after
+            filters["$or"] = [{field: {"$gt": timestamp}}, {field: timestamp, "_id": {"$gt": entity_id}}]
+        cursor = collection.find(filters).sort([(field, 1), ("_id", 1)]).limit(limit)
+        return [document async for document in cursor]
+
+    async def update_fields(self, seller_id: str, sku: str, fields: dict) -> Frete | None:
+        """
+        Grava `fields` no frete do seller_id e sku sobre a versão que estiver no banco (vale a última escrita),
+        incrementando a `version`.
+
+        Com o agrupamento de escritas ligado, a atualização entra no próximo lote e é fundida com as demais do
+        mesmo frete; senão, é um `find_one_and_update`.
+
+        :return: O frete atualizado, ou `None` se não existir.
         """
-        data = entity.model_dump(exclude_unset=True)
+        fields = {**fields, "updated_at": utcnow()}
+        if self.write_batcher is not None and self.write_batcher.enabled:
+            collection = self._batch_collections[self.router.partition_for(seller_id)]
+            document = await self.write_batcher.submit(collection, (seller_id, sku), fields)
+        else:
+            with self._command("find_one_and_update"):
+                document = await self._collection_for("primary", seller_id).find_one_and_update(
+                    {"seller_id": seller_id, "sku": sku},
+                    versioned_set(fields, INITIAL_VERSION),
+                    return_document=ReturnDocument.AFTER,
+                )
+        return Frete(**document) if document else None
 
-        result = await self.collection.update_one(
-            {"_id": entity_id},
-            {"$set": data}
+    async def update(
+        self,
+        entity_id: UUID,
+        entity: Frete,
+        seller_id: str | None = None,
+        expected_version: int | None = None,
+        consistency: ReadConsistency = "primary",
+        session: Any = None,
+        sku: str | None = None,
+    ) -> Frete:
+        """
+        Atualiza um frete no MongoDB usando o ID com os campos definidos na entidade, incrementando a `version`.
+
+        :param seller_id: Seller atual do frete, que define a partição; por padrão o da própria entidade.
+        :param expected_version: Versão que o chamador leu; `None` aplica a escrita sobre qualquer versão.
+        :param sku: Sku atual do frete (ver `set_fields`).
+        """
+        return await self.set_fields(
+            entity_id,
+            entity.model_dump(exclude_unset=True),
+            seller_id=seller_id or entity.seller_id,
+            expected_version=expected_version,
+            consistency=consistency,
+            session=session,
+            sku=sku,
         )
 
-        if result.matched_count == 0:
-            raise NotFoundException()
+    async def set_fields(
+        self,
+        entity_id: UUID,
+        fields: dict[str, Any],
+        seller_id: str,
+        expected_version: int | None = None,
+        consistency: ReadConsistency = "primary",
+        session: Any = None,
+        sku: str | None = None,
+    ) -> Frete:
+        """
+        Grava só os `fields` informados no frete do ID, incrementando a `version`.
+
+        Escrita e releitura acontecem num único `find_one_and_update`; com `expected_version` o filtro também
+        exige a versão, e o frete alterado por outra escrita no meio do caminho resulta em
+        PreconditionFailedException.
+
+        :param seller_id: Seller atual do frete, que define a partição.
+        :param expected_version: Versão que o chamador leu; `None` aplica a escrita sobre qualquer versão.
+        :param sku: Sku atual do frete; com ele, a troca de seller ou sku registra a remoção do par antigo no feed
+            de mudanças na mesma transação da escrita.
+        """
+        data = dict(fields)
+        data.pop("version", None)
+        # Mantém o Last-Modified/ETag da API coerentes com a escrita
+        data["updated_at"] = utcnow()
+        new_seller_id = data.get("seller_id", seller_id)
+        if self.router.partition_for(new_seller_id) != self.router.partition_for(seller_id):
+            return await self._move(entity_id, data, seller_id, new_seller_id, expected_version)
+        if sku is None or (new_seller_id, data.get("sku", sku)) == (seller_id, sku):
+            return await self._set_versioned(entity_id, data, seller_id, expected_version, consistency, session)
+
+        async with self.transaction(seller_id, session) as transaction_session:
+            frete = await self._set_versioned(
+                entity_id, data, seller_id, expected_version, consistency, transaction_session
+            )
+            await self.record_deletion(seller_id, sku, entity_id, session=transaction_session)
+        return frete
+
+    async def _set_versioned(
+        self,
+        entity_id: UUID,
+        data: dict[str, Any],
+        seller_id: str,
+        expected_version: int | None,
+        consistency: ReadConsistency,
+        session: Any,
+    ) -> Frete:
+        collection = self._collection_for(consistency, seller_id)
+        for version_filter, version_update in self._version_updates(expected_version):
+            with self._command("find_one_and_update"):
+                result = await collection.find_one_and_update(
+                    {"_id": entity_id, **version_filter},
+                    {**version_update, "$set": {**data, **version_update.get("$set", {})}},
+                    return_document=ReturnDocument.AFTER,
+                    session=session,
+                )
+            if result:
+                return Frete(**result)
 
-        updated = await self.find_by_id(entity_id)
-        if not updated:
+        if expected_version is not None:
+            with self._command("count_documents"):
+                exists = await collection.count_documents({"_id": entity_id}, session=session)
+            if exists:
+                raise PreconditionFailedException()
+        raise NotFoundException()
+
+    @staticmethod
+    def _version_updates(expected_version: int | None) -> list[tuple[dict, dict]]:
+        """
+        Filtro de versão e atualização da `version` para cada tentativa de escrita.
+
+        Documentos ainda sem `version` (antes do backfill) valem como INITIAL_VERSION; como `$inc` sobre o campo
+        ausente resultaria em 1 de novo, eles recebem a versão seguinte explicitamente.
+        """
+        attempts: list[tuple[dict, dict]]
+        if expected_version is None:
+            attempts = [({"version": {"$exists": True}}, {"$inc": {"version": 1}})]
+        else:
+            attempts = [({"version": expected_version}, {"$inc": {"version": 1}})]
+        if expected_version in (None, INITIAL_VERSION):
+            attempts.append(({"version": {"$exists": False}}, {"$set": {"version": INITIAL_VERSION + 1}}))
+        return attempts
+
+    async def _move(
+        self, entity_id: UUID, data: dict, seller_id: str, new_seller_id: str, expected_version: int | None = None
+    ) -> Frete:
+        """
+        Troca de seller que cruza partições: grava o documento atualizado na partição nova e remove da antiga.
+
+        Não é atômico entre clusters; a inserção vem antes da remoção para que, numa falha, o frete fique
+        duplicado (e visível) em vez de perdido. A remoção exige a versão lida: se outra escrita alterar o frete na
+        origem no meio do caminho, a cópia é desfeita e a troca resulta em PreconditionFailedException, em vez de
+        a escrita concorrente ser apagada junto com a origem. A remoção e o registro dela no feed de mudanças
+        ficam na mesma transação, na partição antiga.
+        """
+        source = self._collection_for("primary", seller_id)
+        with self._command("find_one"):
+            document = await source.find_one({"_id": entity_id})
+        if not document:
             raise NotFoundException()
-        
-        return updated
+        version = document.get("version", INITIAL_VERSION)
+        if expected_version is not None and version != expected_version:
+            raise PreconditionFailedException()
+        # Documentos ainda sem `version` (antes do backfill) só saem da origem se continuarem sem o campo
+        version_filter = {"version": document["version"]} if "version" in document else {"version": {"$exists": False}}
+        sku = document["sku"]
+        document.update(data, version=version + 1)
+
+        target = self._collection_for("primary", new_seller_id)
+        with self._command("insert_one"):
+            await target.insert_one(document)
+        async with self.transaction(seller_id) as session:
+            with self._command("delete_one"):
+                result = await source.delete_one({"_id": entity_id, **version_filter}, session=session)
+            if not result.deleted_count:
+                with self._command("delete_one"):
+                    await target.delete_one({"_id": entity_id, "version": version + 1})
+                raise PreconditionFailedException()
+            await self.record_deletion(seller_id, sku, entity_id, session=session)
+        return Frete(**document)
 
 
 __all__ = ["FreteRepository"]
@@ -1,4 +1,5 @@
 from .health_check.health_service import HealthCheckService
+from .health_check.readiness import Readiness
 from .frete.frete_service import FreteService
 
-__all__ = ["HealthCheckService", "FreteService"]
+__all__ = ["HealthCheckService", "Readiness", "FreteService"]
@@ -34,7 +34,7 @@ class CrudService(Generic[T, ID]):
             filters=filters, limit=paginator.limit, offset=paginator.offset, sort=paginator.get_sort_order()
         )
 
-    async def update(self, entity_id: ID, entity: Any) -> T:
+    async def update(self, entity_id: ID, entity: Any) -> T | None:
         return await self.repository.update(entity_id, entity)
 
     async def delete_by_id(self, entity_id: ID) -> None:
@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Literal
+from uuid import UUID
+
+from ...models import Frete
+
+ChangeType = Literal["upsert", "delete"]
+
+
+@dataclass(frozen=True, order=True)
+class ChangePosition:
+    """
+    Posição no feed de mudanças: data da mudança e `_id` do documento, que desempata as mudanças no mesmo ms.
+    """
+
+    timestamp: datetime
+    entity_id: UUID
+
+    def encode(self) -> str:
+        """
+        Token opaco para o consumidor retomar o feed a partir desta posição.
+        """
+        payload = {"t": round(self.timestamp.timestamp() * 1000), "i": str(self.entity_id)}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "ChangePosition":
+        """
+        :raises ValueError: Se o token não for um devolvido pelo feed.
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            timestamp = datetime.fromtimestamp(payload["t"] / 1000, tz=timezone.utc)
+            return cls(timestamp, UUID(payload["i"]))
+        except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+            raise ValueError("token inválido") from exc
+
+
+@dataclass(frozen=True)
+class FreteChange:
+    type: ChangeType
+    position: ChangePosition
+    seller_id: str
+    sku: str
+    entity_id: UUID
+    frete: Frete | None = None
+
+
+@dataclass(frozen=True)
+class FreteChangesPage:
+    changes: list[FreteChange]
+    next: ChangePosition
+    has_more: bool
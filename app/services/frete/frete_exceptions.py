@@ -1,5 +1,12 @@
 from app.api.common.schemas.response import ErrorDetail
-from app.common.exceptions import ConflictException, NotFoundException
+from app.common.exceptions import (
+    BadRequestException,
+    ConflictException,
+    GoneException,
+    NotFoundException,
+    PreconditionFailedException,
+)
+
 
 class FreteAlreadyExistsException(ConflictException):
     def __init__(
@@ -19,6 +26,7 @@ class FreteAlreadyExistsException(ConflictException):
         ]
         super().__init__(details=details)
 
+
 class FreteNotFoundException(NotFoundException):
     def __init__(
         self,
@@ -34,4 +42,69 @@ class FreteNotFoundException(NotFoundException):
                 ctx={"seller_id": seller_id, "sku": sku},
             )
         ]
-        super().__init__(details=details)
\ No newline at end of file
+        super().__init__(details=details)
+
+
+class FreteVersionMismatchException(PreconditionFailedException):
+    def __init__(
+        self,
+        seller_id: str,
+        sku: str,
+    ):
+        details = [
+            ErrorDetail(
+                message="O frete foi alterado desde a versão informada no If-Match.",
+                location="header",
+                slug="frete_versao_divergente",
+                field="If-Match",
+                ctx={"seller_id": seller_id, "sku": sku},
+            )
+        ]
+        super().__init__(details=details)
+
+
+class FreteWriteConflictException(ConflictException):
+    def __init__(
+        self,
+        seller_id: str,
+        sku: str,
+        retry_after: int = 1,
+    ):
+        details = [
+            ErrorDetail(
+                message="O frete foi alterado por escritas concorrentes; tente novamente.",
+                location="path",
+                slug="frete_escrita_concorrente",
+                field="sku",
+                ctx={"seller_id": seller_id, "sku": sku},
+            )
+        ]
+        super().__init__(details=details)
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class FreteChangesTokenInvalidException(BadRequestException):
+    def __init__(self):
+        details = [
+            ErrorDetail(
+                message="Token do feed de mudanças inválido.",
+                location="query",
+                slug="token_invalido",
+                field="since",
+            )
+        ]
+        super().__init__(details=details)
+
+
+class FreteChangesTokenExpiredException(GoneException):
+    def __init__(self, retention_days: int):
+        details = [
+            ErrorDetail(
+                message="Token do feed de mudanças anterior à retenção das remoções; refaça a carga completa.",
+                location="query",
+                slug="token_expirado",
+                field="since",
+                ctx={"retention_days": retention_days},
+            )
+        ]
+        super().__init__(details=details)
@@ -1,12 +1,28 @@
+from datetime import timedelta
+from typing import Any
 from uuid import UUID
 
 from ...api.common.schemas.response import ErrorDetail
-from ...common.exceptions import BadRequestException
+from ...common.exceptions import BadRequestException, PreconditionFailedException
+from ...integrations.cache import GenerationalCache, LruCache
 from ...models import Frete
 from ...repositories import FreteRepository
+from ...settings.app import ReadConsistency
 from ..base import CrudService
 from ...api.common.schemas import Paginator
-from .frete_exceptions import FreteAlreadyExistsException, FreteNotFoundException
+from ...common.datetime import as_utc, utcnow
+from .frete_changes import ChangePosition, FreteChange, FreteChangesPage
+from .frete_exceptions import (
+    FreteAlreadyExistsException,
+    FreteChangesTokenExpiredException,
+    FreteChangesTokenInvalidException,
+    FreteNotFoundException,
+    FreteVersionMismatchException,
+    FreteWriteConflictException,
+)
+
+# Reaplicações do PATCH sem If-Match quando outra escrita altera o frete entre a leitura e a gravação
+PATCH_MAX_ATTEMPTS = 3
 
 class FreteService(CrudService[Frete, UUID]):
     """
@@ -16,18 +32,83 @@ class FreteService(CrudService[Frete, UUID]):
 
     repository: FreteRepository
 
-    def __init__(self, repository: FreteRepository):
+    def __init__(
+        self,
+        repository: FreteRepository,
+        read_consistency: dict[str, ReadConsistency] | None = None,
+        list_cache: GenerationalCache | None = None,
+        item_cache: LruCache | None = None,
+        changes_settle_ms: int = 2000,
+        changes_retention_days: int = 30,
+    ):
         """
         Inicializa o serviço de fretes com o repositório fornecido.
 
         :param repository: Instância de FreteRepository para acesso aos dados.
+        :param read_consistency: Consistência de leitura por método; os ausentes leem do primário.
+        :param list_cache: Cache das páginas da listagem, invalidado por seller a cada escrita.
+        :param item_cache: Cache das respostas do frete por (seller_id, sku), invalidado a cada escrita no frete.
+        :param changes_settle_ms: Idade mínima das mudanças entregues pelo feed.
+        :param changes_retention_days: Retenção das remoções no feed; tokens mais antigos exigem carga completa.
         """
         super().__init__(repository)
+        self.read_consistency = read_consistency or {}
+        self.list_cache = list_cache
+        self.item_cache = item_cache
+        self.changes_settle = timedelta(milliseconds=changes_settle_ms)
+        self.changes_retention = timedelta(days=changes_retention_days)
+
+    def _consistency(self, operation: str) -> ReadConsistency:
+        return self.read_consistency.get(operation, "primary")
+
+    def _invalidate_caches(self, *keys: tuple[str, str]) -> None:
+        """
+        :param keys: Pares (seller_id, sku) escritos; numa troca de seller/sku, o antigo e o novo.
+        """
+        for seller_id, sku in set(keys):
+            if self.list_cache is not None:
+                self.list_cache.invalidate(seller_id)
+            if self.item_cache is not None:
+                self.item_cache.delete((seller_id, sku))
 
     async def find_all(self, paginator: Paginator, filters: dict) -> list[Frete]:
         """
         Busca todos os fretes com paginação e filtros.
         """
+        fretes = await self.repository.find_all(
+            paginator=paginator,
+            filters=self._build_query_filters(filters),
+            consistency=self._consistency("find_all"),
+        )
+        
+        return fretes
+
+    async def find_all_versions(self, paginator: Paginator, filters: dict) -> list[dict]:
+        """
+        Versões (`_id`, `version`, `created_at`, `updated_at`) da mesma página do `find_all`, para validar o cache
+        do cliente.
+        """
+        return await self.repository.find_versions(
+            filters=self._build_query_filters(filters),
+            limit=paginator.limit,
+            offset=paginator.offset,
+            sort=paginator.get_sort_order(),
+            consistency=self._consistency("find_all"),
+        )
+
+    async def find_version_by_seller_id_and_sku(self, seller_id: str, sku: str) -> dict | None:
+        """
+        Versão do frete do seller_id e sku, sem trazer o documento inteiro.
+        """
+        versions = await self.repository.find_versions(
+            filters={"seller_id": seller_id, "sku": sku},
+            limit=1,
+            consistency=self._consistency("find_by_seller_id_and_sku"),
+        )
+        return versions[0] if versions else None
+
+    @staticmethod
+    def _build_query_filters(filters: dict) -> dict:
         query_filters = {}
 
         if filters.get("seller_id"):
@@ -37,13 +118,7 @@ class FreteService(CrudService[Frete, UUID]):
         if filters.get("preco_less_than") is not None:
             query_filters.setdefault("valor", {})
             query_filters["valor"]["$lte"] = filters["preco_less_than"]
-
-        fretes = await self.repository.find_all(
-            paginator=paginator,
-            filters=query_filters
-        )
-        
-        return fretes
+        return query_filters
 
     async def find_by_seller_id_and_sku(self, seller_id: str, sku: str) -> Frete:
         """
@@ -55,7 +130,9 @@ class FreteService(CrudService[Frete, UUID]):
         :raises FreteNotFoundException: Se não encontrar o frete.
         """
 
-        fretes = await self._validate_frete_nao_existe(seller_id, sku)
+        fretes = await self._validate_frete_nao_existe(
+            seller_id, sku, consistency=self._consistency("find_by_seller_id_and_sku")
+        )
 
         if not fretes:
             raise FreteNotFoundException(seller_id=seller_id, sku=sku)
@@ -71,44 +148,211 @@ class FreteService(CrudService[Frete, UUID]):
         :raises BadRequestException: Se já existir fretes para o produto ou valores inválidos.
         """
         # Valida se já existe frete para o seller_id e sku informados
-        await self._validate_frete_existe(frete_create.seller_id, frete_create.sku)
+        await self._validate_frete_existe(
+            frete_create.seller_id, frete_create.sku, consistency=self._consistency("create_frete")
+        )
         self._validate_fretes_positivos(frete_create)
         
         # Converte FreteCreate para Frete, gerando o id automaticamente
         frete = Frete(**frete_create.model_dump())
-        return await self.create(frete)
+        frete = await self.create(frete)
+        self._invalidate_caches((frete.seller_id, frete.sku))
+        return frete
 
-    async def update_frete_value(self, seller_id: str, sku: str, frete_update) -> Frete:
-        frete_existente = await self._validate_frete_nao_existe(seller_id, sku)
-        self._validate_fretes_positivos(frete_update)
+    async def update_frete_value(
+        self, seller_id: str, sku: str, frete_update, if_match: list[tuple[str, int]] | None = None
+    ) -> Frete:
+        """
+        Atualiza os campos informados de um frete.
 
-        frete = frete_existente[0]
-        id = frete.id
+        Com `if_match` a escrita só acontece se o frete ainda estiver numa das versões informadas. Sem ele, a
+        escrita é condicionada à versão lida aqui e, se outra escrita vencer a corrida, o PATCH é reaplicado
+        sobre a versão nova em vez de sobrescrevê-la. Com o agrupamento de escritas ligado, o PATCH sem If-Match
+        que não troca seller nem sku grava só os campos enviados, sem ler o frete antes (ver `_update_frete_fields`).
 
-        # Pega apenas os campos que vieram no PATCH
-        updates = frete_update.model_dump(exclude_unset=True)
+        :param if_match: Pares (id, version) aceitos, vindos do cabeçalho If-Match.
+        :raises FreteVersionMismatchException: Se o frete não estiver na versão do If-Match.
+        :raises FreteWriteConflictException: Se, sem If-Match, o PATCH perder a corrida em todas as tentativas.
+        """
+        if if_match is None and self.repository.batches_writes:
+            updates = frete_update.model_dump(exclude_unset=True)
+            if updates.get("seller_id", seller_id) == seller_id and updates.get("sku", sku) == sku:
+                self._validate_fretes_positivos(frete_update)
+                return await self._update_frete_fields(seller_id, sku, updates)
+
+        consistency = self._consistency("update_frete_value")
+        attempts = 1 if if_match is not None else PATCH_MAX_ATTEMPTS
+        async with self.repository.session(consistency, seller_id=seller_id) as session:
+            for _ in range(attempts):
+                try:
+                    frete = await self._update_frete_value(seller_id, sku, frete_update, if_match, consistency, session)
+                    self._invalidate_caches((seller_id, sku), (frete.seller_id, frete.sku))
+                    return frete
+                except PreconditionFailedException:
+                    if if_match is not None:
+                        raise FreteVersionMismatchException(seller_id=seller_id, sku=sku)
+        # Sem If-Match o cliente não impôs condição nenhuma: perder todas as corridas é conflito, não 412
+        raise FreteWriteConflictException(seller_id=seller_id, sku=sku)
+
+    async def _update_frete_value(
+        self,
+        seller_id: str,
+        sku: str,
+        frete_update,
+        if_match: list[tuple[str, int]] | None,
+        consistency: ReadConsistency,
+        session: Any,
+    ) -> Frete:
+        frete = await self._find_for_update(seller_id, sku, consistency, session)
+        self._validate_fretes_positivos(frete_update)
+        if if_match is not None:
+            self._validate_if_match(frete, if_match)
+
+        # Grava apenas os campos que vieram no PATCH, condicionados à versão lida, e retorna o Frete atualizado
+        return await self.repository.set_fields(
+            frete.id,
+            frete_update.model_dump(exclude_unset=True),
+            seller_id=frete.seller_id,
+            expected_version=frete.version,
+            consistency=consistency,
+            session=session,
+            sku=frete.sku,
+        )
 
-        # Cria uma nova instância com os dados atualizados
-        frete_atualizado = frete.model_copy(update=updates)
+    async def _update_frete_fields(self, seller_id: str, sku: str, updates: dict) -> Frete:
+        """
+        Grava os campos do PATCH sobre a versão atual do frete, no lote de escritas do repositório.
 
-        # Atualiza no banco (essa função precisa salvar e retornar o Frete atualizado)
-        updated = await self.update(id, frete_atualizado)
+        Equivale ao PATCH reaplicado sobre a versão nova depois de perder a corrida: vale o último valor de cada
+        campo. Várias escritas no mesmo frete dentro da janela viram uma só.
 
-        # Retorna a versão final
-        return updated
+        :raises FreteNotFoundException: Se o frete não existir.
+        """
+        fields = {name: value for name, value in updates.items() if name not in ("seller_id", "sku")}
+        frete = await self.repository.update_fields(seller_id, sku, fields)
+        if frete is None:
+            raise FreteNotFoundException(seller_id=seller_id, sku=sku)
+        self._invalidate_caches((seller_id, sku))
+        return frete
 
-    async def replace_frete(self, seller_id: str, sku: str, frete_update) -> Frete:
+    async def replace_frete(
+        self, seller_id: str, sku: str, frete_update, if_match: list[tuple[str, int]] | None = None
+    ) -> Frete:
         """
         Substitui completamente os dados de um frete existente.
+
+        :param if_match: Pares (id, version) aceitos, vindos do cabeçalho If-Match; sem ele a substituição vale
+            sobre qualquer versão.
+        :raises FreteVersionMismatchException: Se o frete não estiver na versão do If-Match.
+        :raises FreteWriteConflictException: Se, sem If-Match, a troca de seller ou sku perder a corrida com outra
+            escrita.
         """
-        frete_existente = await self._validate_frete_nao_existe(seller_id, sku)
-        self._validate_fretes_positivos(frete_update)
+        consistency = self._consistency("replace_frete")
+        async with self.repository.session(consistency, seller_id=seller_id) as session:
+            frete = await self._find_for_update(seller_id, sku, consistency, session)
+            self._validate_fretes_positivos(frete_update)
+            expected_version = None
+            if if_match is not None:
+                self._validate_if_match(frete, if_match)
+                expected_version = frete.version
+
+            novo_frete = Frete(**frete_update.model_dump())
+
+            try:
+                frete_substituido = await self.repository.update(
+                    frete.id,
+                    novo_frete,
+                    seller_id=frete.seller_id,
+                    expected_version=expected_version,
+                    consistency=consistency,
+                    session=session,
+                    sku=frete.sku,
+                )
+            except PreconditionFailedException:
+                if if_match is not None:
+                    raise FreteVersionMismatchException(seller_id=seller_id, sku=sku)
+                raise FreteWriteConflictException(seller_id=seller_id, sku=sku)
+            self._invalidate_caches((seller_id, sku), (frete_substituido.seller_id, frete_substituido.sku))
+            return frete_substituido
+
+    async def find_changes(self, seller_id: str, since: str | None, limit: int) -> FreteChangesPage:
+        """
+        Mudanças nos fretes do seller depois do token `since`, para os consumidores sincronizarem só o que mudou.
+
+        Fretes criados ou alterados vêm como `upsert`, com o frete atual; removidos (ou movidos para outro
+        seller/sku) vêm como `delete`. Mudanças com menos de `changes_settle` ficam para a próxima chamada: uma
+        escrita pode ser confirmada depois de outra com horário posterior, e entregá-la antes deixaria a anterior
+        para trás do token.
+
+        :param since: Token `next` da chamada anterior; sem ele, desde o início.
+        :raises FreteChangesTokenInvalidException: Se o token não for um devolvido pelo feed.
+        :raises FreteChangesTokenExpiredException: Se o token for anterior à retenção das remoções.
+        """
+        now = utcnow()
+        after = None
+        if since:
+            try:
+                after = ChangePosition.decode(since)
+            except ValueError:
+                raise FreteChangesTokenInvalidException()
+            if after.timestamp < now - self.changes_retention:
+                raise FreteChangesTokenExpiredException(retention_days=self.changes_retention.days)
+
+        until = now - self.changes_settle
+        fretes, tombstones = await self.repository.find_changes(
+            seller_id, (after.timestamp, after.entity_id) if after else None, until, limit
+        )
+        # A consulta filtra por `updated_at`: todo frete devolvido tem o campo
+        changes = [
+            FreteChange(
+                "upsert",
+                ChangePosition(as_utc(frete.updated_at or until), frete.id),
+                frete.seller_id,
+                frete.sku,
+                frete.id,
+                frete,
+            )
+            for frete in fretes
+        ] + [
+            FreteChange(
+                "delete",
+                ChangePosition(as_utc(tombstone["deleted_at"]), tombstone["_id"]),
+                tombstone["seller_id"],
+                tombstone["sku"],
+                tombstone["frete_id"],
+            )
+            for tombstone in tombstones
+        ]
+        changes.sort(key=lambda change: change.position)
+        has_more = len(fretes) >= limit or len(tombstones) >= limit
+        changes = changes[:limit]
+        if changes:
+            next_position = changes[-1].position
+        else:
+            # Nada até `until`: o token avança até lá e não envelhece enquanto o seller fica sem mudanças
+            next_position = ChangePosition(until, UUID(int=0))
+            if after is not None:
+                next_position = max(next_position, after)
+        return FreteChangesPage(changes=changes, next=next_position, has_more=has_more)
+
+    async def _find_for_update(self, seller_id: str, sku: str, consistency: ReadConsistency, session: Any) -> Frete:
+        fretes = await self._validate_frete_nao_existe(seller_id, sku, consistency=consistency, session=session)
+        if not fretes:
+            raise FreteNotFoundException(seller_id=seller_id, sku=sku)
+        return fretes[0]
 
-        frete = frete_existente[0]
+    @staticmethod
+    def _validate_if_match(frete: Frete, if_match: list[tuple[str, int]]) -> None:
+        """
+        Confere o If-Match com o frete que acabou de ser lido, antes de montar a escrita.
 
-        novo_frete = Frete(**frete_update.model_dump())
+        A escrita é condicionada à versão lida; sem esta conferência, uma leitura atrasada que por acaso estivesse
+        na versão do cabeçalho gravaria por cima da versão atual.
 
-        return await self.update(frete.id, novo_frete)
+        :raises FreteVersionMismatchException: Se nenhum ETag informado for deste frete nesta versão.
+        """
+        if (str(frete.id), frete.version) not in if_match:
+            raise FreteVersionMismatchException(seller_id=frete.seller_id, sku=frete.sku)
 
     async def delete_by_seller_id_and_sku(self, seller_id: str, sku: str):
         """
@@ -118,9 +362,12 @@ class FreteService(CrudService[Frete, UUID]):
         :param sku: Código do produto.
         :raises NotFoundException: Se o frete não for encontrado.
         """
-        frete_encontrado = await self._validate_frete_nao_existe(seller_id, sku)
+        frete_encontrado = await self._validate_frete_nao_existe(
+            seller_id, sku, consistency=self._consistency("delete_by_seller_id_and_sku")
+        )
         if frete_encontrado:
             await self.repository.delete_by_seller_id_and_sku(seller_id, sku)
+            self._invalidate_caches((seller_id, sku))
 
     def _validate_fretes_positivos(self, frete):
         """
@@ -139,28 +386,33 @@ class FreteService(CrudService[Frete, UUID]):
                 details=[ErrorDetail(message="O valor do frete deve ser maior ou igual a zero.", location="body", slug="frete_invalido", field="valor")]
             )
 
-    async def _validate_frete_existe(self, seller_id: str, sku: str):
+    async def _validate_frete_existe(self, seller_id: str, sku: str, consistency: ReadConsistency = "primary"):
         """
         Verifica se já existe um frete cadastrado para o seller_id e sku informados.
 
         :param seller_id: Identificador do vendedor.
         :param sku: Código do produto.
+        :param consistency: Consistência da leitura.
         :raises BadRequestException: Se já existir frete cadastrado.
         """
-        frete_encontrado = await self.repository.find_by_seller_id_and_sku(seller_id, sku)
+        frete_encontrado = await self.repository.find_by_seller_id_and_sku(seller_id, sku, consistency=consistency)
         if frete_encontrado is not None:
             raise FreteAlreadyExistsException(message="Frete para produto já cadastrado.", location="body", slug="frete_invalido", field="sku")
 
-    async def _validate_frete_nao_existe(self, seller_id: str, sku: str):
+    async def _validate_frete_nao_existe(
+        self, seller_id: str, sku: str, consistency: ReadConsistency = "primary", session: Any = None
+    ):
         """
         Verifica se não existe um frete para o seller_id e sku informados.
 
         :param seller_id: Identificador do vendedor.
         :param sku: Código do produto.
+        :param consistency: Consistência da leitura.
+        :param session: Sessão causal em que a leitura participa, se houver.
         :raises FreteNotFoundException: Se não existir frete cadastrado.
         """
         fretes_encontrados = await self.repository.find(
-            filters={"seller_id": seller_id, "sku": sku}
+            filters={"seller_id": seller_id, "sku": sku}, consistency=consistency, session=session
         )
 
         if fretes_encontrados is None:
@@ -1,3 +1,4 @@
 from .health_service import HealthCheckService
+from .readiness import Readiness
 
-__all__ = ["HealthCheckService"]
+__all__ = ["HealthCheckService", "Readiness"]
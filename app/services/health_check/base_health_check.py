@@ -1,9 +1,21 @@
+from typing import Any
+
 from app.settings import AppSettings
 
 
 class BaseHealthCheck:
-    def __init__(self, settings: AppSettings):
+    # Nome usado em HEALTH_CHECK_CHECKERS e no relatório
+    alias: str = ""
+    # Falha de um checker crítico tira a instância do balanceador; as demais só aparecem como alerta
+    critical: bool = False
+
+    def __init__(self, settings: AppSettings, **dependencies: Any):
         self.settings = settings
+        self.dependencies = dependencies
+
+    async def check_status(self) -> dict[str, Any] | None:
+        """
+        Implementa a checagem do serviço. Deve lançar uma HealthCheckException se falhar.
 
-    async def check_status(self):
-        """Implementa a checagem do serviço. Deve lançar uma HealthCheckException se falhar"""
+        :return: Detalhes opcionais exibidos no relatório (ex.: latência, uso).
+        """
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+from .base_health_check import BaseHealthCheck
+from .health_exceptions import ServiceUnavailable, ServiceWarning
+
+MEMINFO_PATH = Path("/proc/meminfo")
+CGROUP_MEMORY_MAX = Path("/sys/fs/cgroup/memory.max")
+CGROUP_MEMORY_CURRENT = Path("/sys/fs/cgroup/memory.current")
+MB = 1024 * 1024
+
+
+class MongoPingCheck(BaseHealthCheck):
+    """
+    `ping` no cluster de cada partição.
+    """
+
+    alias = "mongo"
+    critical = True
+
+    async def check_status(self) -> dict[str, Any]:
+        router = self.dependencies["partition_router"]
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(router.client(partition).ping() for partition in router.partitions), return_exceptions=True
+        )
+        failures = {
+            partition: repr(result)
+            for partition, result in zip(router.partitions, results)
+            if isinstance(result, Exception)
+        }
+        if failures:
+            raise ServiceUnavailable(f"Partições sem resposta: {failures}")
+        return {"partitions": len(router.partitions), "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+class MongoPoolCheck(BaseHealthCheck):
+    """
+    Conexões emprestadas em relação ao `maxPoolSize`, por servidor.
+    """
+
+    alias = "mongo_pool"
+
+    async def check_status(self) -> dict[str, Any]:
+        router = self.dependencies["partition_router"]
+        saturation: dict[str, float] = {}
+        for partition in router.partitions:
+            client = router.client(partition)
+            for address, in_use in client.pool_in_use().items():
+                if client.max_pool_size:
+                    saturation[address] = round(in_use / client.max_pool_size, 3)
+        limit = self.settings.health_check_mongo_pool_saturation_max
+        saturated = {address: value for address, value in saturation.items() if value >= limit}
+        if saturated:
+            raise ServiceWarning(f"Pool acima de {limit:.0%} de uso: {saturated}")
+        return {"saturation": saturation}
+
+
+class CacheCheck(BaseHealthCheck):
+    """
+    Ocupação dos caches em memória em relação aos limites configurados.
+    """
+
+    alias = "cache"
+
+    async def check_status(self) -> dict[str, Any]:
+        details = {}
+        for cache in self.dependencies.get("caches") or []:
+            details[cache.name] = {
+                "enabled": cache.enabled,
+                "entries": len(cache),
+                "bytes": cache.size_bytes,
+                "usage": round(cache.size_bytes / cache.max_bytes, 3) if cache.max_bytes else 0.0,
+            }
+        return details
+
+
+def _available_memory_mb() -> float | None:
+    # Em contêiner o limite que importa é o do cgroup, não o da máquina
+    try:
+        limit = CGROUP_MEMORY_MAX.read_text().strip()
+        if limit != "max":
+            return (int(limit) - int(CGROUP_MEMORY_CURRENT.read_text())) / MB
+    except (OSError, ValueError):
+        pass
+    try:
+        for line in MEMINFO_PATH.read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / MB
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+class MemoryCheck(BaseHealthCheck):
+    """
+    Memória disponível acima de `MEMORY_MIN` (MB).
+    """
+
+    alias = "memory"
+
+    async def check_status(self) -> dict[str, Any]:
+        available = _available_memory_mb()
+        if available is None:
+            return {"available_mb": None}
+        if available < self.settings.memory_min:
+            raise ServiceWarning(f"Memória disponível {available:.0f}MB abaixo de {self.settings.memory_min}MB")
+        return {"available_mb": round(available, 1)}
+
+
+class DiskCheck(BaseHealthCheck):
+    """
+    Uso do disco abaixo de `DISK_USAGE_MAX` (%).
+    """
+
+    alias = "disk"
+
+    async def check_status(self) -> dict[str, Any]:
+        usage = shutil.disk_usage(self.settings.health_check_disk_path)
+        percent = round(usage.used / usage.total * 100, 1)
+        if percent > self.settings.disk_usage_max:
+            raise ServiceWarning(f"Disco com {percent}% de uso, acima de {self.settings.disk_usage_max}%")
+        return {"usage_percent": percent}
+
+
+class EventLoopLagCheck(BaseHealthCheck):
+    """
+    Maior atraso do event loop desde a checagem anterior, medido pelo monitor contínuo; sem ele, o atraso para
+    voltar a esta corrotina depois de ceder a vez.
+    """
+
+    alias = "event_loop"
+
+    async def check_status(self) -> dict[str, Any]:
+        monitor = self.dependencies.get("event_loop_monitor")
+        if monitor is not None and monitor.running:
+            lag_ms = monitor.take_max_lag_ms()
+        else:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await asyncio.sleep(0)
+            lag_ms = round((loop.time() - started) * 1000, 2)
+        if lag_ms > self.settings.health_check_event_loop_lag_max_ms:
+            raise ServiceWarning(f"Event loop atrasado em {lag_ms}ms")
+        return {"lag_ms": lag_ms}
+
+
+CHECKERS: dict[str, type[BaseHealthCheck]] = {
+    checker.alias: checker
+    for checker in (MongoPingCheck, MongoPoolCheck, CacheCheck, MemoryCheck, DiskCheck, EventLoopLagCheck)
+}
@@ -1,21 +1,143 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
 from app.settings import AppSettings
 
 from .base_health_check import BaseHealthCheck
+from .checkers import CHECKERS
+from .health_exceptions import HealthCheckException, InvalidConfigurationException, ServiceWarning
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+WARNING = "warning"
+ERROR = "error"
+
+
+@dataclass
+class CheckResult:
+    alias: str
+    status: str
+    critical: bool
+    duration_ms: float
+    message: str | None = None
+    details: dict[str, Any] | None = None
+
+
+@dataclass
+class HealthReport:
+    checks: list[CheckResult] = field(default_factory=list)
+    checked_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    # Relógio monotônico da checagem, para saber a idade do relatório em cache
+    checked_monotonic: float = field(default_factory=time.monotonic)
+
+    @property
+    def is_healthy(self) -> bool:
+        """
+        Saudável enquanto nenhum checker crítico falhar; alertas não tiram a instância do balanceador.
+        """
+        return not any(check.critical and check.status == ERROR for check in self.checks)
+
+    @property
+    def status(self) -> str:
+        if not self.is_healthy:
+            return ERROR
+        return WARNING if any(check.status != OK for check in self.checks) else OK
 
 
 class HealthCheckService:
-    # Não pronto XXX
+    """
+    Executa os checkers configurados em paralelo, cada um com seu prazo, e mantém o último relatório em cache.
 
-    def __init__(self, checkers: set[str], settings: AppSettings) -> None:
-        self.checkers: dict[str, type[BaseHealthCheck]] = {}
+    Os probes do orquestrador leem o relatório em cache, renovado em segundo plano por `refresh_periodically`,
+    então a frequência dos probes não se traduz em comandos no MongoDB.
+    """
+
+    def __init__(self, checkers: set[str], settings: AppSettings, **dependencies: Any) -> None:
+        """
+        :param checkers: Aliases dos checkers habilitados (ver `CHECKERS`).
+        :param settings: Configurações da aplicação.
+        :param dependencies: Recursos verificados (ex.: `partition_router`, `caches`), repassados aos checkers.
+        """
+        self.checkers: dict[str, BaseHealthCheck] = {}
         self._settings = settings
+        self._dependencies = dependencies
+        self._report: HealthReport | None = None
+        self._refreshing: asyncio.Task | None = None
         self._set_checkers(checkers)
 
-    def _set_checkers(self, checkers: set[str]) -> None: ...
+    def _set_checkers(self, checkers: set[str]) -> None:
+        for alias in sorted(checkers or ()):
+            self.checkers[alias] = self._check_checker(alias)(self._settings, **self._dependencies)
+
+    def _check_checker(self, alias: str) -> type[BaseHealthCheck]:
+        if alias not in CHECKERS:
+            raise InvalidConfigurationException(f"Checker desconhecido: {alias}. Opções: {sorted(CHECKERS)}")
+        return CHECKERS[alias]
+
+    async def check_status(self, alias: str) -> CheckResult:
+        """
+        Executa um checker dentro do prazo; falhas viram resultado, nunca exceção.
+        """
+        checker = self.checkers[alias]
+        started = time.perf_counter()
+        status, message, details = OK, None, None
+        try:
+            details = await asyncio.wait_for(
+                checker.check_status(), timeout=self._settings.health_check_timeout_seconds
+            )
+        except TimeoutError:
+            status, message = ERROR, f"Sem resposta em {self._settings.health_check_timeout_seconds}s"
+        except ServiceWarning as exc:
+            status, message = WARNING, str(exc)
+        except HealthCheckException as exc:
+            status, message = ERROR, str(exc)
+        except Exception as exc:
+            status, message = ERROR, repr(exc)
+        if status == ERROR and not checker.critical:
+            status = WARNING
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        return CheckResult(alias, status, checker.critical, duration_ms, message, details)
+
+    async def run_checks(self) -> HealthReport:
+        results = await asyncio.gather(*(self.check_status(alias) for alias in self.checkers))
+        self._report = HealthReport(checks=list(results))
+        for result in results:
+            if result.status != OK:
+                logger.warning(f"Health check {result.alias}: {result.status} - {result.message}")
+        return self._report
+
+    @property
+    def _max_age(self) -> float:
+        # Folga do prazo dos checkers para a renovação em segundo plano terminar antes de o relatório vencer
+        return self._settings.health_check_interval_seconds + self._settings.health_check_timeout_seconds
 
-    def _check_checker(self, alias: str): ...
+    async def report(self) -> HealthReport:
+        """
+        Último relatório, se ainda estiver fresco; senão checa de novo. Probes simultâneos com o relatório
+        vencido aguardam a mesma execução.
+        """
+        report = self._report
+        if report is not None and time.monotonic() - report.checked_monotonic < self._max_age:
+            return report
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self.run_checks())
+        return await asyncio.shield(self._refreshing)
 
-    async def check_status(self, alias: str) -> None: ...
+    async def refresh_periodically(self) -> None:
+        """
+        Laço de renovação do relatório; roda enquanto a aplicação estiver no ar.
+        """
+        while True:
+            try:
+                await self.run_checks()
+            except Exception as exc:
+                logger.warning(f"Falha ao executar os health checks: {exc!r}")
+            await asyncio.sleep(self._settings.health_check_interval_seconds)
 
 
-__all__ = ["HealthCheckService"]
+__all__ = ["CheckResult", "HealthCheckService", "HealthReport"]
@@ -0,0 +1,28 @@
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Readiness:
+    """
+    Estado de prontidão da instância para receber tráfego.
+
+    Começa em `warming` e passa a `ready` quando o aquecimento termina ou estoura o prazo; a liveness (`/ping`)
+    não depende disso.
+    """
+
+    status: str = "warming"
+    warmed_keys: int = 0
+    timed_out: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+    duration_seconds: float | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == "ready"
+
+    def mark_ready(self, warmed_keys: int = 0, timed_out: bool = False) -> None:
+        self.status = "ready"
+        self.warmed_keys = warmed_keys
+        self.timed_out = timed_out
+        self.duration_seconds = round(time.monotonic() - self.started_at, 3)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from .app import AppSettings
 
@@ -32,11 +32,62 @@ class ApiSettings(AppSettings):
         title="Caminho para o health check. A partir dele haverão dois recursos: ping e health",
     )
 
+    metrics_enabled: bool = Field(default=True, title="Habilita a coleta de métricas HTTP no formato Prometheus")
+
+    metrics_path: str = Field(default="/metrics", title="Caminho para exportar as métricas da aplicação")
+
+    admin_enabled: bool = Field(
+        default=False, title="Habilita os recursos administrativos (chaves quentes etc.); exige o ADMIN_TOKEN"
+    )
+
+    admin_base_path: str = Field(default="/admin", title="Caminho base dos recursos administrativos")
+
+    admin_token: str | None = Field(
+        default=None, title="Token exigido no cabeçalho x-admin-token pelos recursos administrativos"
+    )
+
+    server_timing_enabled: bool = Field(
+        default=False,
+        title="Devolve o cabeçalho Server-Timing nas requisições amostradas ou com x-server-timing e x-admin-token",
+    )
+
+    server_timing_sample_rate: float = Field(
+        default=0.01, ge=0, le=1, title="Fração das requisições medidas por etapa para o cabeçalho Server-Timing"
+    )
+
+    profiling_enabled: bool = Field(
+        default=False,
+        title="Aceita o cabeçalho x-profile (cpu, memory), junto do x-admin-token, para gerar o perfil de uma "
+        "requisição; exige o ADMIN_TOKEN",
+    )
+
+    profiling_max_session_seconds: float = Field(
+        default=60, gt=0, title="Duração máxima de uma sessão de profiling do processo"
+    )
+
+    deadline_header: str = Field(
+        default="x-request-timeout-ms",
+        title="Cabeçalho com o tempo, em ms, que quem chama espera pela resposta; vira o prazo da requisição",
+    )
+
+    deadline_default_ms: int | None = Field(
+        default=None, gt=0, title="Prazo das requisições sem o cabeçalho, em ms; sem valor, não há prazo"
+    )
+
+    deadline_routes: dict[str, int] = Field(
+        default={},
+        title="Prazo padrão, em ms, por template de rota (ex.: /seller/v2/fretes/{sku}), no lugar do geral",
+    )
+
+    deadline_max_ms: int = Field(default=30000, gt=0, title="Maior prazo aceito no cabeçalho, em ms")
+
     cors_origins: list[str] = Field(default=["*"], title="Origens permitidas para CORS")
 
+    access_log_enabled: bool = Field(default=True, title="Emite uma linha de log por requisição")
+
     access_log_ignored_urls: set[str] | None = Field(
         default=None,
-        title="URLs da API que não devem ter o log de acesso emitido",
+        title="URLs da API que não devem ter o log de acesso emitido; sem valor, ignora os probes e as métricas",
     )
 
     access_log_headers_to_log: set[str] | None = Field(
@@ -49,6 +100,27 @@ class ApiSettings(AppSettings):
         title="Headers que devem ser ofuscados no log de requisições",
     )
 
+    log_level: str = Field(default="INFO", title="Nível mínimo dos logs da aplicação")
+
+    log_json: bool = Field(default=True, title="Emite os logs em JSON, um registro por linha")
+
+    log_request_body: bool = Field(
+        default=False, title="Inclui o corpo da requisição nos logs de erro; desligado por poder conter dados pessoais"
+    )
+
+    log_request_body_max_bytes: int = Field(default=2048, title="Bytes do corpo da requisição mantidos nos logs")
+
+    error_log_sample_first: int = Field(
+        default=10,
+        title="Ocorrências de cada erro de negócio (por slug) registradas por janela antes de amostrar; 0 desliga",
+    )
+
+    error_log_sample_every: int = Field(
+        default=100, title="Depois das primeiras, registra uma a cada tantas ocorrências do mesmo slug"
+    )
+
+    error_log_sample_window_seconds: float = Field(default=60, title="Janela da amostragem de erros de negócio")
+
     pagination: PaginationConfig = Field(default=PaginationConfig(), description="Configurações de paginação")
 
     filter_config: FilterConfig = Field(default=FilterConfig(), description="Configurações de filtros")
@@ -57,6 +129,16 @@ class ApiSettings(AppSettings):
 
     enable_channel_resources: bool = Field(default=True, description="Habilita Recursos de APIs do contexto de Canal")
 
+    @model_validator(mode="after")
+    def _require_admin_token(self) -> "ApiSettings":
+        # Os recursos administrativos listam os sellers e skus mais consultados: sem token, a aplicação não sobe
+        if self.admin_enabled and not self.admin_token:
+            raise ValueError("ADMIN_ENABLED exige ADMIN_TOKEN")
+        # O profiling liga o tracemalloc e reduz o switch interval do processo inteiro: nunca sem token
+        if self.profiling_enabled and not self.admin_token:
+            raise ValueError("PROFILING_ENABLED exige ADMIN_TOKEN")
+        return self
+
     @property
     def server_reload(self) -> bool:  # pragma: no cover
         return self.env.is_development()
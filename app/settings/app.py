@@ -1,9 +1,17 @@
+from typing import Any, Literal
+
 from pydantic import Field
 from pydantic import Field, MongoDsn
 from pydantic_settings import SettingsConfigDict
 
 from .base import BaseSettings
 
+MongoCompressor = Literal["zstd", "zlib"]
+MongoReadPreference = Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"]
+ReadConsistency = Literal["primary", "secondary_preferred", "causal"]
+HttpCompressor = Literal["zstd", "br", "gzip"]
+HttpCompressionProfile = Literal["off", "fast", "balanced", "small"]
+
 class AppSettings(BaseSettings):
     model_config = SettingsConfigDict(extra="ignore", case_sensitive=False)
     version: str = Field("0.2.1", description="Versão da aplicação")
@@ -15,8 +23,241 @@ class AppSettings(BaseSettings):
         description="Microsserviço responsável por gerenciar os valores do frete",
     )
 
+    mongo_driver: Literal["pymongo", "motor"] = Field(
+        default="pymongo", title="Driver do MongoDB: pymongo (asyncio nativo) ou motor (pool de threads)"
+    )
+    mongo_monitoring_enabled: bool = Field(
+        default=True, title="Registra métricas de comandos e do pool de conexões do MongoDB"
+    )
+    mongo_slow_query_ms: int = Field(
+        default=100, title="Tempo em milissegundos a partir do qual um comando no MongoDB é logado como lento"
+    )
+
+    # Opções do cliente. Quando não informadas vale o que estiver na URI ou o padrão do driver.
+    mongo_max_pool_size: int | None = Field(default=None, ge=1, title="maxPoolSize (padrão do driver: 100)")
+    mongo_min_pool_size: int | None = Field(default=None, ge=0, title="minPoolSize (padrão do driver: 0)")
+    mongo_max_idle_time_ms: int | None = Field(
+        default=None, ge=0, title="maxIdleTimeMS: tempo ocioso até fechar uma conexão do pool"
+    )
+    mongo_wait_queue_timeout_ms: int | None = Field(
+        default=None, ge=0, title="waitQueueTimeoutMS: espera máxima por uma conexão livre no pool"
+    )
+    mongo_server_selection_timeout_ms: int | None = Field(
+        default=None, ge=0, title="serverSelectionTimeoutMS (padrão do driver: 30000)"
+    )
+    mongo_connect_timeout_ms: int | None = Field(default=None, ge=0, title="connectTimeoutMS")
+    mongo_socket_timeout_ms: int | None = Field(default=None, ge=0, title="socketTimeoutMS")
+    mongo_compressors: list[MongoCompressor] | None = Field(
+        default=None, title="Compressão de protocolo em ordem de preferência (zstd, zlib)"
+    )
+    mongo_zlib_compression_level: int | None = Field(default=None, ge=-1, le=9, title="Nível de compressão zlib")
+    mongo_read_preference: MongoReadPreference | None = Field(default=None, title="readPreference padrão")
+    mongo_max_staleness_seconds: int = Field(
+        default=90,
+        ge=90,
+        title="Atraso máximo aceito nas leituras em secundários (o MongoDB exige no mínimo 90 segundos)",
+    )
+    frete_read_consistency: dict[str, ReadConsistency] = Field(
+        # Tudo do primário por padrão: ler de secundários (ex.: `{"find_all": "secondary_preferred"}`) aceita ver a
+        # listagem atrasada em relação às escritas e é uma escolha explícita de quem opera a aplicação
+        default={
+            "find_all": "primary",
+            "find_by_seller_id_and_sku": "primary",
+            "create_frete": "primary",
+            # A leitura que antecede a escrita vem do primário: uma versão atrasada de um secundário faria a escrita
+            # condicionada falhar e ser refeita à toa, e uma sessão causal nova não garante ler escritas de outras
+            # requisições
+            "update_frete_value": "primary",
+            "replace_frete": "primary",
+            "delete_by_seller_id_and_sku": "primary",
+        },
+        title="Consistência de leitura por método do FreteService (primary, secondary_preferred ou causal)",
+    )
+    mongo_pool_prewarm: bool = Field(
+        default=True, title="Espera as minPoolSize conexões de cada servidor antes de atender requisições"
+    )
+    mongo_pool_prewarm_timeout_ms: int = Field(
+        default=5000, ge=0, title="Tempo máximo aguardando o pré-aquecimento do pool na inicialização"
+    )
+
+    # Cache das páginas da listagem de fretes, por instância da API
+    frete_list_cache_max_entries: int = Field(
+        default=10_000, ge=0, title="Páginas da listagem de fretes mantidas em cache (0 desabilita o cache)"
+    )
+    frete_list_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, ge=0, title="Memória máxima, em bytes, das páginas da listagem em cache"
+    )
+    frete_list_cache_ttl_seconds: float = Field(
+        default=5,
+        gt=0,
+        title="Validade das páginas em cache; limita o atraso para enxergar escritas feitas em outras instâncias",
+    )
+
+    # Cache das respostas serializadas do frete por sku, por instância da API
+    frete_item_cache_max_entries: int = Field(
+        default=50_000, ge=0, title="Respostas do frete por sku mantidas em cache (0 desabilita o cache)"
+    )
+    frete_item_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024, ge=0, title="Memória máxima, em bytes, das respostas do frete por sku em cache"
+    )
+    frete_item_cache_ttl_seconds: float = Field(
+        default=5,
+        gt=0,
+        title="Validade das respostas em cache; limita o atraso para enxergar escritas feitas em outras instâncias",
+    )
+
+    # Chaves (seller_id, sku) mais consultadas, por instância da API
+    frete_hot_keys_capacity: int = Field(
+        default=1000, ge=0, title="Quantas chaves quentes do frete por sku acompanhar (0 desliga a contagem)"
+    )
+    frete_hot_keys_window: int = Field(
+        default=100_000, ge=1, title="Consultas entre cada decaimento pela metade das contagens das chaves quentes"
+    )
+    frete_hot_keys_snapshot_seconds: float = Field(
+        default=60, gt=0, title="Intervalo entre as gravações do retrato das chaves quentes no MongoDB"
+    )
+
+    # Agrupamento das escritas (group commit) do PATCH sem If-Match
+    frete_write_batching_enabled: bool = Field(
+        default=False,
+        title="Agrupa os PATCH sem If-Match da mesma janela num único bulk_write, fundindo os do mesmo frete",
+    )
+    frete_write_batch_window_ms: float = Field(
+        default=2, gt=0, title="Espera máxima, em ms, a partir da primeira escrita do lote antes de enviá-lo"
+    )
+    frete_write_batch_max_size: int = Field(
+        default=500, ge=1, title="Fretes distintos no lote que o enviam na hora, sem esperar a janela"
+    )
+
+    # Feed de mudanças dos fretes (GET /seller/v2/frete-changes)
+    frete_changes_settle_ms: int = Field(
+        default=2000,
+        ge=0,
+        title="Idade mínima, em ms, das mudanças entregues no feed; cobre as escritas confirmadas depois do horário",
+    )
+    frete_changes_retention_days: int = Field(
+        default=30,
+        ge=1,
+        title="Dias em que as remoções ficam no feed; tokens mais antigos recebem 410 e o consumidor refaz a carga",
+    )
+    frete_changes_max_limit: int = Field(default=1000, ge=1, title="Máximo de mudanças por chamada ao feed")
+
+    # Aquecimento do cache na inicialização, antes de a instância se declarar pronta
+    frete_warmup_keys: int = Field(
+        default=1000, ge=0, title="Chaves quentes do último retrato pré-carregadas no cache (0 desliga)"
+    )
+    frete_warmup_concurrency: int = Field(default=16, ge=1, title="Consultas simultâneas durante o aquecimento")
+    frete_warmup_timeout_seconds: float = Field(
+        default=30, gt=0, title="Prazo do aquecimento; ao estourar, a instância fica pronta com o que já carregou"
+    )
+
+    # Particionamento dos sellers entre clusters. Sem partições extras tudo fica no cluster principal.
+    mongo_partitions: dict[str, MongoDsn] = Field(
+        default={}, title="Clusters adicionais (nome -> URI); o cluster de APP_DB_URL_MONGO é a partição `default`"
+    )
+    mongo_partition_overrides: dict[str, str] = Field(
+        default={}, title="Partição fixa por seller_id (sellers gigantes), com precedência sobre o hash consistente"
+    )
+    mongo_partition_vnodes: int = Field(default=128, ge=1, title="Nós virtuais por partição no anel de hash")
+    mongo_partition_refresh_seconds: int = Field(
+        default=30, ge=1, title="Intervalo de recarga da tabela de sellers realocados pelo rebalanceamento"
+    )
+
     memory_min: int = Field(default=64, title="Limite mínimo de memória disponível em MB")
     disk_usage_max: int = Field(default=80, title="Limite máximo de 80% de uso de disco")
 
+    # Health checks
+    health_check_checkers: set[str] = Field(
+        default={"mongo", "mongo_pool", "cache", "memory", "disk", "event_loop"},
+        title="Checkers executados pelo health check (mongo, mongo_pool, cache, memory, disk, event_loop)",
+    )
+    health_check_timeout_seconds: float = Field(default=2, gt=0, title="Prazo de cada checker")
+    health_check_interval_seconds: float = Field(
+        default=5, gt=0, title="Intervalo de renovação do relatório em cache lido pelos probes"
+    )
+    health_check_mongo_pool_saturation_max: float = Field(
+        default=0.9, gt=0, le=1, title="Fração do maxPoolSize em uso a partir da qual o pool é considerado saturado"
+    )
+    health_check_event_loop_lag_max_ms: float = Field(
+        default=250, gt=0, title="Atraso do event loop, em ms, a partir do qual o health check alerta"
+    )
+    health_check_disk_path: str = Field(default="/", title="Caminho cujo disco é verificado")
+
+    # Event loop
+    event_loop_monitor_interval_ms: float = Field(
+        default=100, ge=0, title="Intervalo da medição contínua do atraso do event loop; 0 desliga o monitor"
+    )
+    event_loop_blocked_threshold_ms: float = Field(
+        default=200, gt=0, title="Tempo com o event loop travado a partir do qual a pilha de quem o bloqueia é logada"
+    )
+    event_loop_debug: bool = Field(
+        default=False,
+        title="Modo debug do asyncio: avisa das callbacks mais lentas que o limite de bloqueio (só para diagnóstico)",
+    )
+
+    # Profiling sob demanda
+    profiling_interval_ms: float = Field(
+        default=1, gt=0, title="Intervalo de amostragem do perfil de CPU por requisição"
+    )
+    profiling_max_profiles: int = Field(default=50, ge=1, title="Perfis mantidos em memória para download")
+
+    # Compressão das respostas HTTP
+    compression_enabled: bool = Field(default=True, title="Comprime as respostas conforme o Accept-Encoding")
+    compression_codecs: list[HttpCompressor] = Field(
+        default=["zstd", "br", "gzip"], title="Algoritmos de compressão das respostas em ordem de preferência"
+    )
+    compression_min_size: int = Field(
+        default=1000, ge=0, title="Tamanho mínimo, em bytes, de uma resposta para ser comprimida"
+    )
+    compression_large_size: int = Field(
+        default=256 * 1024,
+        gt=0,
+        title="A partir deste tamanho, em bytes, a resposta usa o nível mais rápido de compressão",
+    )
+    compression_routes: dict[str, HttpCompressionProfile] = Field(
+        default={},
+        title="Perfil de compressão fixo por template de rota (off, fast, balanced, small), no lugar do automático",
+    )
+
+    # Controle de admissão das rotas de fretes
+    load_shedding_enabled: bool = Field(
+        default=True, title="Recusa na hora (503/429) as requisições acima do limite adaptativo de concorrência"
+    )
+    load_shedding_initial_limit: int = Field(default=50, ge=1, title="Limite de requisições simultâneas ao subir")
+    load_shedding_min_limit: int = Field(default=10, ge=1, title="Piso do limite adaptativo de concorrência")
+    load_shedding_max_limit: int = Field(default=500, ge=1, title="Teto do limite adaptativo de concorrência")
+    load_shedding_tolerance: float = Field(
+        default=1.5, ge=1, title="Quanto a latência recente pode passar da de referência antes de o limite encolher"
+    )
+    load_shedding_seller_burst_seconds: float = Field(
+        default=1, gt=0, title="Rajada tolerada por seller, em segundos da sua parte da vazão"
+    )
+    load_shedding_seller_window_seconds: float = Field(
+        default=10, gt=0, title="Tempo sem requisições até o seller deixar de contar na divisão da vazão"
+    )
+    load_shedding_max_sellers: int = Field(default=10_000, ge=1, title="Sellers acompanhados na divisão da vazão")
+    load_shedding_retry_after_seconds: int = Field(
+        default=1, ge=1, title="Retry-After das recusas por sobrecarga (503)"
+    )
+
+    @property
+    def mongo_client_options(self) -> dict[str, Any]:
+        """
+        Opções do cliente do MongoDB no formato do driver, somente as que foram configuradas.
+        """
+        options = {
+            "maxPoolSize": self.mongo_max_pool_size,
+            "minPoolSize": self.mongo_min_pool_size,
+            "maxIdleTimeMS": self.mongo_max_idle_time_ms,
+            "waitQueueTimeoutMS": self.mongo_wait_queue_timeout_ms,
+            "serverSelectionTimeoutMS": self.mongo_server_selection_timeout_ms,
+            "connectTimeoutMS": self.mongo_connect_timeout_ms,
+            "socketTimeoutMS": self.mongo_socket_timeout_ms,
+            "compressors": ",".join(self.mongo_compressors) if self.mongo_compressors else None,
+            "zlibCompressionLevel": self.mongo_zlib_compression_level,
+            "readPreference": self.mongo_read_preference,
+        }
+        return {key: value for key, value in options.items() if value is not None}
+
 
 settings = AppSettings()
@@ -0,0 +1,40 @@
+"""
+Backfill do campo `version` nos fretes gravados antes do controle de concorrência otimista.
+
+Roda com a aplicação no ar: os documentos são atualizados em lotes pequenos, com pausa entre eles, e o filtro
+`version` ausente torna a migração idempotente e segura contra escritas concorrentes (um frete atualizado pela
+API no meio do caminho já terá `version` e não é tocado). Com particionamento, rodar uma vez por cluster.
+
+    mongodb-migrate --migrations migrations --url "$APP_DB_URL_MONGO"
+
+Ajustes: MIGRATION_BATCH_SIZE (padrão 500) e MIGRATION_BATCH_PAUSE_MS (padrão 100).
+"""
+
+import os
+import time
+
+from mongodb_migrations.base import BaseMigration
+
+COLLECTION_NAME = "fretes"
+INITIAL_VERSION = 1
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "500"))
+BATCH_PAUSE_SECONDS = int(os.getenv("MIGRATION_BATCH_PAUSE_MS", "100")) / 1000
+
+
+class Migration(BaseMigration):
+    def upgrade(self):
+        collection = self.db[COLLECTION_NAME]
+        missing = {"version": {"$exists": False}}
+        updated = 0
+        while True:
+            ids = [document["_id"] for document in collection.find(missing, {"_id": 1}).limit(BATCH_SIZE)]
+            if not ids:
+                break
+            result = collection.update_many({"_id": {"$in": ids}, **missing}, {"$set": {"version": INITIAL_VERSION}})
+            updated += result.modified_count
+            print(f"{updated} fretes com version preenchida")
+            time.sleep(BATCH_PAUSE_SECONDS)
+
+    def downgrade(self):
+        # O campo é lido com padrão INITIAL_VERSION quando ausente; remover é seguro
+        self.db[COLLECTION_NAME].update_many({}, {"$unset": {"version": ""}})
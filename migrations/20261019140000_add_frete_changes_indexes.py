@@ -0,0 +1,54 @@
+"""
+Índices do feed de mudanças dos fretes (GET /seller/v2/frete-changes).
+
+`fretes` ganha `(seller_id, updated_at, _id)`, a ordem em que o feed entrega os fretes gravados, e a coleção
+`frete_tombstones`, com as remoções, ganha o equivalente em `deleted_at` e o TTL que descarta as remoções depois da
+retenção. Os fretes criados sem `updated_at` (antes de o campo ser preenchido na criação) recebem o `created_at`,
+em lotes pequenos como na migração da `version`; sem isso ficariam fora do feed. Com particionamento, rodar uma vez
+por cluster.
+
+    mongodb-migrate --migrations migrations --url "$APP_DB_URL_MONGO"
+
+Ajustes: FRETE_CHANGES_RETENTION_DAYS (padrão 30), o mesmo valor usado pela API para recusar tokens antigos,
+MIGRATION_BATCH_SIZE (padrão 500) e MIGRATION_BATCH_PAUSE_MS (padrão 100).
+"""
+
+import os
+import time
+
+from mongodb_migrations.base import BaseMigration
+
+COLLECTION_NAME = "fretes"
+TOMBSTONES_COLLECTION_NAME = "frete_tombstones"
+CHANGES_INDEX = "seller_id_updated_at_id"
+TOMBSTONES_INDEX = "seller_id_deleted_at_id"
+TOMBSTONES_TTL_INDEX = "deleted_at_ttl"
+RETENTION_SECONDS = int(os.getenv("FRETE_CHANGES_RETENTION_DAYS", "30")) * 24 * 60 * 60
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "500"))
+BATCH_PAUSE_SECONDS = int(os.getenv("MIGRATION_BATCH_PAUSE_MS", "100")) / 1000
+
+
+class Migration(BaseMigration):
+    def upgrade(self):
+        collection = self.db[COLLECTION_NAME]
+        missing = {"updated_at": None}
+        updated = 0
+        while True:
+            ids = [document["_id"] for document in collection.find(missing, {"_id": 1}).limit(BATCH_SIZE)]
+            if not ids:
+                break
+            # Sem `created_at` também, vale a data da migração: o frete ainda precisa de uma posição no feed
+            backfill = [{"$set": {"updated_at": {"$ifNull": ["$created_at", "$$NOW"]}}}]
+            result = collection.update_many({"_id": {"$in": ids}, **missing}, backfill)
+            updated += result.modified_count
+            print(f"{updated} fretes com updated_at preenchido")
+            time.sleep(BATCH_PAUSE_SECONDS)
+
+        collection.create_index([("seller_id", 1), ("updated_at", 1), ("_id", 1)], name=CHANGES_INDEX)
+        tombstones = self.db[TOMBSTONES_COLLECTION_NAME]
+        tombstones.create_index([("seller_id", 1), ("deleted_at", 1), ("_id", 1)], name=TOMBSTONES_INDEX)
+        tombstones.create_index("deleted_at", name=TOMBSTONES_TTL_INDEX, expireAfterSeconds=RETENTION_SECONDS)
+
+    def downgrade(self):
+        self.db[COLLECTION_NAME].drop_index(CHANGES_INDEX)
+        self.db[TOMBSTONES_COLLECTION_NAME].drop()
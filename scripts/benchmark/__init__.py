@@ -0,0 +1,4 @@
+from .report import BenchmarkReport, ScenarioResult, find_regressions
+from .runner import run_benchmark, run_scenario
+
+__all__ = ["BenchmarkReport", "ScenarioResult", "find_regressions", "run_benchmark", "run_scenario"]
@@ -0,0 +1,108 @@
+"""
+Suíte de benchmark dos caminhos quentes da API de fretes.
+
+Exemplos:
+
+    ENV=dev python -m scripts.benchmark --backend memory
+    ENV=dev python -m scripts.benchmark --backend mongo --save-baseline
+    ENV=dev python -m scripts.benchmark --target-url http://localhost:8000 --concurrency 50
+    ENV=dev python -m scripts.benchmark --scenarios replay --dataset devtools/dataset/fretes.jsonl
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from app.common.log import configure_logging
+
+from .report import BenchmarkReport, find_regressions
+from .runner import run_benchmark
+from .scenarios import DEFAULT_SCENARIOS
+
+BASELINE_DIR = Path("devtools/benchmark/baselines")
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scripts.benchmark", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backend", choices=("memory", "mongo"), default="memory")
+    parser.add_argument("--target-url", help="Gera carga contra um servidor em execução em vez de usar ASGI")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_SCENARIOS), help="Cenários separados por vírgula")
+    parser.add_argument("--requests", type=int, default=1000, help="Requisições medidas por cenário")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=50, help="Requisições de aquecimento por cenário")
+    parser.add_argument("--dataset", type=Path, help="Massa de scripts.dataset carregada antes (só em processo)")
+    parser.add_argument("--trace", type=Path, help="Trace usado pelo cenário replay (padrão: devtools/dataset)")
+    parser.add_argument("--output", type=Path, help="Arquivo JSON com o resultado desta execução")
+    parser.add_argument(
+        "--log-output",
+        type=Path,
+        help="Grava os logs da aplicação neste arquivo em vez de descartá-los (só em processo)",
+    )
+    parser.add_argument("--baseline", type=Path, help="Baseline a comparar (padrão: por backend e modo)")
+    parser.add_argument("--save-baseline", action="store_true", help="Grava o resultado como nova baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=15.0,
+        help="Regressão máxima aceita, em %%, para p95/p99 e vazão antes de falhar",
+    )
+    return parser.parse_args(argv)
+
+
+def _default_baseline(report: BenchmarkReport) -> Path:
+    return BASELINE_DIR / f"{report.backend}-{report.mode}.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.log_output:
+        # Mede com o pipeline de logs ligado, escrevendo num arquivo para não misturar com a tabela
+        configure_logging(stream=args.log_output.open("a", encoding="utf-8"))
+        # O cliente de carga registra cada requisição em INFO; só os logs da aplicação interessam
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+    else:
+        # Os logs de negócio (404, validação) poluem a medição
+        logging.disable(logging.WARNING)
+
+    report = asyncio.run(
+        run_benchmark(
+            scenario_names=[name.strip() for name in args.scenarios.split(",") if name.strip()],
+            backend=args.backend,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            warmup=args.warmup,
+            target_url=args.target_url,
+            dataset_path=args.dataset,
+            trace_path=args.trace,
+        )
+    )
+    print(report.format_table())
+
+    if args.output:
+        report.save(args.output)
+
+    baseline_path = args.baseline or _default_baseline(report)
+    if args.save_baseline:
+        report.save(baseline_path)
+        print(f"Baseline gravada em {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"Sem baseline em {baseline_path}, comparação ignorada.")
+        return 0
+
+    regressions = find_regressions(report, BenchmarkReport.load(baseline_path), args.threshold)
+    if regressions:
+        print(f"Regressões acima de {args.threshold}% em relação a {baseline_path}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print(f"Sem regressões acima de {args.threshold}% em relação a {baseline_path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
+from unittest import mock
+
+import httpx
+from dependency_injector import providers
+from fastapi import FastAPI
+
+from app.integrations.database.mongo_client import MongoClient, MongoDB
+from scripts.dataset.generator import read_jsonl
+from scripts.dataset.loader import bulk_load
+
+BENCH_BASE_URL = "http://benchmark"
+BENCH_DB_NAME = "pc_frete_bench"
+
+
+class MemoryMongoClient(MongoClient):
+    """
+    MongoClient em memória (mongomock) para medir o custo da aplicação sem o banco.
+
+    O mongomock não suporta os codecs customizados, então o banco é devolvido sem eles. Use-o dentro de
+    `mongomock_without_bson_validation`.
+    """
+
+    def __init__(self):
+        from mongomock_motor import AsyncMongoMockClient
+
+        self.mongo_url = None
+        self.driver = "motor"
+        self.driver_client = AsyncMongoMockClient()
+
+    @property
+    def min_pool_size(self) -> int:
+        return 0
+
+    def get_database(self, db_name: str) -> MongoDB:
+        return MongoDB(self.driver_client.get_database(db_name))
+
+    @property
+    def supports_transactions(self) -> bool:
+        return False
+
+    @asynccontextmanager
+    async def start_session(self, causal_consistency: bool = True) -> AsyncIterator[Any]:
+        # O mongomock não tem sessões; as operações rodam sem elas
+        yield None
+
+
+@contextmanager
+def mongomock_without_bson_validation() -> Iterator[None]:
+    """
+    Desliga, enquanto durar o bloco, a validação que o mongomock faz de cada documento com o codec padrão do bson,
+    que recusa UUID nativo (o cliente real usa UuidRepresentation.STANDARD). Os documentos ficam em memória, sem
+    serialização.
+    """
+    import mongomock.collection
+
+    with mock.patch.object(mongomock.collection, "BSON", None):
+        yield
+
+
+def build_app(backend: str, db_name: str = BENCH_DB_NAME) -> FastAPI:
+    """
+    Cria uma instância nova da API apontando para o backend informado.
+
+    :param backend: `memory` (mongomock) ou `mongo` (mongod configurado em APP_DB_URL_MONGO).
+    :param db_name: Banco utilizado pelo benchmark, nunca o banco padrão da aplicação.
+    """
+    from app.api_main import init
+
+    app = init()
+    container = app.container  # type: ignore[attr-defined]
+    container.config.MONGO_DB.override(db_name)
+    # Em processo o gerador de carga divide o event loop com a API: a latência cresce com a concorrência do próprio
+    # benchmark e o controle de admissão recusaria as requisições medidas. Com --target-url ele segue ligado.
+    container.config.load_shedding_enabled.override(False)
+    if backend == "memory":
+        container.mongo_client.override(providers.Object(MemoryMongoClient()))
+    elif backend != "mongo":
+        raise ValueError(f"Backend desconhecido: {backend}")
+    return app
+
+
+async def reset_database(app: FastAPI, dataset_path: Path | None = None) -> None:
+    """
+    Remove os dados de execuções anteriores do banco de benchmark e, opcionalmente, carrega a massa sintética.
+    """
+    repository = app.container.frete_repository()  # type: ignore[attr-defined]
+    for collection in repository.partition_collections().values():
+        await collection.delete_many({})
+    if dataset_path:
+        await bulk_load(repository.router, repository.COLLECTION_NAME, read_jsonl(dataset_path))
+
+
+@asynccontextmanager
+async def in_process_client(
+    backend: str,
+    db_name: str = BENCH_DB_NAME,
+    dataset_path: Path | None = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Cliente httpx falando direto com a aplicação via ASGI, sem rede nem servidor.
+    """
+    app = build_app(backend, db_name)
+    memory_patch = mongomock_without_bson_validation() if backend == "memory" else nullcontext()
+    with memory_patch:
+        async with app.router.lifespan_context(app):
+            await reset_database(app, dataset_path)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url=BENCH_BASE_URL) as client:
+                yield client
+
+
+@asynccontextmanager
+async def remote_client(target_url: str, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Cliente httpx para gerar carga contra uma instância já em execução (uvicorn, docker, staging).
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=target_url, limits=limits, timeout=30) as client:
+        yield client
@@ -0,0 +1,126 @@
+"""
+Custo de CPU contra bytes economizados de cada algoritmo e perfil de compressão das respostas.
+
+Os corpos medidos são gerados pela própria API (backend em memória): um frete por sku, uma página da listagem e
+uma exportação em NDJSON com todos os fretes criados.
+
+Exemplos:
+
+    ENV=dev python -m scripts.benchmark.compression
+    ENV=dev python -m scripts.benchmark.compression --export-rows 5000 --output /tmp/compressao.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+from app.common.compression import Codec, CompressionProfile, available_codecs
+
+from .backends import in_process_client
+from .scenarios import FRETES_PATH, seller_headers
+
+PROFILES: tuple[CompressionProfile, ...] = ("fast", "balanced", "small")
+BENCH_SELLER = "seller-compression"
+PAGE_LIMIT = 50
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m scripts.benchmark.compression", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--export-rows", type=int, default=1000, help="Fretes criados e exportados")
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="Tempo mínimo medido por combinação")
+    parser.add_argument("--output", type=Path, help="Arquivo JSON com o resultado")
+    return parser.parse_args(argv)
+
+
+async def build_payloads(export_rows: int) -> dict[str, bytes]:
+    """
+    Corpos sem compressão, como a API os envia.
+    """
+    headers = {**seller_headers(BENCH_SELLER), "accept-encoding": "identity"}
+    async with in_process_client("memory") as client:
+        for index in range(export_rows):
+            response = await client.post(
+                FRETES_PATH, json={"sku": f"sku-{index:06d}", "valor": 990 + index * 37 % 9000}, headers=headers
+            )
+            response.raise_for_status()
+        page = await client.get(FRETES_PATH, params={"_limit": PAGE_LIMIT}, headers=headers)
+        page.raise_for_status()
+        # A listagem não pagina além das primeiras páginas: a exportação junta os fretes um a um
+        rows = []
+        for index in range(export_rows):
+            item = await client.get(f"{FRETES_PATH}/sku-{index:06d}", headers=headers)
+            item.raise_for_status()
+            rows.append(item.content)
+    return {"item": rows[0], "page": page.content, "export": b"\n".join(rows) + b"\n"}
+
+
+def _measure(codec: Codec, level: int, payload: bytes, min_seconds: float) -> tuple[float, int]:
+    """
+    Mediana do tempo de uma compressão, em ms, e o tamanho comprimido.
+    """
+    timings: list[float] = []
+    deadline = time.perf_counter() + min_seconds
+    while len(timings) < 5 or time.perf_counter() < deadline:
+        started = time.perf_counter()
+        compressed = codec.compress(payload, level)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, len(compressed)
+
+
+def run(payloads: dict[str, bytes], min_seconds: float) -> Iterator[dict]:
+    for name, payload in payloads.items():
+        for codec in available_codecs().values():
+            for profile in PROFILES:
+                level = codec.level(profile)
+                cpu_ms, size = _measure(codec, level, payload, min_seconds)
+                yield {
+                    "payload": name,
+                    "raw_bytes": len(payload),
+                    "encoding": codec.name,
+                    "profile": profile,
+                    "level": level,
+                    "cpu_ms": round(cpu_ms, 4),
+                    "bytes": size,
+                    "ratio": round(len(payload) / size, 2),
+                    # Bytes economizados por ms de CPU: a troca que a política de níveis tenta maximizar
+                    "saved_kb_per_cpu_ms": round((len(payload) - size) / 1024 / cpu_ms, 1) if cpu_ms else 0.0,
+                }
+
+
+def format_table(results: list[dict]) -> str:
+    header = (
+        f"{'corpo':<8} {'bytes':>9} {'algoritmo':<9} {'perfil':<9} {'nível':>5} {'cpu ms':>9} {'comprimido':>10}"
+        f" {'razão':>7} {'KB/cpu ms':>10}"
+    )
+    lines = [header]
+    for result in results:
+        lines.append(
+            f"{result['payload']:<8} {result['raw_bytes']:>9} {result['encoding']:<9} {result['profile']:<9}"
+            f" {result['level']:>5} {result['cpu_ms']:>9.3f} {result['bytes']:>10} {result['ratio']:>7.2f}"
+            f" {result['saved_kb_per_cpu_ms']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.disable(logging.CRITICAL)
+    payloads = asyncio.run(build_payloads(args.export_rows))
+    results = list(run(payloads, args.min_seconds))
+    print(format_table(results))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
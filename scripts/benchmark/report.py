@@ -0,0 +1,115 @@
+import json
+import math
+import platform
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Percentil pelo método nearest-rank sobre uma lista já ordenada.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    # CPU do processo (todas as threads) por requisição; em processo inclui o cliente httpx
+    cpu_ms_per_request: float = 0.0
+
+    @classmethod
+    def from_latencies(
+        cls, name: str, latencies_s: list[float], errors: int, duration_s: float, cpu_s: float = 0.0
+    ) -> "ScenarioResult":
+        values = sorted(latency * 1000 for latency in latencies_s)
+        total = len(values)
+        return cls(
+            name=name,
+            requests=total,
+            errors=errors,
+            duration_s=round(duration_s, 4),
+            throughput_rps=round(total / duration_s, 2) if duration_s else 0.0,
+            mean_ms=round(sum(values) / total, 3) if total else 0.0,
+            p50_ms=round(percentile(values, 50), 3),
+            p95_ms=round(percentile(values, 95), 3),
+            p99_ms=round(percentile(values, 99), 3),
+            max_ms=round(values[-1], 3) if values else 0.0,
+            cpu_ms_per_request=round(cpu_s * 1000 / total, 3) if total else 0.0,
+        )
+
+    @property
+    def rps_per_core(self) -> float:
+        # Vazão que um núcleo sustentaria com o custo de CPU medido
+        return 1000 / self.cpu_ms_per_request if self.cpu_ms_per_request else 0.0
+
+
+@dataclass
+class BenchmarkReport:
+    backend: str
+    mode: str
+    concurrency: int
+    requests: int
+    scenarios: dict[str, ScenarioResult] = field(default_factory=dict)
+    python: str = field(default_factory=platform.python_version)
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "BenchmarkReport":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        scenarios = {name: ScenarioResult(**values) for name, values in data.pop("scenarios").items()}
+        return cls(scenarios=scenarios, **data)
+
+    def format_table(self) -> str:
+        header = (
+            f"{'cenário':<14} {'req':>7} {'erros':>6} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+            f" {'cpu ms/req':>11} {'req/s/núcleo':>13}"
+        )
+        lines = [f"backend={self.backend} modo={self.mode} concorrência={self.concurrency}", header]
+        for result in self.scenarios.values():
+            lines.append(
+                f"{result.name:<14} {result.requests:>7} {result.errors:>6} {result.throughput_rps:>10.1f} "
+                f"{result.p50_ms:>9.2f} {result.p95_ms:>9.2f} {result.p99_ms:>9.2f} {result.cpu_ms_per_request:>11.3f}"
+                f" {result.rps_per_core:>13.1f}"
+            )
+        return "\n".join(lines)
+
+
+def find_regressions(current: BenchmarkReport, baseline: BenchmarkReport, threshold_pct: float) -> list[str]:
+    """
+    Compara com a baseline e lista os cenários cujo p95/p99 subiu ou a vazão caiu além do limite.
+    """
+    regressions = []
+    limit = threshold_pct / 100
+    for name, result in current.scenarios.items():
+        reference = baseline.scenarios.get(name)
+        if reference is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            before, after = getattr(reference, metric), getattr(result, metric)
+            if before and (after - before) / before > limit:
+                regressions.append(f"{name}: {metric} {before:.2f} -> {after:.2f} (+{(after / before - 1):.0%})")
+        before, after = reference.throughput_rps, result.throughput_rps
+        if before and (before - after) / before > limit:
+            regressions.append(f"{name}: throughput_rps {before:.1f} -> {after:.1f} (-{(1 - after / before):.0%})")
+    return regressions
@@ -0,0 +1,90 @@
+import asyncio
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+from .backends import in_process_client, remote_client
+from .report import BenchmarkReport, ScenarioResult
+from .scenarios import Scenario, build_scenarios
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> ScenarioResult:
+    """
+    Executa `requests` iterações do cenário com `concurrency` workers em paralelo.
+
+    As iterações de aquecimento usam índices próprios e não entram nas estatísticas.
+    Cenários que disparam várias requisições por iteração executam proporcionalmente menos iterações.
+    """
+    requests = max(1, requests // scenario.requests_per_call)
+    warmup = warmup // scenario.requests_per_call
+    await scenario.setup(client, warmup + requests)
+
+    for iteration in range(warmup):
+        await scenario.call(client, requests + iteration)
+
+    latencies: list[float] = []
+    errors = 0
+    next_iteration = 0
+
+    async def _worker():
+        nonlocal next_iteration, errors
+        while next_iteration < requests:
+            iteration = next_iteration
+            next_iteration += 1
+            start = time.perf_counter()
+            try:
+                status = await scenario.call(client, iteration)
+            except httpx.HTTPError:
+                status = None
+            latencies.append(time.perf_counter() - start)
+            if not scenario.accepts(status):
+                errors += 1
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    cpu = time.process_time() - cpu_started
+    duration = time.perf_counter() - started
+
+    return ScenarioResult.from_latencies(scenario.name, latencies, errors, duration, cpu)
+
+
+async def run_benchmark(
+    scenario_names: list[str],
+    backend: str,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+    target_url: str | None = None,
+    dataset_path: Path | None = None,
+    trace_path: Path | None = None,
+) -> BenchmarkReport:
+    """
+    Roda os cenários em processo (ASGI) ou contra uma URL, se `target_url` for informada.
+    """
+    mode = "remote" if target_url else "in-process"
+    report = BenchmarkReport(
+        backend=backend if not target_url else "remote",
+        mode=mode,
+        concurrency=concurrency,
+        requests=requests,
+    )
+    # Contra um servidor remoto os dados persistem entre execuções, então os sellers ganham um sufixo único
+    run_id = uuid.uuid4().hex[:8] if target_url else ""
+    scenarios = build_scenarios(scenario_names, run_id=run_id, trace_path=trace_path)
+
+    client_context = (
+        remote_client(target_url, concurrency) if target_url else in_process_client(backend, dataset_path=dataset_path)
+    )
+    async with client_context as client:
+        for scenario in scenarios:
+            report.scenarios[scenario.name] = await run_scenario(client, scenario, requests, concurrency, warmup)
+    return report
@@ -0,0 +1,258 @@
+import asyncio
+import itertools
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from scripts.dataset.generator import read_jsonl
+
+FRETES_PATH = "/seller/v2/fretes"
+SEED_SIZE = 500
+HOT_SET_SIZE = 20
+BATCH_SIZE = 20
+
+
+def seller_headers(seller_id: str) -> dict[str, str]:
+    return {"x-seller-id": seller_id}
+
+
+async def seed_fretes(client: httpx.AsyncClient, seller_id: str, skus: list[str], concurrency: int = 20) -> None:
+    """
+    Cadastra os fretes usados pelo cenário através da própria API.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _create(index: int, sku: str):
+        async with semaphore:
+            response = await client.post(
+                FRETES_PATH, json={"sku": sku, "valor": 100 + index}, headers=seller_headers(seller_id)
+            )
+            response.raise_for_status()
+
+    await asyncio.gather(*(_create(index, sku) for index, sku in enumerate(skus)))
+
+
+@dataclass
+class Scenario(ABC):
+    """
+    Cenário de benchmark: prepara os dados e executa uma requisição por iteração.
+    """
+
+    name: str
+    expected_status: int = 200
+    # Quantas requisições HTTP cada iteração dispara
+    requests_per_call: int = 1
+    seller_id: str = ""
+    rng: random.Random = field(default_factory=lambda: random.Random(42))
+
+    def __post_init__(self):
+        self.seller_id = self.seller_id or f"bench-{self.name}"
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return seller_headers(self.seller_id)
+
+    async def setup(self, client: httpx.AsyncClient, iterations: int) -> None: ...
+
+    @abstractmethod
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        """
+        Executa a iteração e devolve o status HTTP obtido.
+        """
+
+    def accepts(self, status: int | None) -> bool:
+        return status == self.expected_status
+
+
+@dataclass
+class GetBySkuScenario(Scenario):
+    skus: list[str] = field(default_factory=list)
+
+    async def setup(self, client: httpx.AsyncClient, iterations: int) -> None:
+        self.skus = [f"sku-{index}" for index in range(SEED_SIZE)]
+        await seed_fretes(client, self.seller_id, self.skus)
+
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        sku = self.rng.choice(self.skus)
+        response = await client.get(f"{FRETES_PATH}/{sku}", headers=self.headers)
+        return response.status_code
+
+
+@dataclass
+class GetBySkuHotScenario(GetBySkuScenario):
+    """
+    Poucos SKUs consultados repetidamente: passado o aquecimento, as buscas são acertos do cache de respostas.
+    """
+
+    async def setup(self, client: httpx.AsyncClient, iterations: int) -> None:
+        self.skus = [f"sku-{index}" for index in range(HOT_SET_SIZE)]
+        await seed_fretes(client, self.seller_id, self.skus)
+
+
+@dataclass
+class NotFoundScenario(Scenario):
+    """
+    Busca de SKUs inexistentes: mede o caminho de erro de negócio (exceção, handler e log do 404).
+    """
+
+    expected_status: int = 404
+
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        response = await client.get(f"{FRETES_PATH}/missing-{iteration}", headers=self.headers)
+        return response.status_code
+
+
+@dataclass
+class ListScenario(Scenario):
+    async def setup(self, client: httpx.AsyncClient, iterations: int) -> None:
+        await seed_fretes(client, self.seller_id, [f"sku-{index}" for index in range(SEED_SIZE)])
+
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        low = self.rng.randint(100, 100 + SEED_SIZE // 2)
+        params: dict[str, str | int] = {
+            "preco_greater_than": low,
+            "preco_less_than": low + SEED_SIZE // 4,
+            "_sort": "valor:desc",
+            "_limit": 20,
+            "_offset": self.rng.choice((0, 20, 40)),
+        }
+        response = await client.get(FRETES_PATH, params=params, headers=self.headers)
+        return response.status_code
+
+
+@dataclass
+class CreateScenario(Scenario):
+    expected_status: int = 201
+
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        payload = {"sku": f"sku-{iteration}", "valor": iteration}
+        response = await client.post(FRETES_PATH, json=payload, headers=self.headers)
+        return response.status_code
+
+
+@dataclass
+class PatchScenario(Scenario):
+    skus: list[str] = field(default_factory=list)
+
+    async def setup(self, client: httpx.AsyncClient, iterations: int) -> None:
+        self.skus = [f"sku-{index}" for index in range(SEED_SIZE)]
+        await seed_fretes(client, self.seller_id, self.skus)
+
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        sku = self.skus[iteration % len(self.skus)]
+        response = await client.patch(f"{FRETES_PATH}/{sku}", json={"valor": iteration}, headers=self.headers)
+        return response.status_code
+
+
+@dataclass
+class DeleteScenario(Scenario):
+    expected_status: int = 204
+
+    async def setup(self, client: httpx.AsyncClient, iterations: int) -> None:
+        # Cada iteração remove um frete diferente, então é preciso um por iteração.
+        await seed_fretes(client, self.seller_id, [f"sku-{index}" for index in range(iterations)])
+
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        response = await client.delete(f"{FRETES_PATH}/sku-{iteration}", headers=self.headers)
+        return response.status_code
+
+
+@dataclass
+class BatchScenario(Scenario):
+    """
+    A API não possui endpoint de lote: cada iteração dispara uma rajada de cadastros
+    simultâneos e mede o tempo até o último responder.
+    """
+
+    expected_status: int = 201
+    requests_per_call: int = BATCH_SIZE
+
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    FRETES_PATH,
+                    json={"sku": f"sku-{iteration}-{index}", "valor": index},
+                    headers=self.headers,
+                )
+                for index in range(BATCH_SIZE)
+            )
+        )
+        # Retorna o primeiro status inesperado, se houver
+        for response in responses:
+            if response.status_code != self.expected_status:
+                return response.status_code
+        return self.expected_status
+
+
+@dataclass
+class ReplayScenario(Scenario):
+    """
+    Reproduz o trace gerado por `python -m scripts.dataset generate`, na ordem do arquivo.
+
+    Os fretes referenciados precisam estar carregados (`--dataset` em processo ou `scripts.dataset load`).
+    """
+
+    trace_path: Path = Path("devtools/dataset/trace.jsonl")
+    entries: list[dict] = field(default_factory=list)
+
+    async def setup(self, client: httpx.AsyncClient, iterations: int) -> None:
+        self.entries = list(itertools.islice(read_jsonl(self.trace_path), iterations))
+
+    async def call(self, client: httpx.AsyncClient, iteration: int) -> int:
+        entry = self.entries[iteration % len(self.entries)]
+        headers = seller_headers(entry["seller_id"])
+        match entry["op"]:
+            case "get":
+                response = await client.get(f"{FRETES_PATH}/{entry['sku']}", headers=headers)
+            case "list":
+                response = await client.get(FRETES_PATH, params=entry.get("params"), headers=headers)
+            case "patch":
+                response = await client.patch(
+                    f"{FRETES_PATH}/{entry['sku']}", json={"valor": entry["valor"]}, headers=headers
+                )
+            case "create":
+                response = await client.post(
+                    FRETES_PATH, json={"sku": entry["sku"], "valor": entry["valor"]}, headers=headers
+                )
+            case op:
+                raise ValueError(f"Operação desconhecida no trace: {op}")
+        return response.status_code
+
+    def accepts(self, status: int | None) -> bool:
+        return status in (200, 201)
+
+
+SCENARIOS: dict[str, type[Scenario]] = {
+    "get_by_sku": GetBySkuScenario,
+    "get_by_sku_hot": GetBySkuHotScenario,
+    "not_found": NotFoundScenario,
+    "list": ListScenario,
+    "create": CreateScenario,
+    "patch": PatchScenario,
+    "delete": DeleteScenario,
+    "batch": BatchScenario,
+    "replay": ReplayScenario,
+}
+
+# O replay depende de uma massa gerada previamente, então só roda quando pedido
+DEFAULT_SCENARIOS = [name for name in SCENARIOS if name != "replay"]
+
+
+def build_scenarios(names: list[str], run_id: str = "", trace_path: Path | None = None) -> list[Scenario]:
+    """
+    Instancia os cenários pedidos. O `run_id` isola os sellers entre execuções contra o mesmo servidor.
+    """
+    scenarios: list[Scenario] = []
+    for name in names:
+        if name not in SCENARIOS:
+            raise ValueError(f"Cenário desconhecido: {name}. Opções: {', '.join(SCENARIOS)}")
+        seller_id = f"bench-{name}-{run_id}" if run_id else ""
+        if name == "replay" and trace_path:
+            scenarios.append(ReplayScenario(name=name, seller_id=seller_id, trace_path=trace_path))
+        else:
+            scenarios.append(SCENARIOS[name](name=name, seller_id=seller_id))
+    return scenarios
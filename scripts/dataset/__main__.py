@@ -0,0 +1,104 @@
+"""
+Gerador de massa sintética de fretes e ferramenta de carga no MongoDB.
+
+Exemplos:
+
+    python -m scripts.dataset generate --seed 42 --sellers 1000 --skus 100000
+    ENV=dev python -m scripts.dataset load --drop --parallelism 8
+    ENV=dev python -m scripts.benchmark --scenarios replay --dataset devtools/dataset/fretes.jsonl
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from .generator import DatasetConfig, SyntheticDataset, read_jsonl, write_jsonl
+
+DATASET_DIR = Path("devtools/dataset")
+COLLECTION_NAME = "fretes"
+DEFAULT_BATCH_SIZE = 1_000
+DEFAULT_PARALLELISM = 4
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scripts.dataset", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Gera fretes.jsonl e trace.jsonl a partir da semente")
+    generate.add_argument("--seed", type=int, default=DatasetConfig.seed)
+    generate.add_argument("--sellers", type=int, default=DatasetConfig.sellers)
+    generate.add_argument("--skus", type=int, default=DatasetConfig.skus, help="Total de SKUs somando os sellers")
+    generate.add_argument("--catalog-alpha", type=float, default=DatasetConfig.catalog_alpha)
+    generate.add_argument("--zipf-s", type=float, default=DatasetConfig.zipf_s)
+    generate.add_argument("--trace-requests", type=int, default=DatasetConfig.trace_requests)
+    generate.add_argument("--output-dir", type=Path, default=DATASET_DIR)
+
+    load = commands.add_parser("load", help="Carrega fretes.jsonl no MongoDB, na partição de cada seller")
+    load.add_argument("--input", type=Path, default=DATASET_DIR / "fretes.jsonl")
+    load.add_argument("--db", help="Banco de destino (padrão: MONGO_DB)")
+    load.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    load.add_argument("--parallelism", type=int, default=DEFAULT_PARALLELISM)
+    load.add_argument("--drop", action="store_true", help="Remove os fretes antes de carregar (mantém os índices)")
+    return parser.parse_args(argv)
+
+
+def _generate(args: argparse.Namespace) -> None:
+    config = DatasetConfig(
+        seed=args.seed,
+        sellers=args.sellers,
+        skus=args.skus,
+        catalog_alpha=args.catalog_alpha,
+        zipf_s=args.zipf_s,
+        trace_requests=args.trace_requests,
+    )
+    dataset = SyntheticDataset(config)
+    records = write_jsonl(args.output_dir / "fretes.jsonl", dataset.records())
+    requests = write_jsonl(args.output_dir / "trace.jsonl", dataset.trace())
+
+    sizes = sorted(dataset.catalog_sizes, reverse=True)
+    top = max(1, len(sizes) // 100)
+    print(f"{records} fretes e {requests} requisições gravados em {args.output_dir}")
+    print(f"Maior catálogo: {sizes[0]} | mediana: {sizes[len(sizes) // 2]}")
+    print(f"1% maiores sellers concentram {sum(sizes[:top]) / records:.0%} dos SKUs")
+
+
+async def _load(args: argparse.Namespace) -> None:
+    # Importa a aplicação só aqui: a geração não depende de ENV nem de conexão com o banco
+    from app.integrations.database.partitioning import router_from_settings
+    from app.settings import settings
+
+    from .loader import bulk_load
+
+    router = router_from_settings(settings, db_name=args.db)
+    await router.load_overrides()
+    if args.drop:
+        # delete_many, não drop: os índices criados pelas migrações continuam valendo
+        for partition in router.partitions:
+            await router.database(partition)[COLLECTION_NAME].delete_many({})
+
+    started = time.perf_counter()
+    inserted = await bulk_load(
+        router,
+        COLLECTION_NAME,
+        read_jsonl(args.input),
+        batch_size=args.batch_size,
+        parallelism=args.parallelism,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"{inserted} fretes carregados em {elapsed:.1f}s ({inserted / elapsed:.0f} docs/s)")
+    await router.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.command == "generate":
+        _generate(args)
+    else:
+        asyncio.run(_load(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import bisect
+import itertools
+import json
+import math
+import random
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator, Sequence
+
+# Mistura padrão do trace: tráfego predominante de leitura, como nos checkouts
+DEFAULT_MIX = {"get": 0.80, "list": 0.10, "patch": 0.08, "create": 0.02}
+
+
+@dataclass(frozen=True)
+class DatasetConfig:
+    seed: int = 42
+    sellers: int = 1_000
+    skus: int = 100_000
+    # Expoente da distribuição de Pareto do tamanho de catálogo: quanto menor, mais concentrado nos gigantes
+    catalog_alpha: float = 1.16
+    # Expoente da Zipf de popularidade dos SKUs
+    zipf_s: float = 1.1
+    # Mediana do frete em centavos e dispersão da lognormal
+    valor_median: int = 1990
+    valor_sigma: float = 0.8
+    free_shipping_ratio: float = 0.1
+    trace_requests: int = 100_000
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+
+
+@dataclass(frozen=True)
+class FreteRecord:
+    seller_id: str
+    sku: str
+    valor: int
+
+
+@dataclass(frozen=True)
+class TraceEntry:
+    op: str
+    seller_id: str
+    sku: str | None = None
+    valor: int | None = None
+    params: dict | None = None
+
+
+class SyntheticDataset:
+    """
+    Gera catálogos de frete e um trace de requisições de forma determinística a partir da semente.
+
+    - Tamanho de catálogo por seller segue Pareto: poucos gigantes, muitos pequenos.
+    - Popularidade dos SKUs segue Zipf sobre todos os pares (seller, sku).
+    - `valor` segue uma lognormal em centavos, com uma fração de frete grátis.
+    """
+
+    def __init__(self, config: DatasetConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self.catalog_sizes = self._catalog_sizes()
+        self.sellers = [f"seller-{index:05d}" for index in range(config.sellers)]
+
+    def _catalog_sizes(self) -> list[int]:
+        weights = [self._rng.paretovariate(self.config.catalog_alpha) for _ in range(self.config.sellers)]
+        total = sum(weights)
+        sizes = [max(1, int(weight / total * self.config.skus)) for weight in weights]
+        # Ajusta o arredondamento no maior catálogo para fechar o total pedido
+        largest = max(range(len(sizes)), key=sizes.__getitem__)
+        sizes[largest] = max(1, sizes[largest] + self.config.skus - sum(sizes))
+        return sizes
+
+    def _valor(self, rng: random.Random) -> int:
+        if rng.random() < self.config.free_shipping_ratio:
+            return 0
+        return int(rng.lognormvariate(math.log(self.config.valor_median), self.config.valor_sigma))
+
+    def records(self) -> Iterator[FreteRecord]:
+        rng = random.Random(self.config.seed + 1)
+        for seller_id, size in zip(self.sellers, self.catalog_sizes):
+            for index in range(size):
+                yield FreteRecord(seller_id=seller_id, sku=f"{seller_id}-sku-{index:06d}", valor=self._valor(rng))
+
+    def trace(self) -> Iterator[TraceEntry]:
+        """
+        Trace compatível com o cenário `replay` do benchmark, referenciando os SKUs de `records`.
+        """
+        rng = random.Random(self.config.seed + 2)
+        keys = [
+            (seller_id, index) for seller_id, size in zip(self.sellers, self.catalog_sizes) for index in range(size)
+        ]
+        rng.shuffle(keys)
+        cum_weights = list(itertools.accumulate(1 / rank**self.config.zipf_s for rank in range(1, len(keys) + 1)))
+        # Tráfego de listagem proporcional ao tamanho do catálogo do seller
+        seller_weights = list(itertools.accumulate(self.catalog_sizes))
+        ops = list(self.config.mix)
+        op_weights = list(itertools.accumulate(self.config.mix.values()))
+        created = 0
+
+        def _pick(cumulative: Sequence[float]) -> int:
+            return bisect.bisect_left(cumulative, rng.random() * cumulative[-1])
+
+        for _ in range(self.config.trace_requests):
+            op = ops[_pick(op_weights)]
+            if op == "list":
+                seller_id = self.sellers[_pick(seller_weights)]
+                low = rng.randint(0, self.config.valor_median)
+                params = {"preco_greater_than": low, "preco_less_than": low * 3 + 1, "_sort": "valor:asc"}
+                yield TraceEntry(op=op, seller_id=seller_id, params=params)
+            elif op == "create":
+                seller_id = self.sellers[_pick(seller_weights)]
+                created += 1
+                yield TraceEntry(
+                    op=op, seller_id=seller_id, sku=f"{seller_id}-new-{created:06d}", valor=self._valor(rng)
+                )
+            else:
+                seller_id, index = keys[_pick(cum_weights)]
+                sku = f"{seller_id}-sku-{index:06d}"
+                valor = self._valor(rng) if op == "patch" else None
+                yield TraceEntry(op=op, seller_id=seller_id, sku=sku, valor=valor)
+
+
+def write_jsonl(path: Path, rows: Iterator) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("w", encoding="utf-8") as output:
+        for row in rows:
+            data = {key: value for key, value in asdict(row).items() if value is not None}
+            output.write(json.dumps(data, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def read_jsonl(path: Path) -> Iterator[dict]:
+    with path.open(encoding="utf-8") as source:
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,84 @@
+import asyncio
+import itertools
+from typing import Any, Iterable, Iterator
+
+from app.common.datetime import utcnow
+from app.integrations.database.partitioning import PartitionRouter
+from app.models import Frete
+from app.repositories.base.memory_repository import DEFAULT_USER
+
+
+def to_document(record: dict) -> dict:
+    """
+    Monta o documento no mesmo formato gravado por `AsyncMemoryRepository.create`.
+    """
+    now = utcnow()
+    document = Frete(**record).model_dump(by_alias=True)
+    document.update(
+        created_at=now,
+        updated_at=now,
+        created_by=DEFAULT_USER,
+        updated_by=DEFAULT_USER,
+        audit_created_at=now,
+        audit_updated_at=now,
+    )
+    return document
+
+
+def batched(records: Iterable[dict], batch_size: int) -> Iterator[list[dict]]:
+    iterator = iter(records)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def partitioned_batches(
+    router: PartitionRouter, collection_name: str, records: Iterable[dict], batch_size: int
+) -> Iterator[tuple[Any, list[dict]]]:
+    """
+    Agrupa os registros em lotes por partição do seller, mantendo um lote aberto por partição.
+    """
+    buffers: dict[str, list[dict]] = {partition: [] for partition in router.partitions}
+    for record in records:
+        partition = router.partition_for(record["seller_id"])
+        buffer = buffers[partition]
+        buffer.append(record)
+        if len(buffer) >= batch_size:
+            yield router.database(partition)[collection_name], buffer
+            buffers[partition] = []
+    for partition, buffer in buffers.items():
+        if buffer:
+            yield router.database(partition)[collection_name], buffer
+
+
+async def bulk_load(
+    router: PartitionRouter,
+    collection_name: str,
+    records: Iterable[dict],
+    batch_size: int = 1_000,
+    parallelism: int = 4,
+) -> int:
+    """
+    Carrega os registros na partição de cada seller com `insert_many` não ordenado, mantendo até
+    `parallelism` lotes em voo.
+
+    :return: Quantidade de documentos inseridos.
+    """
+    semaphore = asyncio.Semaphore(parallelism)
+    pending: set[asyncio.Task] = set()
+    inserted = 0
+
+    async def _insert(collection: Any, batch: list[dict]) -> int:
+        async with semaphore:
+            result = await collection.insert_many([to_document(record) for record in batch], ordered=False)
+            return len(result.inserted_ids)
+
+    for collection, batch in partitioned_batches(router, collection_name, records, batch_size):
+        # Limita os lotes materializados em memória ao que pode estar em voo
+        if len(pending) >= parallelism:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            inserted += sum(task.result() for task in done)
+        pending.add(asyncio.create_task(_insert(collection, batch)))
+
+    if pending:
+        inserted += sum(await asyncio.gather(*pending))
+    return inserted
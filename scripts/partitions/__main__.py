@@ -0,0 +1,109 @@
+"""
+Ferramenta de particionamento dos sellers entre clusters do MongoDB.
+
+Exemplos:
+
+    ENV=dev python -m scripts.partitions locate --seller magalu
+    ENV=dev python -m scripts.partitions move --seller magalu --to cluster-b
+    ENV=dev python -m scripts.partitions rebalance --pin-only
+    ENV=dev python -m scripts.partitions rebalance
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from .rebalance import (
+    DEFAULT_BATCH_SIZE,
+    expected_partition,
+    load_moved_sellers,
+    move_seller,
+    pin_sellers,
+    plan_rebalance,
+)
+
+# Coleções que acompanham o seller: os fretes e as remoções do feed de mudanças
+COLLECTION_NAMES = ("fretes", "frete_tombstones")
+# Folga sobre o intervalo de recarga das instâncias antes de reconciliar a origem
+SETTLE_MARGIN_SECONDS = 5
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scripts.partitions", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", help="Banco em todas as partições (padrão: MONGO_DB)")
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        help="Espera entre trocar a partição e limpar a origem (padrão: MONGO_PARTITION_REFRESH_SECONDS + 5)",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    locate = commands.add_parser("locate", help="Mostra a partição atual e a esperada de um seller")
+    locate.add_argument("--seller", required=True)
+
+    move = commands.add_parser("move", help="Move um seller para outra partição")
+    move.add_argument("--seller", required=True)
+    move.add_argument("--to", required=True, dest="target")
+
+    rebalance = commands.add_parser("rebalance", help="Move os sellers que estão fora da partição esperada")
+    rebalance.add_argument("--dry-run", action="store_true", help="Só lista as movimentações")
+    rebalance.add_argument(
+        "--pin-only", action="store_true", help="Fixa os sellers onde estão (rodar antes de publicar partições novas)"
+    )
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace) -> int:
+    # Importa a aplicação só aqui para o --help não depender de ENV
+    from app.integrations.database.partitioning import router_from_settings
+    from app.settings import settings
+
+    router = router_from_settings(settings, db_name=args.db)
+    settle_seconds = args.settle_seconds
+    if settle_seconds is None:
+        settle_seconds = settings.mongo_partition_refresh_seconds + SETTLE_MARGIN_SECONDS
+    try:
+        await router.load_overrides()
+        if args.command == "locate":
+            expected = expected_partition(router, args.seller, await load_moved_sellers(router))
+            print(f"atual={router.partition_for(args.seller)} esperada={expected}")
+        elif args.command == "move":
+            if args.target not in router.partitions:
+                print(f"Partição desconhecida: {args.target}. Disponíveis: {router.partitions}", file=sys.stderr)
+                return 1
+            move = await move_seller(
+                router, COLLECTION_NAMES, args.seller, args.target, settle_seconds, batch_size=args.batch_size
+            )
+            print(f"{move.seller_id}: {move.source} -> {move.target} ({move.documents} documentos)")
+        else:
+            moves = await plan_rebalance(router, COLLECTION_NAMES)
+            for move in moves:
+                print(f"{move.seller_id}: {move.source} -> {move.target}")
+            if args.pin_only:
+                print(f"{await pin_sellers(router, moves)} sellers fixados na partição atual")
+            elif not args.dry_run:
+                for move in moves:
+                    await move_seller(
+                        router,
+                        COLLECTION_NAMES,
+                        move.seller_id,
+                        move.target,
+                        settle_seconds,
+                        batch_size=args.batch_size,
+                        source=move.source,
+                    )
+                print(f"{len(moves)} sellers realocados")
+    finally:
+        await router.close()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    return asyncio.run(_run(_parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
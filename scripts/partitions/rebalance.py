@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from pymongo import DeleteOne, ReplaceOne
+
+from app.integrations.database.partitioning import PartitionRouter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+@dataclass
+class SellerMove:
+    seller_id: str
+    source: str
+    target: str
+    documents: int = 0
+
+
+def _fingerprint(document: dict) -> bytes:
+    return hashlib.blake2b(repr(sorted(document.items())).encode(), digest_size=16).digest()
+
+
+async def load_moved_sellers(router: PartitionRouter) -> dict[str, str]:
+    """
+    Realocações definitivas da tabela dinâmica; as fixações temporárias (`pin`) ficam de fora.
+    """
+    return {
+        str(document["_id"]): document["partition"]
+        async for document in router.overrides_collection.find({"reason": {"$ne": "pin"}})
+    }
+
+
+def expected_partition(router: PartitionRouter, seller_id: str, moved: dict[str, str] | None = None) -> str:
+    """
+    Partição de destino do seller: a exceção fixa da configuração, uma realocação definitiva ou o anel de hash.
+    """
+    return router.static_overrides.get(seller_id) or (moved or {}).get(seller_id) or router.ring.node_for(seller_id)
+
+
+async def locate_sellers(router: PartitionRouter, collection_names: Sequence[str]) -> dict[str, list[str]]:
+    """
+    Partições onde cada seller tem documentos hoje, em qualquer uma das coleções.
+    """
+    locations: dict[str, list[str]] = {}
+    for partition in router.partitions:
+        sellers: set[str] = set()
+        for collection_name in collection_names:
+            sellers.update(map(str, await router.database(partition)[collection_name].distinct("seller_id")))
+        for seller_id in sellers:
+            locations.setdefault(seller_id, []).append(partition)
+    return locations
+
+
+async def plan_rebalance(router: PartitionRouter, collection_names: Sequence[str]) -> list[SellerMove]:
+    """
+    Sellers com documentos, em qualquer uma das coleções, fora da partição esperada pelo anel/configuração.
+    """
+    moves: list[SellerMove] = []
+    moved = await load_moved_sellers(router)
+    for seller_id, partitions in (await locate_sellers(router, collection_names)).items():
+        target = expected_partition(router, seller_id, moved)
+        moves.extend(SellerMove(seller_id, source, target) for source in partitions if source != target)
+    return moves
+
+
+async def pin_sellers(router: PartitionRouter, moves: list[SellerMove]) -> int:
+    """
+    Fixa cada seller a realocar na partição onde os dados estão.
+
+    Deve rodar antes de publicar uma configuração com partições novas: sem isso as instâncias passariam a
+    procurar esses sellers no cluster novo, ainda vazio.
+    """
+    pinned = 0
+    for move in moves:
+        if router.partition_for(move.seller_id) != move.source:
+            await router.set_override(move.seller_id, move.source, reason="pin")
+            pinned += 1
+    return pinned
+
+
+async def _copy(source: Any, target: Any, seller_id: str, batch_size: int) -> dict[Any, bytes]:
+    snapshot: dict[Any, bytes] = {}
+    batch: list[ReplaceOne] = []
+    async for document in source.find({"seller_id": seller_id}):
+        snapshot[document["_id"]] = _fingerprint(document)
+        batch.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+        if len(batch) >= batch_size:
+            await target.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        await target.bulk_write(batch, ordered=False)
+    return snapshot
+
+
+async def _reconcile(source: Any, target: Any, seller_id: str, snapshot: dict[Any, bytes]) -> int:
+    """
+    Aplica no destino o que foi escrito na origem durante a troca de partição.
+
+    Documentos que mudaram no destino depois da cópia (escritas das instâncias já roteadas para lá) são
+    preservados; os demais recebem a versão atual da origem, e os removidos na origem são removidos do destino.
+    """
+    current = {document["_id"]: document async for document in source.find({"seller_id": seller_id})}
+    copied = {document["_id"]: document async for document in target.find({"seller_id": seller_id})}
+    operations: list[Any] = []
+    for document_id, document in current.items():
+        target_document = copied.get(document_id)
+        if target_document is None and document_id not in snapshot:
+            operations.append(ReplaceOne({"_id": document_id}, document, upsert=True))
+        elif target_document is not None and _fingerprint(target_document) == snapshot.get(document_id):
+            if _fingerprint(document) != snapshot[document_id]:
+                operations.append(ReplaceOne({"_id": document_id}, document, upsert=True))
+    for document_id, fingerprint in snapshot.items():
+        target_document = copied.get(document_id)
+        if document_id not in current and target_document is not None and _fingerprint(target_document) == fingerprint:
+            operations.append(DeleteOne({"_id": document_id}))
+    if operations:
+        await target.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+async def move_seller(
+    router: PartitionRouter,
+    collection_names: Sequence[str],
+    seller_id: str,
+    target: str,
+    settle_seconds: float,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    source: str | None = None,
+) -> SellerMove:
+    """
+    Move os documentos de um seller, em cada uma das `collection_names`, para outra partição sem parar a aplicação.
+
+    1. Copia os documentos para o destino, guardando uma impressão digital de cada um.
+    2. Aponta o seller para o destino na tabela de exceções.
+    3. Aguarda `settle_seconds` (ao menos o intervalo de recarga das instâncias); nesse meio tempo parte das
+       escritas ainda cai na origem.
+    4. Reconcilia essas escritas no destino e remove os documentos da origem.
+    5. Se o destino é o que o anel já indica, a exceção deixa de ser necessária e é removida.
+    """
+    source = source or router.partition_for(seller_id)
+    move = SellerMove(seller_id, source, target)
+    if source == target:
+        return move
+
+    collections = [
+        (router.database(source)[collection_name], router.database(target)[collection_name])
+        for collection_name in collection_names
+    ]
+    snapshots = [
+        await _copy(source_collection, target_collection, seller_id, batch_size)
+        for source_collection, target_collection in collections
+    ]
+    move.documents = sum(len(snapshot) for snapshot in snapshots)
+    await router.set_override(seller_id, target)
+    logger.info(f"Seller {seller_id}: {move.documents} documentos copiados de {source} para {target}")
+
+    await asyncio.sleep(settle_seconds)
+    reconciled = 0
+    for (source_collection, target_collection), snapshot in zip(collections, snapshots):
+        reconciled += await _reconcile(source_collection, target_collection, seller_id, snapshot)
+        await source_collection.delete_many({"seller_id": seller_id})
+    if target == router.ring.node_for(seller_id) and seller_id not in router.static_overrides:
+        await router.remove_override(seller_id)
+    logger.info(f"Seller {seller_id}: {reconciled} escritas reconciliadas, origem {source} limpa")
+    return move
@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from starlette.requests import Request
+
+from app.api.common.conditional import EntityVersion, Validators, parse_if_match
+
+ENTITY_ID = UUID("0190f6a4-5a1c-7000-8000-000000000001")
+MODIFIED_AT = datetime(2026, 10, 19, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+
+def _request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+        }
+    )
+
+
+def test_for_entity_uses_id_and_version_as_etag():
+    validators = Validators.for_entity(EntityVersion(ENTITY_ID, 3, MODIFIED_AT))
+
+    assert validators.etag == f'"{ENTITY_ID}.3"'
+    assert validators.last_modified == MODIFIED_AT.replace(microsecond=0)
+    assert validators.headers["Last-Modified"] == "Mon, 19 Oct 2026 12:00:00 GMT"
+
+
+def test_build_changes_etag_with_any_version():
+    first = Validators.build("seller|list", [EntityVersion(ENTITY_ID, 1, MODIFIED_AT)])
+    second = Validators.build("seller|list", [EntityVersion(ENTITY_ID, 2, MODIFIED_AT)])
+    other_scope = Validators.build("other|list", [EntityVersion(ENTITY_ID, 1, MODIFIED_AT)])
+
+    assert first.etag != second.etag
+    assert first.etag != other_scope.etag
+
+
+def test_if_none_match_uses_weak_comparison():
+    validators = Validators.for_entity(EntityVersion(ENTITY_ID, 1, MODIFIED_AT))
+
+    assert validators.is_not_modified(_request(if_none_match=validators.etag))
+    assert validators.is_not_modified(_request(if_none_match=f'"other", W/{validators.etag}'))
+    assert validators.is_not_modified(_request(if_none_match="*"))
+    assert not validators.is_not_modified(_request(if_none_match=f'"{ENTITY_ID}.2"'))
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    validators = Validators.for_entity(EntityVersion(ENTITY_ID, 1, MODIFIED_AT))
+
+    request = _request(if_none_match='"other"', if_modified_since="Tue, 20 Oct 2026 00:00:00 GMT")
+
+    assert not validators.is_not_modified(request)
+
+
+def test_if_modified_since():
+    validators = Validators.for_entity(EntityVersion(ENTITY_ID, 1, MODIFIED_AT))
+
+    assert validators.is_not_modified(_request(if_modified_since="Mon, 19 Oct 2026 12:00:00 GMT"))
+    assert not validators.is_not_modified(_request(if_modified_since="Mon, 19 Oct 2026 11:59:59 GMT"))
+    assert not validators.is_not_modified(_request(if_modified_since="invalid"))
+    assert not validators.is_not_modified(
+        _request(if_modified_since="Mon, 19 Oct 2026 12:00:00 GMT"), use_last_modified=False
+    )
+
+
+def test_not_modified_keeps_only_validators():
+    validators = Validators.for_entity(EntityVersion(ENTITY_ID, 1, MODIFIED_AT))
+
+    response = validators.not_modified()
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["ETag"] == validators.etag
+
+
+def test_parse_if_match():
+    assert parse_if_match(None) is None
+    assert parse_if_match(" * ") is None
+    assert parse_if_match(f'"{ENTITY_ID}.2", "{ENTITY_ID}.3"') == [(str(ENTITY_ID), 2), (str(ENTITY_ID), 3)]
+
+
+def test_parse_if_match_ignores_weak_and_unknown_etags():
+    assert parse_if_match(f'W/"{ENTITY_ID}.2"') == []
+    assert parse_if_match('"abc", "abc.x", ".3"') == []
@@ -0,0 +1,44 @@
+import httpx
+import pytest
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+from app.api.middlewares.server_timing_middleware import ServerTimingMiddleware
+
+# Token fixo de teste
+TOKEN = "admin-token"  # nosec B105
+
+
+async def _endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+async def _server_timing(middleware: ServerTimingMiddleware, headers: dict[str, str]) -> str | None:
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return (await client.get("/", headers=headers)).headers.get("server-timing")
+
+
+@pytest.mark.parametrize(
+    ("token", "headers", "expected"),
+    [
+        (TOKEN, {"x-server-timing": "1", "x-admin-token": TOKEN}, True),
+        (TOKEN, {"x-server-timing": "1", "x-admin-token": "other"}, False),
+        (TOKEN, {"x-server-timing": "1"}, False),
+        (None, {"x-server-timing": "1", "x-admin-token": ""}, False),
+        (TOKEN, {"x-admin-token": TOKEN}, False),
+    ],
+)
+async def test_forced_timing_requires_admin_token(token, headers, expected):
+    middleware = ServerTimingMiddleware(_endpoint, sample_rate=0, token=token)
+
+    header = await _server_timing(middleware, headers)
+
+    assert (header is not None) is expected
+    assert header is None or header.startswith("total;dur=")
+
+
+async def test_sampled_requests_get_the_header():
+    middleware = ServerTimingMiddleware(_endpoint, sample_rate=1)
+
+    assert await _server_timing(middleware, {}) is not None
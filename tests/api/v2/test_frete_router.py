@@ -0,0 +1,166 @@
+import httpx
+import pytest
+
+from app.common.exceptions import PreconditionFailedException
+
+PATH = "/seller/v2/fretes"
+CHANGES_PATH = "/seller/v2/frete-changes"
+HEADERS = {"x-seller-id": "seller-1"}
+
+
+async def _create(client: httpx.AsyncClient, sku: str, valor: int = 10) -> httpx.Response:
+    response = await client.post(PATH, json={"sku": sku, "valor": valor}, headers=HEADERS)
+    assert response.status_code == 201
+    return response
+
+
+async def _etag(client: httpx.AsyncClient, sku: str) -> str:
+    return (await client.get(f"{PATH}/{sku}", headers=HEADERS)).headers["etag"]
+
+
+async def test_get_returns_version_etag_and_not_modified(api_client):
+    await _create(api_client, "sku-1")
+
+    response = await api_client.get(f"{PATH}/sku-1", headers=HEADERS)
+    frete = response.json()
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{frete["id"]}.{frete["version"]}"'
+    not_modified = await api_client.get(f"{PATH}/sku-1", headers={**HEADERS, "if-none-match": response.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == response.headers["etag"]
+
+
+async def test_list_not_modified_until_a_write(api_client):
+    await _create(api_client, "sku-1")
+    response = await api_client.get(PATH, headers=HEADERS)
+    etag = response.headers["etag"]
+
+    assert (await api_client.get(PATH, headers={**HEADERS, "if-none-match": etag})).status_code == 304
+    await api_client.patch(f"{PATH}/sku-1", json={"valor": 20}, headers=HEADERS)
+    assert (await api_client.get(PATH, headers={**HEADERS, "if-none-match": etag})).status_code == 200
+
+
+async def test_patch_with_if_match(api_client):
+    await _create(api_client, "sku-1")
+    etag = await _etag(api_client, "sku-1")
+
+    updated = await api_client.patch(f"{PATH}/sku-1", json={"valor": 20}, headers={**HEADERS, "if-match": etag})
+    stale = await api_client.patch(f"{PATH}/sku-1", json={"valor": 30}, headers={**HEADERS, "if-match": etag})
+
+    assert updated.status_code == 200
+    assert updated.json()["version"] == 2
+    assert updated.headers["etag"] != etag
+    assert stale.status_code == 412
+    assert (await api_client.get(f"{PATH}/sku-1", headers=HEADERS)).json()["valor"] == 20
+
+
+async def test_patch_sets_only_sent_fields(api_client):
+    await _create(api_client, "sku-1", valor=10)
+
+    response = await api_client.patch(f"{PATH}/sku-1", json={"valor": 20}, headers=HEADERS)
+    frete = (await api_client.get(f"{PATH}/sku-1", headers=HEADERS)).json()
+
+    assert response.status_code == 200
+    assert (frete["sku"], frete["valor"], frete["version"]) == ("sku-1", 20, 2)
+
+
+async def test_put_with_if_match(api_client):
+    await _create(api_client, "sku-1")
+    etag = await _etag(api_client, "sku-1")
+    body = {"seller_id": "seller-1", "sku": "sku-1", "valor": 50}
+
+    replaced = await api_client.put(f"{PATH}/sku-1", json=body, headers={**HEADERS, "if-match": etag})
+    stale = await api_client.put(f"{PATH}/sku-1", json=body, headers={**HEADERS, "if-match": etag})
+    weak = await api_client.put(f"{PATH}/sku-1", json=body, headers={**HEADERS, "if-match": f"W/{etag}"})
+
+    assert replaced.status_code == 200
+    assert stale.status_code == 412
+    assert weak.status_code == 412
+
+
+@pytest.mark.parametrize(("method", "body"), [("patch", {"sku": "sku-2"}), ("put", {"sku": "sku-2", "valor": 10})])
+async def test_lost_races_without_if_match_are_a_conflict(api_app, api_client, monkeypatch, method, body):
+    await _create(api_client, "sku-1")
+    etag = await _etag(api_client, "sku-1")
+
+    async def lose_the_race(*args, **kwargs):
+        raise PreconditionFailedException()
+
+    repository = api_app.container.frete_repository()  # type: ignore[attr-defined]
+    monkeypatch.setattr(repository, "set_fields", lose_the_race)
+    monkeypatch.setattr(repository, "update", lose_the_race)
+    body = {"seller_id": "seller-1", **body}
+
+    conflict = await api_client.request(method.upper(), f"{PATH}/sku-1", json=body, headers=HEADERS)
+    precondition = await api_client.request(
+        method.upper(), f"{PATH}/sku-1", json=body, headers={**HEADERS, "if-match": etag}
+    )
+
+    assert conflict.status_code == 409
+    assert conflict.headers["retry-after"] == "1"
+    assert precondition.status_code == 412
+
+
+async def test_list_cache_sees_writes(api_client):
+    await _create(api_client, "sku-1")
+    assert len((await api_client.get(PATH, headers=HEADERS)).json()["results"]) == 1
+
+    await _create(api_client, "sku-2")
+    await api_client.delete(f"{PATH}/sku-1", headers=HEADERS)
+
+    assert [frete["sku"] for frete in (await api_client.get(PATH, headers=HEADERS)).json()["results"]] == ["sku-2"]
+
+
+async def test_item_cache_sees_writes(api_client):
+    await _create(api_client, "sku-1", valor=10)
+    first = await api_client.get(f"{PATH}/sku-1", headers=HEADERS)
+    cached = await api_client.get(f"{PATH}/sku-1", headers=HEADERS)
+
+    await api_client.patch(f"{PATH}/sku-1", json={"valor": 20}, headers=HEADERS)
+    updated = await api_client.get(f"{PATH}/sku-1", headers=HEADERS)
+    await api_client.delete(f"{PATH}/sku-1", headers=HEADERS)
+
+    assert cached.content == first.content
+    assert cached.headers["etag"] == first.headers["etag"]
+    assert updated.json()["valor"] == 20
+    assert (await api_client.get(f"{PATH}/sku-1", headers=HEADERS)).status_code == 404
+
+
+@pytest.mark.parametrize("sku", ["changes", "_changes"])
+async def test_changes_feed_does_not_shadow_sku(api_client, sku):
+    await _create(api_client, sku)
+
+    response = await api_client.get(f"{PATH}/{sku}", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["sku"] == sku
+
+
+async def test_changes_feed_pages_upserts_and_deletes(api_client):
+    for sku in ("sku-1", "sku-2", "sku-3"):
+        await _create(api_client, sku)
+    await api_client.delete(f"{PATH}/sku-2", headers=HEADERS)
+    await api_client.patch(f"{PATH}/sku-1", json={"sku": "sku-4"}, headers=HEADERS)
+
+    changes, since = [], None
+    while True:
+        params = {"limit": 2, **({"since": since} if since else {})}
+        page = (await api_client.get(CHANGES_PATH, params=params, headers=HEADERS)).json()
+        changes.extend((change["type"], change["sku"]) for change in page["results"])
+        since = page["next"]
+        if not page["has_more"]:
+            break
+
+    assert sorted(changes) == [("delete", "sku-1"), ("delete", "sku-2"), ("upsert", "sku-3"), ("upsert", "sku-4")]
+    # Do último token em diante não há mudanças novas
+    page = (await api_client.get(CHANGES_PATH, params={"since": since}, headers=HEADERS)).json()
+    assert page["results"] == []
+    assert page["has_more"] is False
+
+
+async def test_changes_feed_rejects_invalid_token(api_client):
+    response = await api_client.get(CHANGES_PATH, params={"since": "invalid"}, headers=HEADERS)
+
+    assert response.status_code == 400
@@ -0,0 +1,96 @@
+import gzip
+
+import pytest
+
+from app.common.compression.codecs import HAS_BROTLI
+from app.common.compression.policy import CompressionPolicy, parse_accept_encoding
+
+needs_brotli = pytest.mark.skipif(not HAS_BROTLI, reason="brotli não instalado")
+
+
+def _policy(codecs: list[str] | None = None, **kwargs) -> CompressionPolicy:
+    return CompressionPolicy(codecs or ["br", "gzip"], min_size=100, large_size=10_000, **kwargs)
+
+
+def _negotiated(policy: CompressionPolicy, accept_encoding: str) -> str | None:
+    codec = policy.negotiate(accept_encoding)
+    return codec.name if codec is not None else None
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, BR;q=0.5 , deflate;q=x, ;q=1, *;q=0") == {
+        "gzip": 1.0,
+        "br": 0.5,
+        "deflate": 0.0,
+        "*": 0.0,
+    }
+
+
+@needs_brotli
+def test_negotiate_prefers_client_weight_then_server_order():
+    policy = _policy()
+
+    assert _negotiated(policy, "gzip, br") == "br"
+    assert _negotiated(policy, "gzip;q=1, br;q=0.5") == "gzip"
+    assert _negotiated(policy, "br;q=0, gzip") == "gzip"
+
+
+def test_negotiate_without_accepted_codec():
+    policy = _policy(["gzip"])
+
+    assert _negotiated(policy, "") is None
+    assert _negotiated(policy, "identity") is None
+    assert _negotiated(policy, "gzip;q=0") is None
+    assert _negotiated(policy, "*;q=0") is None
+
+
+@needs_brotli
+def test_negotiate_wildcard():
+    policy = _policy()
+
+    assert _negotiated(policy, "*") == "br"
+    assert _negotiated(policy, "br;q=0, *") == "gzip"
+
+
+def test_disabled_policy_negotiates_nothing():
+    assert _negotiated(_policy(["gzip"], enabled=False), "gzip") is None
+    assert _negotiated(_policy(["unknown"]), "unknown, gzip") is None
+
+
+def test_profile():
+    policy = _policy(routes={"/seller/v2/fretes": "fast", "/health": "off"})
+
+    assert policy.profile(None, 99) == "off"
+    assert policy.profile(None, 100) == "balanced"
+    assert policy.profile(None, 100, reused=True) == "small"
+    assert policy.profile(None, 10_000) == "fast"
+    assert policy.profile(None, None) == "fast"
+    assert policy.profile("/seller/v2/fretes", 100) == "fast"
+    assert policy.profile("/health", 10_000) == "off"
+    assert policy.profile("/health", 99) == "off"
+
+
+@pytest.mark.parametrize(
+    ("content_type", "expected"),
+    [
+        ("application/json", True),
+        ("application/json; charset=utf-8", True),
+        ("application/problem+json", True),
+        ("text/html", True),
+        ("text/event-stream", False),
+        ("image/png", False),
+        ("application/gzip", False),
+        (None, False),
+        ("", False),
+    ],
+)
+def test_compressible(content_type, expected):
+    assert CompressionPolicy.compressible(content_type) is expected
+
+
+def test_gzip_codec_round_trip():
+    codec = _policy(["gzip"]).negotiate("gzip")
+    assert codec is not None
+    body = b'{"valor": 10}' * 100
+
+    assert gzip.decompress(codec.compress(body, codec.level("balanced"))) == body
@@ -0,0 +1,23 @@
+from app.common.log import access_log
+from app.common.log.access_log import AccessLogEntry, AccessLogWriter
+from app.common.metrics import ACCESS_LOG_DROPPED
+
+
+def _entry() -> AccessLogEntry:
+    return AccessLogEntry(0.0, "GET", "/seller/v2/fretes", b"", "/seller/v2/fretes", 200, 10, 1.5, None, [])
+
+
+def test_counts_lines_dropped_when_the_write_fails(monkeypatch, capsys):
+    def closed(text: str) -> None:
+        raise ValueError("I/O operation on closed file.")
+
+    monkeypatch.setattr(access_log, "write_log_lines", closed)
+    writer = AccessLogWriter()
+    writer._queue.put(_entry())
+    writer._queue.put(_entry())
+    before = ACCESS_LOG_DROPPED._value.get()
+
+    writer.flush()
+
+    assert ACCESS_LOG_DROPPED._value.get() - before == 2
+    assert "2 linhas descartadas" in capsys.readouterr().err
@@ -0,0 +1,120 @@
+from app.common.load_shedding import OVERLOAD, FairShareBuckets, GradientLimiter, LoadShedder
+
+
+def _limiter(initial_limit: int, min_limit: int = 1, max_limit: int = 1000) -> GradientLimiter:
+    # Cada amostra fecha uma janela, para o limite reagir a cada `release`
+    return GradientLimiter(initial_limit, min_limit, max_limit, window_seconds=0, min_window_samples=1)
+
+
+def _run(limiter: GradientLimiter, concurrency: int, rtt: float) -> None:
+    for _ in range(concurrency):
+        assert limiter.try_acquire()
+    for _ in range(concurrency):
+        limiter.release(rtt)
+
+
+def test_admits_up_to_the_limit():
+    limiter = _limiter(2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release(0.01)
+    assert limiter.try_acquire()
+
+
+def test_shrinks_when_latency_rises():
+    limiter = _limiter(100, min_limit=10)
+    _run(limiter, 1, 0.01)
+
+    for _ in range(5):
+        _run(limiter, 1, 0.1)
+
+    assert 10 <= limiter.limit < 100
+    assert limiter.short_rtt == 0.1
+
+
+def test_never_goes_below_min_limit():
+    limiter = _limiter(20, min_limit=10)
+    _run(limiter, 1, 0.01)
+
+    for _ in range(50):
+        _run(limiter, 1, 10.0)
+
+    assert limiter.limit == 10
+
+
+def test_grows_while_latency_is_stable_and_the_limit_is_in_use():
+    limiter = _limiter(10, max_limit=12)
+
+    for _ in range(20):
+        _run(limiter, int(limiter.limit), 0.01)
+
+    assert limiter.limit == 12
+
+
+def test_does_not_grow_while_most_of_the_limit_is_idle():
+    limiter = _limiter(10)
+
+    for _ in range(20):
+        _run(limiter, 1, 0.01)
+
+    assert limiter.limit == 10
+
+
+def test_single_seller_gets_the_whole_capacity():
+    buckets = FairShareBuckets(burst_seconds=1, window_seconds=10, max_sellers=10)
+
+    waits = [buckets.take("seller-1", capacity_rps=10, now=0) for _ in range(11)]
+
+    assert waits[:10] == [0.0] * 10
+    assert waits[10] == 0.1
+
+
+def test_capacity_is_split_between_active_sellers():
+    buckets = FairShareBuckets(burst_seconds=1, window_seconds=10, max_sellers=10)
+    buckets.take("seller-1", capacity_rps=10, now=0)
+
+    waits = [buckets.take("seller-2", capacity_rps=10, now=0) for _ in range(6)]
+
+    assert waits[:5] == [0.0] * 5
+    assert waits[5] == 0.2
+    assert buckets.take("seller-2", capacity_rps=10, now=0.2) == 0.0
+
+
+def test_idle_sellers_expire():
+    buckets = FairShareBuckets(burst_seconds=1, window_seconds=1, max_sellers=10)
+    buckets.take("seller-1", capacity_rps=10, now=0)
+
+    buckets.take("seller-2", capacity_rps=10, now=2)
+
+    assert len(buckets) == 1
+
+
+def test_keeps_at_most_max_sellers():
+    buckets = FairShareBuckets(burst_seconds=1, window_seconds=10, max_sellers=2)
+
+    for seller_id in ("seller-1", "seller-2", "seller-3"):
+        buckets.take(seller_id, capacity_rps=10, now=0)
+
+    assert len(buckets) == 2
+    assert "seller-1" not in buckets._buckets
+
+
+def test_load_shedder_rejects_overload():
+    shedder = LoadShedder(
+        initial_limit=1,
+        min_limit=1,
+        max_limit=1,
+        tolerance=1.5,
+        seller_burst_seconds=1,
+        seller_window_seconds=10,
+        max_sellers=10,
+        retry_after_seconds=3,
+    )
+
+    assert shedder.acquire("seller-1") is None
+    rejection = shedder.acquire("seller-1")
+
+    assert rejection is not None
+    assert (rejection.reason, rejection.retry_after) == (OVERLOAD, 3)
@@ -0,0 +1,35 @@
+import os
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+# As configurações são lidas na importação da aplicação
+os.environ.setdefault("ENV", "test")
+
+from scripts.benchmark.backends import build_app, mongomock_without_bson_validation  # noqa: E402
+
+TEST_DB_NAME = "pc_frete_test"
+
+
+@pytest.fixture
+def api_app() -> FastAPI:
+    """
+    Aplicação sobre o MongoDB em memória (mongomock) e sem o atraso do feed de mudanças.
+    """
+    app = build_app("memory", db_name=TEST_DB_NAME)
+    app.container.config.frete_changes_settle_ms.override(0)  # type: ignore[attr-defined]
+    return app
+
+
+@pytest.fixture
+async def api_client(api_app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Cliente falando com a `api_app` via ASGI, com o lifespan da aplicação rodando.
+    """
+    with mongomock_without_bson_validation():
+        async with api_app.router.lifespan_context(api_app):
+            transport = httpx.ASGITransport(app=api_app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                yield client
@@ -0,0 +1,60 @@
+import random
+
+from app.integrations.cache.hot_keys import HotKeyTracker
+
+
+def test_finds_the_most_accessed_keys():
+    tracker = HotKeyTracker("test", capacity=3, window=100_000)
+    # Tráfego sintético e reprodutível, não um segredo
+    generator = random.Random(42)  # nosec B311
+    hot = [("seller", f"hot-{index}") for index in range(3)]
+    for _ in range(5000):
+        tracker.add(generator.choice(hot) if generator.random() < 0.5 else ("seller", f"cold-{generator.random()}"))
+
+    top = tracker.top()
+
+    assert {hot_key.key for hot_key in top} == set(hot)
+    assert [hot_key.count for hot_key in top] == sorted((hot_key.count for hot_key in top), reverse=True)
+    assert all(tracker.is_hot(key) for key in hot)
+    assert 0.4 < tracker.share() <= 1.0
+
+
+def test_keeps_at_most_capacity_keys():
+    tracker = HotKeyTracker("test", capacity=2, window=100_000)
+
+    for sku in ("a", "b", "c", "c", "c"):
+        tracker.add(("seller", sku))
+
+    assert len(tracker.top()) == 2
+    assert tracker.top(limit=1)[0].key == ("seller", "c")
+
+
+def test_counts_exactly_after_admission():
+    tracker = HotKeyTracker("test", capacity=2, window=100_000)
+
+    for _ in range(10):
+        tracker.add(("seller", "a"))
+
+    assert tracker.top()[0].count == 10
+    assert tracker.top()[0].error == 0
+
+
+def test_decays_every_window():
+    tracker = HotKeyTracker("test", capacity=2, window=8)
+    for _ in range(7):
+        tracker.add(("seller", "a"))
+    tracker.add(("seller", "b"))
+
+    counts = {hot_key.key: hot_key.count for hot_key in tracker.top()}
+
+    assert counts == {("seller", "a"): 3}
+
+
+def test_disabled_tracker_counts_nothing():
+    tracker = HotKeyTracker("test", capacity=0, window=8)
+
+    tracker.add(("seller", "a"))
+
+    assert not tracker.enabled
+    assert tracker.top() == []
+    assert tracker.share() == 0.0
@@ -0,0 +1,141 @@
+from app.integrations.cache import memory_cache
+from app.integrations.cache.hot_keys import HotKeyTracker
+from app.integrations.cache.memory_cache import CachedResponse, GenerationalCache, LruCache
+
+
+def _value(size: int) -> CachedResponse:
+    return CachedResponse(body=b"x" * size)
+
+
+def test_evicts_least_recently_used():
+    cache = LruCache("test", max_entries=2, max_bytes=1000)
+    cache.set("a", _value(1))
+    cache.set("b", _value(1))
+
+    cache.get("a")
+    cache.set("c", _value(1))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_evicts_by_bytes():
+    cache = LruCache("test", max_entries=10, max_bytes=100)
+    cache.set("a", _value(60))
+    cache.set("b", _value(60))
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 60
+
+
+def test_ignores_value_larger_than_cache():
+    cache = LruCache("test", max_entries=10, max_bytes=100)
+
+    cache.set("a", _value(101))
+
+    assert len(cache) == 0
+
+
+def test_expires_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(memory_cache.time, "monotonic", lambda: now[0])
+    cache = LruCache("test", max_entries=10, max_bytes=1000, ttl_seconds=5)
+    cache.set("a", _value(1))
+
+    now[0] += 4
+    assert cache.get("a") is not None
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.size_bytes == 0
+
+
+def test_does_not_store_value_built_before_an_invalidation():
+    cache = LruCache("test", max_entries=10, max_bytes=1000)
+    since = cache.invalidations
+
+    cache.delete("a")
+    cache.set("a", _value(1), since=since)
+
+    assert cache.get("a") is None
+    cache.set("a", _value(1), since=cache.invalidations)
+    assert cache.get("a") is not None
+
+
+def test_spares_hot_keys_on_eviction():
+    hot_keys = HotKeyTracker("test", capacity=1, window=1000)
+    hot_keys.add(("seller", "hot"))
+    cache = LruCache("test", max_entries=2, max_bytes=1000, hot_keys=hot_keys)
+    cache.set(("seller", "hot"), _value(1))
+    cache.set(("seller", "b"), _value(1))
+
+    cache.set(("seller", "c"), _value(1))
+
+    assert cache.get(("seller", "hot")) is not None
+    assert cache.get(("seller", "b")) is None
+
+
+def test_evicts_hot_keys_when_all_are_hot():
+    hot_keys = HotKeyTracker("test", capacity=10, window=1000)
+    cache = LruCache("test", max_entries=2, max_bytes=1000, hot_keys=hot_keys)
+    for sku in ("a", "b", "c"):
+        hot_keys.add(("seller", sku))
+        cache.set(("seller", sku), _value(1))
+
+    assert len(cache) == 2
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LruCache("test", max_entries=0, max_bytes=1000)
+
+    cache.set("a", _value(1))
+
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+def test_generation_invalidates_only_the_namespace():
+    cache = GenerationalCache("test", max_entries=10, max_bytes=1000)
+    cache.set_in("seller-1", "page-1", _value(1))
+    cache.set_in("seller-2", "page-1", _value(1))
+
+    cache.invalidate("seller-1")
+
+    assert cache.get_in("seller-1", "page-1") is None
+    assert cache.get_in("seller-2", "page-1") is not None
+    assert cache.generation("seller-1") != cache.generation("seller-2")
+
+
+def test_generation_does_not_store_value_built_before_an_invalidation():
+    cache = GenerationalCache("test", max_entries=10, max_bytes=1000)
+    generation = cache.generation("seller-1")
+
+    cache.invalidate("seller-1")
+    cache.set_in("seller-1", "page-1", _value(1), generation=generation)
+
+    assert cache.get_in("seller-1", "page-1") is None
+    assert len(cache) == 0
+
+
+def test_generations_are_kept_only_for_namespaces_with_entries():
+    cache = GenerationalCache("test", max_entries=2, max_bytes=1000)
+
+    for index in range(100):
+        cache.invalidate(f"seller-{index}")
+        cache.set_in(f"seller-{index}", "page-1", _value(1))
+
+    assert len(cache) == 2
+    assert len(cache._namespaces) == 2
+
+
+def test_generation_guard_survives_the_namespace_leaving_the_cache():
+    cache = GenerationalCache("test", max_entries=1, max_bytes=1000)
+    cache.set_in("seller-1", "page-1", _value(1))
+    generation = cache.generation("seller-1")
+
+    # A entrada sai pelo LRU, e a geração do seller com ela, antes de a escrita invalidar o seller
+    cache.set_in("seller-2", "page-1", _value(1))
+    cache.invalidate("seller-1")
+    cache.set_in("seller-1", "page-1", _value(1), generation=generation)
+
+    assert cache.get_in("seller-1", "page-1") is None
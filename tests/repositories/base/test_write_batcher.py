@@ -0,0 +1,151 @@
+import asyncio
+from typing import Any
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.repositories.base.write_batcher import WriteBatcher
+
+KEY_FIELDS = ("seller_id", "sku")
+INITIAL_VERSION = 1
+
+
+class FakeCollection:
+    """
+    Coleção com só o que o `WriteBatcher` usa: `bulk_write` de `UpdateOne` com pipeline e `find` com `$or`.
+    """
+
+    def __init__(self, *skus: str, fail_skus: tuple[str, ...] = (), error: Exception | None = None):
+        self.documents: dict[tuple, dict[str, Any]] = {
+            ("seller-1", sku): {"seller_id": "seller-1", "sku": sku} for sku in skus
+        }
+        self.fail_skus = fail_skus
+        self.error = error
+        self.bulk_writes: list[list] = []
+
+    async def bulk_write(self, operations: list, ordered: bool) -> None:
+        assert not ordered
+        self.bulk_writes.append(operations)
+        if self.error is not None:
+            raise self.error
+        write_errors = []
+        for index, operation in enumerate(operations):
+            key = tuple(operation._filter[field] for field in KEY_FIELDS)
+            if key[1] in self.fail_skus:
+                write_errors.append({"index": index, "code": 121, "errmsg": "Document failed validation"})
+                continue
+            document = self.documents.get(key)
+            if document is None:
+                continue
+            for name, value in operation._doc[0]["$set"].items():
+                document[name] = (
+                    document.get("version", INITIAL_VERSION) + 1 if name == "version" else value["$literal"]
+                )
+        if write_errors:
+            raise BulkWriteError({"writeErrors": write_errors, "writeConcernErrors": []})
+
+    async def find(self, query: dict):
+        for condition in query["$or"]:
+            document = self.documents.get(tuple(condition[field] for field in KEY_FIELDS))
+            if document is not None:
+                yield dict(document)
+
+
+def _batcher(window_ms: float = 5, max_size: int = 100) -> WriteBatcher:
+    return WriteBatcher("fretes", KEY_FIELDS, window_ms=window_ms, max_size=max_size, initial_version=INITIAL_VERSION)
+
+
+async def test_merges_writes_to_the_same_key():
+    collection = FakeCollection("sku-1")
+    batcher = _batcher()
+
+    first, second = await asyncio.gather(
+        batcher.submit(collection, ("seller-1", "sku-1"), {"valor": 10, "prazo": 3}),
+        batcher.submit(collection, ("seller-1", "sku-1"), {"valor": 20}),
+    )
+
+    assert len(collection.bulk_writes) == 1
+    assert len(collection.bulk_writes[0]) == 1
+    assert first == second
+    assert (first["valor"], first["prazo"], first["version"]) == (20, 3, 2)
+
+
+async def test_each_waiter_gets_its_own_document():
+    collection = FakeCollection("sku-1", "sku-2")
+    batcher = _batcher()
+
+    results = await asyncio.gather(
+        batcher.submit(collection, ("seller-1", "sku-1"), {"valor": 10}),
+        batcher.submit(collection, ("seller-1", "sku-2"), {"valor": 20}),
+        batcher.submit(collection, ("seller-1", "sku-3"), {"valor": 30}),
+    )
+
+    assert len(collection.bulk_writes) == 1
+    assert [result and (result["sku"], result["valor"]) for result in results] == [
+        ("sku-1", 10),
+        ("sku-2", 20),
+        None,
+    ]
+
+
+async def test_full_batch_is_sent_without_waiting_the_window():
+    collection = FakeCollection("sku-1", "sku-2")
+    batcher = _batcher(window_ms=60_000, max_size=2)
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            batcher.submit(collection, ("seller-1", "sku-1"), {"valor": 10}),
+            batcher.submit(collection, ("seller-1", "sku-2"), {"valor": 20}),
+        ),
+        timeout=1,
+    )
+
+    assert len(collection.bulk_writes) == 1
+
+
+async def test_write_error_fails_only_its_key():
+    collection = FakeCollection("sku-1", "sku-2", fail_skus=("sku-2",))
+    batcher = _batcher()
+
+    ok, failed = await asyncio.gather(
+        batcher.submit(collection, ("seller-1", "sku-1"), {"valor": 10}),
+        batcher.submit(collection, ("seller-1", "sku-2"), {"valor": 20}),
+        return_exceptions=True,
+    )
+
+    assert ok["valor"] == 10
+    assert isinstance(failed, BulkWriteError)
+
+
+async def test_other_errors_reach_every_waiter():
+    collection = FakeCollection("sku-1", "sku-2", error=ConnectionError("down"))
+    batcher = _batcher()
+
+    results = await asyncio.gather(
+        batcher.submit(collection, ("seller-1", "sku-1"), {"valor": 10}),
+        batcher.submit(collection, ("seller-1", "sku-2"), {"valor": 20}),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+async def test_close_sends_open_batches():
+    collection = FakeCollection("sku-1")
+    batcher = _batcher(window_ms=60_000)
+    submitted = asyncio.create_task(batcher.submit(collection, ("seller-1", "sku-1"), {"valor": 10}))
+    await asyncio.sleep(0)
+
+    await batcher.close()
+
+    assert len(collection.bulk_writes) == 1
+    assert (await submitted)["valor"] == 10
+
+
+@pytest.mark.parametrize("value", ["$valor", {"$set": 1}])
+async def test_values_are_written_as_literals(value):
+    collection = FakeCollection("sku-1")
+
+    document = await _batcher().submit(collection, ("seller-1", "sku-1"), {"descricao": value})
+
+    assert document["descricao"] == value
@@ -0,0 +1,50 @@
+import base64
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+
+from app.services.frete.frete_changes import ChangePosition
+
+TIMESTAMP = datetime(2026, 10, 19, 12, 0, 0, 123000, tzinfo=timezone.utc)
+ENTITY_ID = UUID("0190f6a4-5a1c-7000-8000-000000000001")
+
+
+def test_token_round_trip():
+    position = ChangePosition(TIMESTAMP, ENTITY_ID)
+
+    token = position.encode()
+
+    assert "=" not in token
+    assert ChangePosition.decode(token) == position
+
+
+def test_token_keeps_milliseconds_only():
+    position = ChangePosition(TIMESTAMP.replace(microsecond=123456), ENTITY_ID)
+
+    assert ChangePosition.decode(position.encode()).timestamp == TIMESTAMP
+
+
+def test_positions_are_ordered_by_timestamp_then_id():
+    later_id = UUID("0190f6a4-5a1c-7000-8000-000000000002")
+
+    assert ChangePosition(TIMESTAMP, ENTITY_ID) < ChangePosition(TIMESTAMP, later_id)
+    assert ChangePosition(TIMESTAMP, later_id) < ChangePosition(TIMESTAMP.replace(second=1), ENTITY_ID)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "invalid",
+        "!!!",
+        base64.urlsafe_b64encode(b"[]").decode(),
+        base64.urlsafe_b64encode(b'{"t": 1}').decode(),
+        base64.urlsafe_b64encode(b'{"t": "x", "i": "0190f6a4-5a1c-7000-8000-000000000001"}').decode(),
+        base64.urlsafe_b64encode(b'{"t": 1, "i": "not-a-uuid"}').decode(),
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    ],
+)
+def test_invalid_token_raises_value_error(token):
+    with pytest.raises(ValueError, match="token inválido"):
+        ChangePosition.decode(token)